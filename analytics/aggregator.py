@@ -0,0 +1,64 @@
+from collections import Counter, defaultdict
+
+
+def aggregate_orders(orders, status=None):
+    """
+    Single pass over orders (any iterable of Order), optionally only those with the given status.
+
+    Returns a dict with:
+        order_count, revenue     revenue in paise
+        item_qty, item_revenue   {item_id: value}, in first-seen order
+        item_names               {item_id: name on the order line}, fallback for items no longer on the menu
+        hourly                   Counter {hour: order count}
+    """
+    order_count = 0
+    revenue = 0
+    item_qty = defaultdict(int)
+    item_revenue = defaultdict(int)
+    item_names = {}
+    hourly = Counter()
+
+    for order in orders:
+        if status is not None and order.status != status:
+            continue
+
+        order_count += 1
+        revenue += order.total_amount
+        hourly[order.hour] += 1
+
+        for item in order.items:
+            item_id = item.item_id
+            item_qty[item_id] += item.qty
+            item_revenue[item_id] += item.subtotal
+            if item_id not in item_names:
+                item_names[item_id] = item.name
+
+    return {
+        "order_count": order_count,
+        "revenue": revenue,
+        "item_qty": item_qty,
+        "item_revenue": item_revenue,
+        "item_names": item_names,
+        "hourly": hourly,
+    }
+
+
+def quantities_by_name(aggregate: dict, menu_items: dict) -> dict:
+    # fold per-item quantities onto current menu names (items sharing a name are merged)
+    counts = defaultdict(int)
+    for item_id, qty in aggregate["item_qty"].items():
+        item = menu_items.get(item_id)
+        counts[item.name if item else aggregate["item_names"][item_id]] += qty
+    return counts
+
+
+def totals_by_category(aggregate: dict, menu_items: dict):
+    # (quantity per category, revenue per category), folded from the per-item totals
+    category_qty = defaultdict(int)
+    category_revenue = defaultdict(int)
+    for item_id, qty in aggregate["item_qty"].items():
+        item = menu_items.get(item_id)
+        category = item.category if item else "Uncategorized"
+        category_qty[category] += qty
+        category_revenue[category] += aggregate["item_revenue"][item_id]
+    return category_qty, category_revenue
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from functools import wraps
+from shared.settings import ANALYTICS_CACHE_SIZE
+
+
+class VersionedCache:
+    """
+    LRU of computed results, each stored with the data version it was computed from.
+
+    A lookup under the same version is a hit; under any other version the entry is stale
+    and is recomputed in place. Versions only ever move forward, so nothing has to be
+    purged when the data changes. The least recently used entries go past maxsize.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (version, result)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0         # misses on an entry computed under an older version
+
+
+    def get(self, key, version, compute):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        if entry is not None:
+            self.invalidations += 1
+        result = compute()
+        self._entries[key] = (version, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+
+    def memoize(self, version):
+        # decorator: cache fn(*args) per argument tuple, valid while version() is unchanged
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args):
+                return self.get((fn.__qualname__, args), version(), lambda: fn(*args))
+            return wrapper
+        return decorate
+
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+    def describe(self) -> str:
+        stats = self.stats()
+        return (
+            f"Analytics cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['invalidations']} stale) | {stats['size']} of {stats['maxsize']} entries"
+        )
+
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.invalidations = 0
+
+
+# shared by the analytics menu and the admin dashboard
+analytics_cache = VersionedCache(ANALYTICS_CACHE_SIZE)
@@ -0,0 +1,76 @@
+import heapq
+
+
+class _Descending:
+    # inverts the ordering of the wrapped value inside heap entries
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class TopK:
+    """
+    Streaming top-k / bottom-k of (key, value) pairs in two bounded heaps, O(n log k).
+
+    Ties on value are broken by key ascending, in both rankings, so the result does not
+    depend on the order pairs arrive in. Partial rankings (one per day, partition, ...)
+    can be combined with merge() without rebuilding the full counts.
+    """
+
+    def __init__(self, top_k=5, bottom_k=0):
+        self.top_k = top_k
+        self.bottom_k = bottom_k
+        self._top = []     # (value, _Descending(key)): the weakest entry sits at the root
+        self._bottom = []  # _Descending((value, key)): the largest entry sits at the root
+
+
+    def push(self, key, value):
+        self._offer(self._top, self.top_k, (value, _Descending(key)))
+        self._offer(self._bottom, self.bottom_k, _Descending((value, key)))
+
+
+    def _offer(self, heap, limit, entry):
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif limit and heap[0] < entry:
+            heapq.heapreplace(heap, entry)
+
+
+    def update(self, pairs):
+        for key, value in pairs:
+            self.push(key, value)
+        return self
+
+
+    def merge(self, other):
+        # sum the values each side holds per key, then rank again. Exact when neither side dropped
+        # a key (it saw no more keys than it keeps); otherwise approximate, since a key outside
+        # one side's k is summed without its value there
+        totals = {}
+        for ranking in (self, other):
+            for key, value in dict(ranking.top() + ranking.bottom()).items():
+                totals[key] = totals.get(key, 0) + value
+
+        self._top, self._bottom = [], []
+        return self.update(totals.items())
+
+
+    def top(self) -> list:
+        # [(key, value)], highest value first
+        return [(entry[1].value, entry[0]) for entry in sorted(self._top, reverse=True)]
+
+
+    def bottom(self) -> list:
+        # [(key, value)], lowest value first
+        return [(entry.value[1], entry.value[0]) for entry in sorted(self._bottom, reverse=True)]
+
+
+def top_k(pairs, k) -> list:
+    return TopK(top_k=k).update(pairs).top()
@@ -0,0 +1,111 @@
+"""
+Bytes held per loaded order: plain dict-backed objects vs the slotted Order/LineItem, and
+what a loaded OrderManager holds per order once its index and rollups are counted too.
+
+Run from the project root:
+    python -m benchmarks.memory_per_order [--orders 20000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+from orders.order import Order
+from orders.order_manager import OrderManager
+from storage.json_store import PartitionedJsonOrderRepository
+
+
+class DictOrder:
+    # the old representation: instance __dict__, line items kept as the parsed json dicts
+    def __init__(self, data):
+        self.items = data["items"]
+        self.total_amount = data["total_amount"]
+        self.status = data["status"]
+        moment = datetime.fromisoformat(data["timestamp"])
+        self.epoch = (moment - datetime(1970, 1, 1)).total_seconds()
+        self.day = moment.toordinal()
+        self.hour = moment.hour
+        self.paid = data["paid"]
+        self.order_id = data["order_id"]
+        self.name = data.get("name")
+
+
+def build_payload(count, menu_file="data/menu.json"):
+    # json text of `count` synthetic orders drawing 1-4 lines from the real menu
+    with open(menu_file, "r", encoding="utf-8") as file:
+        menu = json.load(file)["items"]
+    menu_items = list(menu.items())
+
+    start = datetime(2025, 1, 1, 8)
+    orders = {}
+    for number in range(count):
+        lines = [
+            {"item_id": item_id, "name": item["name"], "qty": 1 + (number + line) % 3, "price": item["price"]}
+            for line, (item_id, item) in enumerate(menu_items[number % len(menu_items):][:1 + number % 4])
+        ]
+        order_id = f"ORD-2025-01-{number:04d}"
+        orders[order_id] = {
+            "order_id": order_id,
+            "items": lines,
+            "status": ("placed", "completed", "cancelled")[number % 3],
+            "total_amount": sum(line["qty"] * line["price"] for line in lines),
+            "timestamp": (start + timedelta(minutes=7 * number)).isoformat(),
+            "name": None,
+            "paid": number % 2 == 0
+        }
+    return json.dumps(orders)
+
+
+def bytes_per_order(payload, build):
+    # memory still held once the parsed json is dropped and only the built objects remain
+    gc.collect()
+    tracemalloc.start()
+    raw = json.loads(payload)
+    orders = { order_id: build(data) for order_id, data in raw.items() }
+    del raw
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held / len(orders)
+
+
+def bytes_per_managed_order(payload, count):
+    # everything a loaded OrderManager keeps (orders, index, rollups, ...) once loading is done
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "2025-01.json"), "w", encoding="utf-8") as file:
+            file.write(payload)
+
+        gc.collect()
+        tracemalloc.start()
+        with redirect_stdout(StringIO()):
+            manager = OrderManager(repository=PartitionedJsonOrderRepository(directory), max_loaded_orders=count)
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        manager.repository.close()
+        return held / len(manager.orders)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure memory per loaded order.")
+    parser.add_argument("--orders", type=int, default=20000, help="number of synthetic orders")
+    args = parser.parse_args(argv)
+
+    payload = build_payload(args.orders)
+    before = bytes_per_order(payload, DictOrder)
+    after = bytes_per_order(payload, Order.from_dict)
+    managed = bytes_per_managed_order(payload, args.orders)
+
+    print(f"{args.orders} orders")
+    print(f"dict-backed     : {before:8.0f} bytes/order")
+    print(f"slotted         : {after:8.0f} bytes/order  ({100 * (1 - after / before):.0f}% less)")
+    print(f"OrderManager    : {managed:8.0f} bytes/order  ({100 * (1 - managed / before):.0f}% less than dict-backed; slotted orders plus index and rollups)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Time from launching main.py to the first prompt, plus where import time goes (-X importtime).
+
+Each run starts a fresh interpreter in a scratch copy of data/, so nothing the app writes
+on startup touches the real files.
+
+Run from the project root:
+    python -m benchmarks.startup_time [--runs 5] [--top 12]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = "Select an option".encode()
+
+
+def time_to_prompt(workdir):
+    # seconds until the main menu prompt is written, then answer "0" to exit
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "main.py")],
+        cwd=workdir, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    seen = b""
+    while PROMPT not in seen:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError("main.py exited before showing its prompt")
+        seen += chunk
+    elapsed = time.perf_counter() - start
+
+    process.communicate(b"0\n", timeout=30)
+    return elapsed
+
+
+def import_times(workdir, module="main_menu"):
+    # {module: (self_us, cumulative_us)} from one `python -X importtime -c "import <module>"`
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workdir, env={ **os.environ, "PYTHONPATH": ROOT }, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure CLI startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="launches to take the median of")
+    parser.add_argument("--top", type=int, default=12, help="slowest modules to list")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copytree(os.path.join(ROOT, "data"), os.path.join(workdir, "data"))
+
+        prompts = [time_to_prompt(workdir) for _ in range(args.runs)]
+        times = import_times(workdir)
+
+    print(f"time to first prompt : {1000 * statistics.median(prompts):7.1f} ms (median of {args.runs})")
+    print(f"import main_menu     : {times['main_menu'][1] / 1000:7.1f} ms cumulative")
+    print("\nslowest modules by self time:")
+    for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda entry: -entry[1][0])[:args.top]:
+        print(f"  {self_us / 1000:7.1f} ms  (cumulative {cumulative_us / 1000:7.1f} ms)  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Write latency per fsync level (BREWOPS_FSYNC) and per durability mode (BREWOPS_DURABILITY).
+
+Part one times the JSON primitives: a full snapshot save, a one-record journal append
+and a menu save. Part two times OrderManager.add_order end to end, in a scratch copy
+of data/, for each durability mode. Nothing under data/ is written.
+
+Run from the project root:
+    python -m benchmarks.write_latency [--orders 2000] [--repeat 50] [--fsync file]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from benchmarks.memory_per_order import build_payload
+from utils import json_io
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def median_ms(action, repeat):
+    samples = []
+    for number in range(repeat):
+        start = time.perf_counter()
+        action(number)
+        samples.append(time.perf_counter() - start)
+    return 1000 * statistics.median(samples)
+
+
+def time_primitives(workdir, payload, repeat):
+    # {fsync level: (snapshot ms, journal append ms, menu save ms)}
+    orders = json.loads(payload)
+    with open(os.path.join(ROOT, "data", "menu.json"), "r", encoding="utf-8") as file:
+        menu = json.load(file)
+    record = {"op": "status", "order_id": next(iter(orders)), "status": "completed"}
+
+    results = {}
+    for level in json_io.FSYNC_LEVELS:
+        json_io.FSYNC_WRITES = level
+        snapshot_path = os.path.join(workdir, f"orders-{level}.json")
+        journal_path = os.path.join(workdir, f"orders-{level}.journal")
+        menu_path = os.path.join(workdir, f"menu-{level}.json")
+        results[level] = (
+            median_ms(lambda _: json_io.save_order_data(snapshot_path, orders), repeat),
+            median_ms(lambda _: json_io.append_order_journal(journal_path, [record]), repeat),
+            median_ms(lambda _: json_io.save_menu_data(menu_path, menu), repeat),
+        )
+    return results
+
+
+def time_add_order(workdir, durability, repeat):
+    # mean ms per add_order (menu count update included) and the final flush
+    from menu.manager import MenuManager
+    from orders.order import Order
+    from orders.line_item import LineItem
+    from orders.order_manager import OrderManager
+    from storage import PartitionedJsonOrderRepository
+    from storage.write_behind import WriteBehind
+
+    data_dir = os.path.join(workdir, f"data-{durability}")
+    shutil.copytree(os.path.join(ROOT, "data"), data_dir, ignore=shutil.ignore_patterns("*.db*", "__pycache__"))
+    menu_manager = MenuManager(os.path.join(data_dir, "menu.json"), durability=durability)
+    order_manager = OrderManager(
+        menu_manager=menu_manager, durability=durability,
+        repository=PartitionedJsonOrderRepository(os.path.join(data_dir, "orders"))
+    )
+    flusher = None
+    if durability != "immediate":
+        flusher = WriteBehind(durability)
+        flusher.register(order_manager)
+        flusher.register(menu_manager)
+
+    item_id, item = next(iter(menu_manager.menu_items.items()))
+    start_time = datetime.now().replace(microsecond=0)
+
+    def add(number):
+        timestamp = (start_time + timedelta(seconds=number)).isoformat()
+        order_id = order_manager.generate_order_id(timestamp)
+        order_manager.add_order(Order([LineItem(item_id, item.name, 1, item.price)], item.price, "placed", timestamp, False, order_id))
+
+    start = time.perf_counter()
+    for number in range(repeat):
+        add(number)
+    per_order = 1000 * (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    if flusher:
+        flusher.stop()
+    return per_order, 1000 * (time.perf_counter() - start)
+
+
+def main(argv=None):
+    from storage.write_behind import DURABILITY_MODES
+
+    parser = argparse.ArgumentParser(description="Measure write latency per durability level.")
+    parser.add_argument("--orders", type=int, default=2000, help="orders in the snapshot being saved")
+    parser.add_argument("--repeat", type=int, default=50, help="writes timed per measurement")
+    parser.add_argument("--fsync", choices=json_io.FSYNC_LEVELS, default="file", help="fsync level for the add_order runs")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        primitives = time_primitives(workdir, build_payload(args.orders), args.repeat)
+
+        json_io.FSYNC_WRITES = args.fsync
+        add_order = { mode: time_add_order(workdir, mode, args.repeat) for mode in DURABILITY_MODES }
+
+    print(f"median ms per write ({args.orders}-order snapshot, {args.repeat} runs)")
+    print(f"  {'fsync':<6} {'snapshot':>10} {'journal':>10} {'menu':>10}")
+    for level, (snapshot, journal, menu) in primitives.items():
+        print(f"  {level:<6} {snapshot:10.2f} {journal:10.2f} {menu:10.2f}")
+
+    print(f"\nadd_order with fsync={args.fsync} ({args.repeat} orders)")
+    print(f"  {'mode':<10} {'ms/order':>10} {'final flush ms':>15}")
+    for mode, (per_order, final_flush) in add_order.items():
+        print(f"  {mode:<10} {per_order:10.3f} {final_flush:15.2f}")
+
+
+if __name__ == "__main__":
+    main()
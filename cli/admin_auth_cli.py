@@ -1,62 +1,35 @@
 from rich.prompt import Prompt
-from auth.auth import AuthManager
 from cli.admin_cli import admin_main
 from datetime import timedelta
-from collections import Counter
-from utils.filtering import filter_by_month
-from analytics.analyzer import get_menu_insights
+from analytics.analyzer import get_menu_insights, show_cache_stats, versioned
 from utils.display import display_dashboard, datetime, date, print_success, print_error, console
-from session.session_manager import SessionManager
 
-auth_manager = AuthManager()
-session_manager = SessionManager()
-
-from collections import defaultdict
-from shared.managers import menu_manager, order_manager
+from analytics.aggregator import quantities_by_name
+from analytics.ranking import TopK, top_k
+from shared.managers import auth_manager, menu_manager, order_manager
 
 
+@versioned
 def get_todays_insights(target_date:str):
 
-    item_counts  = defaultdict(int)
-    hour_counter = Counter()
-    total_orders = 0
-    total_revenue = 0.00
-    avg_order_value = 0.00
-    peak_hour = ""
-
-    filtered_orders = order_manager.filter_orders(status=None, paid=None, date=target_date)
+    # completed orders only: count, revenue, items and peak time from the day's rollup row
+    aggregate = order_manager.summarize(date=target_date, status="completed")
+    item_counts = quantities_by_name(aggregate, menu_manager.menu_items)
+    hour_counter = aggregate["hourly"]
 
-    # total orders
-    # completed orders with peak time
-    all_items = menu_manager.menu_items
-    for order in filtered_orders.values():
-        
-        if order.status == "completed":
-            
-            ts = order.timestamp
-            hour = datetime.fromisoformat(ts).hour
-            hour_counter[hour] += 1
-            
-            total_orders += 1
-            total_revenue += order.total_amount
-            
-            for item in order.items:
-                item_id = item["item_id"]
-                item_name = all_items[item_id].name
-                item_counts[item_name] += item["qty"]
-            
-    avg_order_value = total_revenue / total_orders if total_orders else 0.0
+    total_orders = aggregate["order_count"]
+    total_revenue = aggregate["revenue"]
+    avg_order_value = round(total_revenue / total_orders) if total_orders else 0
             
     # Get top item 
     if item_counts:
-        top_items = sorted(item_counts.items(), key=lambda x: x[1], reverse=True)
-        top_item = top_items[0][0]
+        top_item = top_k(item_counts.items(), 1)[0][0]
     else:
         top_item = "No items sold"
         
     # Get peak hour
     if hour_counter:
-        peak_hour_num = hour_counter.most_common(1)[0][0]
+        peak_hour_num = top_k(hour_counter.items(), 1)[0][0]  # earliest hour on ties
         next_hour = (peak_hour_num + 1) % 24
         peak_hour = f"{peak_hour_num:02d} - {next_hour:02d}"
     else:
@@ -71,33 +44,19 @@ def get_todays_insights(target_date:str):
     }
         
 
+@versioned
 def get_monthly_insights(target_month):
     
-    count_map_top_items = defaultdict(int)
-    total_orders = 0
-    total_revenue = 0.00
-    avg_order_value = 0.00
-    
-    filtered_orders = filter_by_month(order_manager.orders, target_month)
-    
-    all_items = menu_manager.menu_items
-    for order in filtered_orders.values():
-        
-        if order.status == "completed":
-            
-            total_orders += 1
-            total_revenue += order.total_amount
-            
-            for item in order.items:
-                item_id = item["item_id"]
-                item_name = all_items[item_id].name
-                count_map_top_items[item_name] += item["qty"]
-    
-    avg_order_value = total_revenue / total_orders if total_orders else 0.0
+    aggregate = order_manager.summarize(month=target_month, status="completed")
+    count_map_top_items = quantities_by_name(aggregate, menu_manager.menu_items)
+
+    total_orders = aggregate["order_count"]
+    total_revenue = aggregate["revenue"]
+    avg_order_value = round(total_revenue / total_orders) if total_orders else 0
     
     if count_map_top_items:
-        top_items = sorted(count_map_top_items.items(), key=lambda x: x[1], reverse=True)
-        bottom_items = sorted(count_map_top_items.items(), key=lambda x: x[1])
+        ranking = TopK(top_k=1, bottom_k=2).update(count_map_top_items.items())
+        top_items, bottom_items = ranking.top(), ranking.bottom()
         
         top_item = top_items[0][0]
         bottom_1 = bottom_items[0][0]
@@ -118,30 +77,23 @@ def get_monthly_insights(target_month):
     
 
 def get_weekly_sales_details():
+    return weekly_sales_details(date.today())
+
+
+@versioned
+def weekly_sales_details(today):
     
     weekly_summary = []
-    total_revenue = 0.00
-    
-    for i in range(7):
-        target_date = date.today() - timedelta(days=i)
-        target_date_str = str(target_date)
-        filtered_orders = {}
-        try:
-            filtered_orders = order_manager.filter_orders(status=None, paid=None, date=target_date_str)
-        except Exception as e:
-            # Log error and continue with empty orders for this day
-            filtered_orders = {}
-            continue
-        # filtered_orders = order_manager.filter_orders(status=None, paid=None, date=target_date_str)
+    total_revenue = 0  # paise
 
-        per_day_orders = 0
-        per_day_revenue = 0.00
-        weekday = target_date.strftime("%A")
-        
-        for order in filtered_orders.values():
-            if order.status == "completed":
-                per_day_orders += 1
-                per_day_revenue += order.total_amount
+    # the seven days up to today in one windowed pass, newest first as the panel expects
+    days = order_manager.aggregate_window(str(today - timedelta(days=6)), str(today), bucket="day", status="completed")
+    
+    for day in reversed(days):
+        target_date_str = day["start"]
+        per_day_orders = day["order_count"]
+        per_day_revenue = day["revenue"]
+        weekday = date.fromisoformat(target_date_str).strftime("%A")
         
         total_revenue += per_day_revenue
 
@@ -152,7 +104,7 @@ def get_weekly_sales_details():
             "per_day_revenue": per_day_revenue
         })
 
-    daily_avg = total_revenue / 7 if total_revenue > 0 else 0.00    
+    daily_avg = round(total_revenue / 7) if total_revenue > 0 else 0    
     
     return {
         "daily_avg" : daily_avg,
@@ -170,6 +122,7 @@ def handle_dashboard():
     weekly_insights = get_weekly_sales_details()
     
     display_dashboard(today_summary, month_summary, menu_summary, weekly_insights)
+    show_cache_stats()
     
     
 
@@ -8,12 +8,12 @@ from utils.display import (
 from analytics.analyzer import main_analytics_management
 from cli.items_category_cli import main_item_category_management
 from cli.order_cli import main_order_management
-from auth.auth import AuthManager
-auth_manager = AuthManager()
+from shared.managers import auth_manager, flush_managers
 
 # -------------------------------------------- Admin Management -------------------------------------------- #
 
 def handle_logout():
+    flush_managers()
     auth_manager.session_manager.clear_session()
     auth_manager.logout()
     print_success("\nLogged out successfully!")
@@ -8,13 +8,10 @@ from utils.display import (
     display_view_menu, customer_menu
 )
 
-item_name_dict = get_name_to_id_map(menu_manager.menu_items)
-
-
 
 def handle_place_order():
     print_section_title("Place Order", "📝")
-    shared_place_order(menu_manager, order_manager, item_name_dict, is_admin=False)
+    shared_place_order(menu_manager, order_manager, get_name_to_id_map(menu_manager.menu_items), is_admin=False)
 
 
 def handle_view_menu():
@@ -25,11 +22,11 @@ def handle_view_menu():
 def handle_view_my_order():
     print_section_title("Order Details", "ℹ️")
     order_id = input("Enter order Id: ").strip()
-    if order_id not in order_manager.orders:
+    order = order_manager.get_order(order_id)
+    if not order:
         print_error("Please Enter valid order Id. No such order found")
         return
     
-    order = order_manager.orders[order_id]
     display_order_summary(order)
 
 
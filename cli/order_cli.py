@@ -1,16 +1,16 @@
 from rich.prompt import Prompt
-from utils.filtering import get_name_to_id_map, filter_orders_by_criteria, filter_by_month
+from utils.filtering import get_name_to_id_map
 from utils.display import print_section_title, print_success, print_warning, print_error, display_order_summary, display_multiple_orders_table, print_order_menu, console, datetime
 from shared.order_helpers import place_order_flow as shared_place_order
 from utils.validation import validate_date, validate_order_status, validate_boolean
 from shared.managers import menu_manager, order_manager
-
-item_name_dict = get_name_to_id_map(menu_manager.menu_items)
+from shared.settings import SHOW_QUERY_PLANS
+from math import ceil
 
         
 def handle_add_order():
     print_section_title("Add Order", "📝")
-    shared_place_order(menu_manager, order_manager, item_name_dict, is_admin=True)
+    shared_place_order(menu_manager, order_manager, get_name_to_id_map(menu_manager.menu_items), is_admin=True)
 
 
 def handle_update_status():
@@ -22,11 +22,12 @@ def handle_update_status():
     
     order_id = input("Enter Order Id: ").strip()
 
-    if order_id not in order_manager.orders:
+    order = order_manager.get_order(order_id)
+    if not order:
         print_error("Please Enter valid order Id. No such order found")
         return
     
-    current_status = order_manager.orders[order_id].status
+    current_status = order.status
     console.print(f"Current status for this order is {current_status}")
 
     ask = input("Do you want to change status ? (y/n): ").strip().lower()
@@ -46,7 +47,7 @@ def handle_update_status():
 
     if success:
         print_success("Order status changed successfully!")
-        display_order_summary(order_manager.orders[order_id])
+        display_order_summary(order_manager.get_order(order_id))  # the order read above may be a detached copy
         
     else:
         print_error("Failed to update order status.")
@@ -61,11 +62,11 @@ def handle_mark_paid():
     
     order_id = input("Enter Order Id: ").strip()
 
-    if order_id not in order_manager.orders:
+    order = order_manager.get_order(order_id)
+    if not order:
         print_error("Invalid order ID. Please try again.")
         return
     
-    order = order_manager.orders[order_id]
     payment_status = "Paid" if order.paid else "Unpaid"
     console.print(f"🔎 Current payment status: [bold yellow]{payment_status}[/bold yellow]")
 
@@ -81,7 +82,7 @@ def handle_mark_paid():
 
     if success:
         print_success("Payment Done!")
-        display_order_summary(order_manager.orders[order_id])
+        display_order_summary(order_manager.get_order(order_id))
         
     else:
         print_error("Failed to update payment status.")
@@ -95,11 +96,12 @@ def handle_view_order():
     handle_filter_and_view_all_orders("view_order")
     order_id = input("Enter Order Id: ").strip()
 
-    if order_id not in order_manager.orders:
+    order = order_manager.get_order(order_id)
+    if not order:
         print_error("Invalid order ID. Please try again.")
         return
     
-    display_order_summary(order_manager.orders[order_id])
+    display_order_summary(order)
 
 
 # def handle_view_all_orders(filter_usage=None):
@@ -156,7 +158,7 @@ def handle_remove_orders():
     handle_filter_and_view_all_orders("remove_order")
     order_id = input("Enter Order Id: ").strip()
 
-    if order_id not in order_manager.orders:
+    if not order_manager.get_order(order_id):
         print_error("Invalid order ID. Please try again.")
         return
 
@@ -173,43 +175,24 @@ def handle_remove_orders():
         print_error("Failed to remove order.")
 
      
-def sort_orders(transactions, sort_by="date", order="asc"):
+def sort_orders(query, sort_by="date", order="asc"):
     """
-    Sort transactions by date or total_amount
+    Sort an order query by date or total_amount
     
     Args:
-        transactions: Dict of {transaction_id: transaction_object}
-        sort_by: "date" or "total_amount"
+        query: OrderQuery from order_manager.query()
+        sort_by: "date" or "total amount"
         order: "asc" or "desc"
     
     Returns:
-        List of sorted transaction objects (values only)
+        The query, ordered (still lazy)
     """
-    try:
-        # Convert dict values to list for sorting
-        txn_list = list(transactions.values())
-        
-        if sort_by == "date":
-            sorted_txns = sorted(
-                txn_list, 
-                key=lambda txn: datetime.strptime(txn.timestamp, "%Y-%m-%d").date(),
-                reverse=(order == "desc")
-            )
-        elif sort_by == "total amount":
-            sorted_txns = sorted(
-                txn_list,
-                key=lambda txn: float(txn.total_amount),
-                reverse=(order == "desc")
-            )
-        else:
-            print_warning(f"Invalid sort option: {sort_by}")
-            return txn_list
-        
-        return sorted_txns
-        
-    except Exception as e:
-        print_warning(f"Error sorting transactions: {e}")
-        return list(transactions.values())
+    sort_keys = {"date": "date", "total amount": "total"}
+    if sort_by not in sort_keys:
+        print_warning(f"Invalid sort option: {sort_by}")
+        return query
+
+    return query.order_by(sort_keys[sort_by], descending=(order == "desc"))
 
 
 def get_sort_choice():
@@ -234,7 +217,7 @@ def handle_filter_and_view_all_orders(filter_usage=None):
     if filter_usage is None:
         print_section_title("View All Orders", icon="📦 ")
     
-    status = paid = None
+    status = paid = customer = None
     date_filter = from_date = to_date = month_filter = None
     current_month = datetime.now().strftime("%Y-%m")
     
@@ -246,7 +229,7 @@ def handle_filter_and_view_all_orders(filter_usage=None):
     if apply_filters == "no":
         # Default: current month
         month_filter = current_month
-        orders = filter_by_month(order_manager.orders, month_filter)
+        orders = order_manager.query().month(month_filter)
         filter_summary = f"Month: {month_filter}"
    
     else:
@@ -274,20 +257,24 @@ def handle_filter_and_view_all_orders(filter_usage=None):
         status = validate_order_status("Enter Status (or press Enter to skip) - ('placed', 'in progress', 'completed', 'cancelled')", allow_blank=True)
                     
         paid = validate_boolean("Is the order paid? (y/n or press Enter to skip)", allow_blank=True)
+
+        customer = Prompt.ask("Customer name (or press Enter to skip)", default="").strip() or None
         
-        orders = filter_orders_by_criteria(
-            order_manager.orders,
+        # the planner drives the scan from the most selective of these and checks the rest per order
+        orders = order_manager.query().filter(
             status=status,
             paid=paid,
             date=date_filter,
             from_date=from_date,
             to_date=to_date,
-            month=month_filter
+            month=month_filter,
+            customer=customer
         )
     
         filters_applied = []
         if status: filters_applied.append(f"Order Status: {status}")
         if paid: filters_applied.append(f"Order Paid: {paid}")
+        if customer: filters_applied.append(f"Customer: {customer}")
         if date_filter: filters_applied.append(f"Date: {date_filter}")
         elif from_date and to_date: filters_applied.append(f"Range: {from_date} to {to_date}")
         elif month_filter: filters_applied.append(f"Month: {month_filter}")
@@ -295,31 +282,57 @@ def handle_filter_and_view_all_orders(filter_usage=None):
         filter_summary = " | ".join(filters_applied) if filters_applied else "No filters"
 
     
-    if not orders:
+    found = orders.count()
+    if not found:
         print_warning("No Orders found with applied filters.")
         return 
     
     # Show initial results
-    order_list = list(orders.values())
     console.print(f"\n[bold green]📋 Applied Filters: {filter_summary}[/bold green]")
-    print_success(f"[green]Found {len(orders.values()  )} orders[/green]")
+    print_success(f"[green]Found {found} orders[/green]")
+    if SHOW_QUERY_PLANS:
+        console.print(orders.explain(), style="dim", markup=False)
 
   
     # Get sorting choice
     sort_by, order = get_sort_choice()
 
     if sort_by:
-        # Pass the dict, get back sorted list
         order_list = sort_orders(orders, sort_by, order)
         
         order_text = "ascending ↑" if order == "asc" else "descending ↓"
         console.print(f"\n[bold cyan]📈 Results sorted by {sort_by} ({order_text}):[/bold cyan]")
     else:
-        order_list = list(orders.values())
+        order_list = orders
         console.print(f"\n[bold cyan]📋 Results:[/bold cyan]")
         
     print("\n \n")
-    display_multiple_orders_table(order_list)
+    browse_order_pages(order_list, found)
+
+
+def browse_order_pages(query, found):
+    # one page is built and rendered at a time; next / previous follow the page cursors
+    page_size = order_manager.page_size
+    pages = ceil(found / page_size)
+    number = 1
+    page = query.page(page_size)
+
+    while True:
+        display_multiple_orders_table(page, caption=f"Page {number} of {pages} · {found} orders")
+
+        choices = (["n"] if page.has_next else []) + (["p"] if page.has_prev else [])
+        if not choices:
+            return
+        move = Prompt.ask("Next page (n), previous page (p) or done (q)", choices=choices + ["q"], default=choices[0])
+
+        if move == "n":
+            page = query.page(page_size, after=page.next_cursor)
+            number += 1
+        elif move == "p":
+            page = query.page(page_size, before=page.prev_cursor)
+            number -= 1
+        else:
+            return
         
 
 
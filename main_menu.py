@@ -1,7 +1,6 @@
 
 from cli.customer_cli import handle_customer_menu
 from utils.display import print_header, console, print_error
-from cli.admin_auth_cli import main_auth_management
 
 from rich.prompt import Prompt
 
@@ -19,6 +18,7 @@ def main_menu():
         role = Prompt.ask("Select an option")
 
         if role == "1":
+            from cli.admin_auth_cli import main_auth_management  # admin modules load on first visit
             main_auth_management()
         elif role == "2":
             handle_customer_menu()
@@ -1,19 +1,26 @@
+from sys import intern
+from utils.money import to_paise, to_rupees
+
+
 class MenuItem:
+    __slots__ = ("category", "name", "price", "available", "is_special", "order_count", "item_id")
+
     def __init__(self, category, name, price, available=True, is_special=False, order_count=0, item_id=None):
-        self.category = category.strip().title()
-        self.name = name.strip().title()
-        self.price = price
+        # names and ids repeat on every order line, so share one string object for each
+        self.category = intern(category.strip().title())
+        self.name = intern(name.strip().title())
+        self.price = price  # paise
         self.available = available
         self.is_special = is_special
         self.order_count = order_count
-        self.item_id = item_id
+        self.item_id = intern(item_id) if item_id else item_id
 
 
     def to_dict(self):
         return {
             "category":self.category,
             "name":self.name,
-            "price":self.price,
+            "price":to_rupees(self.price),
             "available":self.available,
             "is_special":self.is_special,
             "order_count":self.order_count
@@ -25,7 +32,7 @@ class MenuItem:
         return cls(
             category = data['category'],
             name = data['name'],
-            price = data['price'],
+            price = to_paise(data['price']),
             available = data['available'],
             is_special = data['is_special'],
             order_count = data['order_count'],
@@ -36,5 +43,5 @@ class MenuItem:
     def __str__(self):
         special = "⭐ Special" if self.is_special else ""
         status = "✅ Available" if self.available else "❌ Unavailable"
-        return f"{[self.item_id]}: {self.name} - ₹{self.price} ({self.category}) {status} {special}"
+        return f"{[self.item_id]}: {self.name} - ₹{to_rupees(self.price)} ({self.category}) {status} {special}"
 
@@ -1,28 +1,103 @@
+import threading
+from contextlib import contextmanager
 from menu.item import MenuItem
-from utils.json_io import load_menu_data, save_menu_data
+from storage.json_store import JsonMenuRepository
+from storage.write_behind import check_durability, synchronized
 from utils.filtering import filter_menu_items
 
 class MenuManager:
-    def __init__(self, file_path="data/menu.json"):
+    def __init__(self, file_path="data/menu.json", repository=None, durability="immediate"):
         self.file_path = file_path
+        self.repository = repository or JsonMenuRepository(file_path)
+        self.durability = check_durability(durability)  # see storage.write_behind
+        self.flusher = None     # WriteBehind told about buffered changes (grouped / on-exit)
+        self._lock = threading.RLock()  # mutations vs. a background flush
         self.menu_data = {}
+        self._batch_depth = 0   # > 0 while inside transaction()
+        self._dirty = False     # changes not written yet
+        self._changed_ids = set()   # items touched since the last save (row-level backends write only these)
+        self._removed_ids = set()
+        self.version = 0   # bumped by every change to the menu, so derived results can tell they are stale
         self.load_menu()  
 
 
+    @synchronized
     def load_menu(self):
-        raw_data = load_menu_data(self.file_path)
+        raw_data = self.repository.load()
+        self.version += 1
+        self._changed_ids.clear()
+        self._removed_ids.clear()
         self.menu_data["categories"] = raw_data.get("categories", [])
         self.menu_data["items"] = { item_id: MenuItem.from_dict(item_id, data) for item_id, data in raw_data.get("items", {}).items()}
          
 
     def save_menu(self):
+        self.version += 1
+        if self._batch_depth or self.durability != "immediate":
+            # written when the transaction ends, or by the next flush()
+            self._dirty = True
+            if not self._batch_depth and self.flusher:
+                self.flusher.notify()
+            return
+
+        self._write()
+
+
+    @synchronized
+    def flush(self):
+        # write buffered changes now; nothing to do when the menu is clean
+        if self._dirty and not self._batch_depth:
+            self._write()
+
+
+    @synchronized
+    def _write(self):
+        self._dirty = False
         menu_dict = {
             "categories" : self.categories,
             "items" : {item_id : item.to_dict() for item_id, item in self.menu_items.items()}
         }
-        save_menu_data(self.file_path, menu_dict)
-
-
+        self.repository.save(menu_dict, changed_ids=set(self._changed_ids), removed_ids=set(self._removed_ids))
+        self._changed_ids.clear()
+        self._removed_ids.clear()
+
+
+    @contextmanager
+    def transaction(self):
+        # save_menu() calls made inside the block collapse into one write on exit
+        with self._lock:
+            # buffered changes are not on disk yet, so a rollback restores a snapshot instead of reloading
+            saved = self._snapshot() if self._batch_depth == 0 and self.durability != "immediate" else None
+            self._batch_depth += 1
+            try:
+                yield self
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and saved:
+                    self._restore(saved)
+                elif self._batch_depth == 0:
+                    self._dirty = False
+                    self.load_menu()
+                raise
+
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.save_menu()
+
+
+    def _snapshot(self):
+        items = { item_id: item.to_dict() for item_id, item in self.menu_items.items() }
+        return list(self.categories), items, set(self._changed_ids), set(self._removed_ids), self._dirty
+
+
+    def _restore(self, snapshot):
+        categories, items, self._changed_ids, self._removed_ids, self._dirty = snapshot
+        self.menu_data["categories"] = categories
+        self.menu_data["items"] = { item_id: MenuItem.from_dict(item_id, data) for item_id, data in items.items() }
+        self.version += 1
+
+
+    @synchronized
     def add_item(self, item_detail: MenuItem):
         if not isinstance(item_detail, MenuItem):
             raise ValueError("Must be a MenuItem")
@@ -31,19 +106,24 @@ class MenuManager:
             return False
         
         self.menu_items[item_detail.item_id] = item_detail
+        self._changed_ids.add(item_detail.item_id)
         self.save_menu()
         return True
 
 
+    @synchronized
     def remove_item(self, item_id):
         if item_id not in self.menu_items:
             return False
         
         del self.menu_items[item_id]
+        self._changed_ids.discard(item_id)
+        self._removed_ids.add(item_id)
         self.save_menu()
         return True
     
 
+    @synchronized
     def update_item(self, item_id:str, updated_fields):
         if item_id not in self.menu_items:
             return False
@@ -55,10 +135,12 @@ class MenuManager:
             if key in allowed_fields and value is not None:
                 setattr(menu_item, key, value)
         
+        self._changed_ids.add(item_id)
         self.save_menu()
         return True
 
 
+    @synchronized
     def add_category(self, category_name):
         if category_name in self.categories:
             return False
@@ -68,6 +150,7 @@ class MenuManager:
         return True
 
 
+    @synchronized
     def remove_category(self, category_name):
         category_name = category_name.strip()
         if category_name not in self.categories: 
@@ -133,12 +216,14 @@ class MenuManager:
         return new_id
         
         
+    @synchronized
     def toggle_special(self, item_id):
         if item_id not in self.menu_items:
             return False
         
         menu_item = self.menu_items[item_id]
         menu_item.is_special = not menu_item.is_special
+        self._changed_ids.add(item_id)
         self.save_menu()
         return True
 
@@ -180,14 +265,18 @@ class MenuManager:
         ]
 
 
+    @synchronized
     def increment_order_count(self, item_id: str, qty=1):
         if item_id in self.menu_items:
             self.menu_items[item_id].order_count += qty
+            self._changed_ids.add(item_id)
 
 
+    @synchronized
     def decrement_order_count(self, item_id:str, qty=1):
          if item_id in self.menu_items:
             self.menu_items[item_id].order_count = max(0, self.menu_items[item_id].order_count - qty)
+            self._changed_ids.add(item_id)
             
             
 
@@ -0,0 +1,40 @@
+from sys import intern
+from utils.money import to_paise, to_rupees
+
+
+class LineItem:
+    # one line of an order (price in paise); slotted and with interned ids/names, since large histories hold many of them
+    __slots__ = ("item_id", "name", "qty", "price")
+
+    def __init__(self, item_id, name, qty, price):
+        self.item_id = intern(item_id)
+        self.name = intern(name)
+        self.qty = qty
+        self.price = price
+
+
+    @property
+    def subtotal(self):
+        return self.qty * self.price
+
+
+    def to_dict(self):
+        return {
+            "item_id" : self.item_id,
+            "name" : self.name,
+            "qty" : self.qty,
+            "price" : to_rupees(self.price)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            item_id = data['item_id'],
+            name = data['name'],
+            qty = data['qty'],
+            price = to_paise(data['price'])
+            )
+
+
+    def __repr__(self):
+        return f"LineItem({self.item_id!r}, {self.name!r}, qty={self.qty}, price={self.price})"
@@ -1,22 +1,67 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from sys import intern
+from orders.line_item import LineItem
+from utils.money import to_paise, to_rupees
+
+EPOCH = datetime(1970, 1, 1)  # naive: timestamps are local wall-clock time, no tz conversion
 
 class Order:
-    def __init__(self, items, total_amount = 0.0,  status="pending", timestamp=None, paid=False, order_id=None, name=None):
-        self.items = items
+    # slotted: a loaded history holds one of these per order, and no per-instance __dict__ is needed
+    __slots__ = ("items", "total_amount", "_status", "epoch", "day", "hour", "paid", "order_id", "name")
+
+    def __init__(self, items, total_amount = 0,  status="pending", timestamp=None, paid=False, order_id=None, name=None):
+        # total_amount is in paise; lines given as json dicts are kept as LineItem
+        self.items = [item if isinstance(item, LineItem) else LineItem.from_dict(item) for item in items]
         self.total_amount = total_amount
         self.status = status
-        self.timestamp = timestamp or datetime.now().isoformat()
+        self.timestamp = timestamp or datetime.now()
         self.paid = paid
         self.order_id = order_id
         self.name = name
 
 
+    # the timestamp is parsed once and kept as epoch seconds, ordinal day and hour;
+    # the ISO string is only rebuilt for serialization
+    @property
+    def timestamp(self):
+        return (EPOCH + timedelta(seconds=self.epoch)).isoformat()
+
+
+    @timestamp.setter
+    def timestamp(self, value):
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+        self.epoch = (moment - EPOCH).total_seconds()
+        self.day = moment.toordinal()
+        self.hour = moment.hour
+
+
+    @property
+    def status(self):
+        return self._status
+
+
+    @status.setter
+    def status(self, value):
+        # only a handful of distinct statuses exist, so every order shares the same string objects
+        self._status = intern(value)
+
+
+    @property
+    def date(self):
+        return date.fromordinal(self.day)
+
+
+    @property
+    def month(self):
+        return self.date.strftime("%Y-%m")
+
+
     def to_dict(self):
         return {
             "order_id" : self.order_id,
-            "items" : self.items,
+            "items" : [item.to_dict() for item in self.items],
             "status" : self.status,
-            "total_amount" : self.total_amount,
+            "total_amount" : to_rupees(self.total_amount),
             "timestamp" : self.timestamp,
             "name" : self.name,
             "paid" : self.paid
@@ -26,7 +71,7 @@ class Order:
     def from_dict(cls, data):
         return cls(
             items = data['items'],
-            total_amount = data['total_amount'],
+            total_amount = to_paise(data['total_amount']),
             status = data['status'],
             timestamp = data['timestamp'],
             paid = data['paid'],
@@ -36,12 +81,12 @@ class Order:
     
     
     def calculate_total(self):
-        self.total_amount = sum(item['qty'] * item['price'] for item in self.items)
+        self.total_amount = sum(item.subtotal for item in self.items)
         return self.total_amount
     
 
     def __str__(self):
-        return f"Order({self.order_id}) by {self.name} | Total: ₹{self.total_amount:.2f} | Paid: {self.paid}"
+        return f"Order({self.order_id}) by {self.name} | Total: ₹{to_rupees(self.total_amount):.2f} | Paid: {self.paid}"
     
 
     
\ No newline at end of file
@@ -0,0 +1,146 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date
+
+from orders.order import EPOCH
+
+
+_EPOCH_DAY = EPOCH.toordinal()
+
+
+class OrderIndex:
+    # incremental secondary indexes over the loaded orders: value -> set of order ids,
+    # plus every order as (epoch, order_id) in time order for date ranges and date sorting
+    def __init__(self):
+        self.timeline = []                  # sorted (Order.epoch, order_id)
+        self.by_month = defaultdict(set)    # "YYYY-MM"
+        self.by_status = defaultdict(set)
+        self.by_paid = {True: set(), False: set()}
+        self.by_customer = defaultdict(set) # lower-cased customer name, orders without one are not indexed
+
+
+    def clear(self):
+        self.__init__()
+
+
+    def add(self, order, timeline=True):
+        # timeline=False re-indexes an order already on the timeline (its timestamp never changes)
+        order_id = order.order_id
+        if timeline:
+            self._place(order)
+        self.by_month[order.month].add(order_id)
+        self.by_status[order.status].add(order_id)
+        self.by_paid[bool(order.paid)].add(order_id)
+        if order.name:
+            self.by_customer[order.name.lower()].add(order_id)
+
+
+    def add_many(self, orders):
+        # a whole partition at once: one sorted run spliced in (or merged) instead of an insort per order
+        orders = list(orders)
+        run = sorted((order.epoch, order.order_id) for order in orders)
+        if run:
+            position = bisect_left(self.timeline, run[0])
+            if position == len(self.timeline) or self.timeline[position] > run[-1]:
+                self.timeline[position:position] = run
+            else:
+                self.timeline.extend(run)
+                self.timeline.sort()  # two sorted runs: a linear merge
+        for order in orders:
+            self.add(order, timeline=False)
+
+
+    def remove(self, order, timeline=True):
+        order_id = order.order_id
+        if timeline:
+            position = bisect_left(self.timeline, (order.epoch, order_id))
+            if position < len(self.timeline) and self.timeline[position][1] == order_id:
+                del self.timeline[position]
+        self._discard(self.by_month, order.month, order_id)
+        self._discard(self.by_status, order.status, order_id)
+        self.by_paid[bool(order.paid)].discard(order_id)
+        if order.name:
+            self._discard(self.by_customer, order.name.lower(), order_id)
+
+
+    def remove_month(self, month, orders):
+        # evict a loaded month: its orders are one contiguous slice of the timeline
+        lo, hi = self._span(*self._month_days(month))
+        del self.timeline[lo:hi]
+        for order in orders:
+            self.remove(order, timeline=False)
+
+
+    def _place(self, order):
+        entry = (order.epoch, order.order_id)
+        if not self.timeline or self.timeline[-1] <= entry:
+            self.timeline.append(entry)  # new orders are the latest: amortized O(1)
+        else:
+            insort(self.timeline, entry)
+
+
+    def _discard(self, index, key, order_id):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(order_id)
+            if not ids:
+                del index[key]
+
+
+    def _day(self, iso_date):
+        return date.fromisoformat(iso_date).toordinal()
+
+
+    def _month_days(self, month):
+        # first and last ordinal day of "YYYY-MM"; an invalid month matches nothing
+        try:
+            first = date.fromisoformat(f"{month}-01")
+        except (TypeError, ValueError):
+            return 1, 0
+        following = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+        return first.toordinal(), following.toordinal() - 1
+
+
+    def _epochs(self, first_day, last_day):
+        # [start, end) in epoch seconds of the ordinal days first_day..last_day
+        return (first_day - _EPOCH_DAY) * 86400, (last_day + 1 - _EPOCH_DAY) * 86400
+
+
+    def _span(self, first_day, last_day):
+        # timeline positions [lo, hi) of the orders placed on ordinal days first_day..last_day
+        return self._positions(self._epochs(first_day, last_day))
+
+
+    def date_bounds(self, date=None, from_date=None, to_date=None, month=None):
+        # [start, end) epoch seconds of the date criterion that applies (date, then range, then month); None without one
+        if date:
+            return self._epochs(self._day(date), self._day(date))
+        if from_date and to_date:
+            return self._epochs(self._day(from_date), self._day(to_date))
+        if month:
+            return self._epochs(*self._month_days(month))
+        return None
+
+
+    def _positions(self, bounds):
+        # timeline positions [lo, hi) of the orders within bounds, [start, end) epoch seconds; empty when end <= start
+        lo = bisect_left(self.timeline, (bounds[0],))
+        return lo, max(lo, bisect_left(self.timeline, (bounds[1],)))
+
+
+    def count_within(self, bounds) -> int:
+        # two binary searches, no ids built
+        lo, hi = self._positions(bounds)
+        return hi - lo
+
+
+    def ordered_ids(self, bounds=None) -> list:
+        # every id in time order, or only those within bounds: a slice of the timeline
+        if bounds is None:
+            return [order_id for _, order_id in self.timeline]
+        lo, hi = self._positions(bounds)
+        return [order_id for _, order_id in self.timeline[lo:hi]]
+
+
+    def __len__(self):
+        return len(self.timeline)
@@ -1,117 +1,449 @@
-from utils.json_io import load_order_data, save_order_data
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
 from orders.order import Order
-from utils.filtering import filter_orders_by_criteria, filter_by_month 
+from orders.order_index import OrderIndex
+from orders.rollups import DailyRollups, days_of_month, days_between
+from storage.base import order_month, records_by_order, replay_records
+from storage.json_store import JsonOrderRepository
+from storage.write_behind import check_durability, synchronized
+from utils.filtering import OrderQuery, to_iso_date
+from analytics.aggregator import aggregate_orders
 
 
 class OrderManager:
-    def __init__(self, file_path="data/orders.json", menu_manager=None):
+    def __init__(self, file_path="data/orders.json", menu_manager=None, journal=True, checkpoint_every=500, repository=None, max_loaded_orders=50000, page_size=25, durability="immediate"):
         self.file_path = file_path
         self.orders = {}  # {order_id: Order}
+        self.index = OrderIndex()  # date / month / status / paid -> order ids, kept in step with self.orders
         self.menu_manager = menu_manager  # ✅ reference to the same menu manager
+
+        # json snapshot + write-ahead journal unless another backend is passed in
+        self.repository = repository or JsonOrderRepository(file_path, journal=journal, checkpoint_every=checkpoint_every)
+        self._pending = None  # commit records buffered by an open transaction()
+        self.durability = check_durability(durability)  # see storage.write_behind
+        self.flusher = None     # WriteBehind told about buffered commits (grouped / on-exit)
+        self._unflushed = []    # committed records not yet handed to the repository
+        self._lock = threading.RLock()  # mutations vs. a background flush
+        self.sequences = {}   # {"YYYY-MM": last order number handed out}
+        self.rollups = DailyRollups()  # per-day totals for every known month, loaded or not
+        self._dirty_rollups = set()    # months whose rollup rows changed since the last commit
+
+        # partitioned backends: which months are on disk / in memory (least recently used first)
+        self.known_months = set()
+        self.loaded_months = OrderedDict()
+        self.max_loaded_orders = max_loaded_orders  # cap for orders held from months other than the current one
+        self.page_size = page_size  # default rows per page_orders() page
+        self.version = 0  # bumped by every change to the orders, so derived results can tell they are stale
         self.load_orders()
 
 
+    @synchronized
     def load_orders(self):
-        raw_data = load_order_data(self.file_path)
-        self.orders = { order_id : Order.from_dict(order) for order_id, order in raw_data.items() }
+        self.version += 1
+        self.orders = {}
+        self.index.clear()
+        self.loaded_months = OrderedDict()
+        self.sequences = self._load_sequences()
+        self.rollups = DailyRollups(self.repository.load_rollups())
+        self._dirty_rollups = set()
+
+        if self.repository.partitioned:
+            # only the current month is parsed up front; older months load on demand
+            self.known_months = set(self.repository.list_months())
+            self.ensure_months([self._current_month()])
+
+            # months written before rollups existed are read once to build theirs, and so are
+            # months with unflushed records, whose stored rollups are behind
+            rolled_up = { day[:7] for day in self.rollups.days }
+            unflushed = { order_month(record["order_id"]) for record in self._unflushed }
+            self.known_months |= unflushed
+            for month in sorted(((self.known_months - rolled_up) | unflushed) - set(self.loaded_months)):
+                self.ensure_months([month])
+        else:
+            self._add_loaded(self.repository.iter_load())
+            stored_months = { day[:7] for day in self.rollups.days }
+            for month in sorted(stored_months | set(self.index.by_month)):
+                self._refresh_rollups(month)
+
+        if self.repository.needs_checkpoint():
+            self.checkpoint()
+
+
+    def _current_month(self):
+        return datetime.now().strftime("%Y-%m")
+
+
+    @synchronized
+    def ensure_months(self, months=None):
+        # make sure the given months are in self.orders; None means the whole history
+        if not self.repository.partitioned:
+            return
+
+        months = set(self.known_months if months is None else months)
+        for month in sorted(months):
+            if month in self.loaded_months:
+                self.loaded_months.move_to_end(month)
+            elif month in self.known_months:
+                self._add_loaded(self.repository.iter_load_month(month), month)
+                self.loaded_months[month] = None
+                self._refresh_rollups(month)
+
+        self._evict(keep=months)
+
+
+    def _add_loaded(self, entries, month=None):
+        # entries are (order_id, order_dict) pairs streamed by the repository; each becomes an
+        # Order straight away so the raw dicts never pile up. Records still waiting for a flush
+        # are newer than what the repository returned and are replayed onto their orders.
+        unflushed = records_by_order(
+            record for record in self._unflushed if month is None or order_month(record["order_id"]) == month
+        )
+
+        loaded = []
+        for order_id, data in entries:
+            if order_id in unflushed:
+                data = replay_records(order_id, data, unflushed.pop(order_id))
+            if data is not None:
+                loaded.append(self._add_loaded_order(order_id, data))
+
+        for order_id, records in unflushed.items():  # added since the repository last saw them
+            data = replay_records(order_id, None, records)
+            if data is not None:
+                loaded.append(self._add_loaded_order(order_id, data))
+        self.index.add_many(loaded)
+
+
+    def _add_loaded_order(self, order_id, data):
+        order = Order.from_dict(data)
+        self.orders[order_id] = order
+        self._note_order_id(order_id)
+        return order
+
+
+    def _refresh_rollups(self, month):
+        # the month's orders are in memory: recompute its rows, writing back only if they drifted
+        stored = self.rollups.month_days(month)
+        self.rollups.rebuild_month(month, (self.orders[order_id] for order_id in sorted(self.index.by_month.get(month, ()))))
+        if self.rollups.month_days(month) != stored:
+            if self.durability == "immediate":
+                self.repository.save_rollups(month, self.rollups.month_days(month))
+            else:
+                self._dirty_rollups.add(month)  # written with the records of the next flush
+
+
+    def _evict(self, keep=()):
+        # drop least recently used months (never the current one or those just requested) over the cap
+        current_month = self._current_month()
+        loaded = sum(len(self.index.by_month.get(month, ())) for month in self.loaded_months if month != current_month)
+
+        for month in list(self.loaded_months):
+            if loaded <= self.max_loaded_orders:
+                break
+            if month == current_month or month in keep:
+                continue
+
+            del self.loaded_months[month]
+            evicted = [self.orders.pop(order_id) for order_id in list(self.index.by_month.get(month, ()))]
+            self.index.remove_month(month, evicted)
+            loaded -= len(evicted)
+
+
+    def iter_orders(self, months=None):
+        # walk the history month by month so the memory cap still applies
+        if not self.repository.partitioned:
+            yield from list(self.orders.values())
+            return
+
+        for month in sorted(self.known_months if months is None else months):
+            self.ensure_months([month])
+            yield from [self.orders[order_id] for order_id in sorted(self.index.by_month.get(month, ()))]
 
 
     def save_orders(self):
-        order_dict = {
-            order_id : order.to_dict() for order_id, order in self.orders.items()
-        }
-        save_order_data(self.file_path, order_dict) 
+        self.repository.checkpoint(self.orders)
+        self.repository.save_sequences(self.sequences)
+
+
+    @synchronized
+    def checkpoint(self):
+        self.save_orders()
+
+
+    def _persist(self, record):
+        self.version += 1
+        if self._pending is not None:
+            self._pending.append(record)
+            return
+
+        self._write([record])
+
+
+    def _write(self, records):
+        # commit now, or leave the records for the flusher
+        if self.durability == "immediate":
+            self._commit(records)
+            return
+
+        self._unflushed.extend(records)
+        if self.flusher:
+            for _ in records:
+                self.flusher.notify()
+
+
+    @synchronized
+    def flush(self):
+        # hand every buffered record to the repository in one group commit
+        if self._pending is not None:  # never in the middle of a transaction
+            return
+
+        records, self._unflushed = self._unflushed, []
+        try:
+            self._commit(records)
+        except Exception:
+            self._unflushed[:0] = records
+            raise
+
+
+    def _commit(self, records):
+        if not records and not self._dirty_rollups:
+            return
+
+        if records:
+            self.repository.apply(records)
+        for month in sorted(self._dirty_rollups):
+            self.repository.save_rollups(month, self.rollups.month_days(month))
+        self._dirty_rollups.clear()
+
+        if self.repository.needs_checkpoint():
+            self.checkpoint()
+
+
+    @contextmanager
+    def transaction(self):
+        # unit of work: mutations inside the block are applied in memory and
+        # persisted (orders and menu) in a single commit when it exits cleanly
+        if self._pending is not None:  # nested: join the outer unit of work
+            yield self
+            return
+
+        with self._lock:
+            self._pending = []
+            menu_transaction = self.menu_manager.transaction() if self.menu_manager else nullcontext()
+            try:
+                with menu_transaction:
+                    yield self
+                    records, self._pending = self._pending, None
+                    self._write(records)
+            except Exception:
+                # nothing of the block reached disk, so the last persisted state (plus any
+                # unflushed records) is the rollback point
+                self._pending = None
+                self.load_orders()
+                raise
 
 
     def generate_order_id(self, timestamp):
         # Use passed timestamp, not datetime.now()
+        # O(1): bump the month's high-water mark; numbers are never reused, even after remove_order
         year_month_str = timestamp[:7]  # "YYYY-MM"
-        orders_in_month = []
+        self.ensure_months([year_month_str])  # no-op for the (eagerly loaded) current month
 
-        for order in self.orders.values():
-            order_month = order.timestamp[:7]
-            if order_month == year_month_str:
-                orders_in_month.append(order)
+        new_number = self.sequences.get(year_month_str, 0) + 1
+        self.sequences[year_month_str] = new_number
+        new_order_id = f"ORD-{year_month_str}-{str(new_number).zfill(4)}"
+        return new_order_id
 
-        if not orders_in_month:
-            new_id_suffix = "0001"
-        else:
-            existing_numbers = [
-                int(order.order_id.split('-')[3]) for order in orders_in_month
-            ]
-            new_number = max(existing_numbers) + 1
-            new_id_suffix = str(new_number).zfill(4)
 
-        new_order_id = f"ORD-{year_month_str}-{new_id_suffix}"
-        return new_order_id
+    def _note_order_id(self, order_id):
+        # keep the month's sequence at or above every id seen in the data
+        try:
+            number = int(order_id.split('-')[3])
+        except (IndexError, ValueError):
+            return
+
+        month = order_month(order_id)
+        if number > self.sequences.get(month, 0):
+            self.sequences[month] = number
+
 
+    def _load_sequences(self):
+        sequences = self.repository.load_sequences()
+        valid = isinstance(sequences, dict) and all(
+            isinstance(month, str) and len(month) == 7 and isinstance(number, int) and number >= 0
+            for month, number in sequences.items()
+        )
+        # anything malformed is dropped; loaded orders rebuild the counters
+        return dict(sequences) if valid else {}
 
+
+    @synchronized
     def add_order(self, order:Order):
-       
+
         if not isinstance(order, Order):
             raise ValueError("Must be a Order")
-        
+
+        month = order_month(order.order_id)
+        self.ensure_months([month])
         if order.order_id in self.orders:
             return False
 
         self.orders[order.order_id] = order
-        self.save_orders()
+        self.index.add(order)
+        self._add_rollup(order)
+        self._note_order_id(order.order_id)
+        self.known_months.add(month)
+        self.loaded_months.setdefault(month, None)
+        self._persist({"op": "add", "order_id": order.order_id, "order": order.to_dict()})
 
         for item in order.items:
-            item_id = item.get("item_id")
-            qty = item.get("qty", 1)
-            self.menu_manager.increment_order_count(item_id, qty)
-            self.menu_manager.save_menu()
-            
+            self.menu_manager.increment_order_count(item.item_id, item.qty)
+        self.menu_manager.save_menu()
+
         return True
 
 
+    @synchronized
     def update_status(self, order_id, new_status):
-        if order_id not in self.orders:
+        order = self._loaded_order(order_id)
+        if not order:
             return False
-        
-        order = self.orders[order_id]
+
+        self.index.remove(order, timeline=False)
+        self._remove_rollup(order)
         order.status = new_status
-        self.save_orders()
+        self.index.add(order, timeline=False)
+        self._add_rollup(order)
+        self._persist({"op": "status", "order_id": order_id, "status": new_status})
         return True
 
 
+    @synchronized
     def mark_paid(self, order_id):
-        if order_id not in self.orders:
+        order = self._loaded_order(order_id)
+        if not order:
             return False
 
-        order = self.orders[order_id]
+        self.index.remove(order, timeline=False)
+        self._remove_rollup(order)
         order.paid = True
-        self.save_orders()
+        self.index.add(order, timeline=False)
+        self._add_rollup(order)
+        self._persist({"op": "paid", "order_id": order_id})
         return True
 
 
+    def _add_rollup(self, order):
+        self.rollups.add(order)
+        self._dirty_rollups.add(order.month)
+
+
+    def _remove_rollup(self, order):
+        self.rollups.remove(order)
+        self._dirty_rollups.add(order.month)
+
+
+    def summarize(self, date=None, from_date=None, to_date=None, month=None, status=None):
+        # aggregate (see analytics.aggregator) straight from the daily rollups, no orders are loaded;
+        # same precedence as filter_orders, and no criteria means the whole history
+        if status not in (None, "completed"):  # not rolled up
+            return self.aggregate(status=status, date=date, from_date=from_date, to_date=to_date, month=month)
+
+        if date:
+            day_keys = [to_iso_date(date)]
+        elif from_date and to_date:
+            day_keys = days_between(to_iso_date(from_date), to_iso_date(to_date))
+        elif month:
+            day_keys = days_of_month(month)
+        else:
+            day_keys = sorted(self.rollups.days)
+        return self.rollups.aggregate(day_keys, status=status)
+
+
+    def aggregate(self, status=None, paid=None, date=None, from_date=None, to_date=None, month=None):
+        # aggregate of the orders matching the criteria, in one pass over what the query streams
+        return aggregate_orders(self.query().filter(status=status, paid=paid, date=date, from_date=from_date, to_date=to_date, month=month))
+
+
+    def aggregate_window(self, from_date, to_date, bucket="day", status=None):
+        """
+        [{"start", "order_count", "revenue" (paise)}, ...] for every bucket ("day", "week" or "hour") from
+        from_date through to_date, oldest first. Day and week buckets are summed from the rollups;
+        hour buckets from the orders in range, in one pass over what the query streams.
+        """
+        from_date, to_date = to_iso_date(from_date), to_iso_date(to_date)
+        if bucket != "hour":
+            return self.rollups.window(from_date, to_date, bucket, status)
+
+        days = days_between(from_date, to_date)
+        first_day = datetime.fromisoformat(from_date).toordinal()
+        counts, revenues = [0] * (len(days) * 24), [0] * (len(days) * 24)
+        for order in self.query().filter(status=status, from_date=from_date, to_date=to_date):
+            slot = (order.day - first_day) * 24 + order.hour
+            counts[slot] += 1
+            revenues[slot] += order.total_amount
+        return [
+            {"start": f"{key} {hour:02d}:00", "order_count": counts[slot], "revenue": revenues[slot]}
+            for slot, (key, hour) in enumerate((key, hour) for key in days for hour in range(24))
+        ]
+
+
+    @synchronized
     def get_order(self, order_id):
-        if order_id not in self.orders:
+        # read-only lookup: an order of a month that is not in memory is decoded on its own
+        # (repository.load_order) instead of loading the month; mutators use _loaded_order
+        if order_id in self.orders:
+            return self.orders[order_id]
+        month = order_month(order_id)
+        if not self.repository.partitioned or month in self.loaded_months or month not in self.known_months:
             return False
-        
-        return self.orders[order_id]
+
+        records = records_by_order(self._unflushed).get(order_id, ())
+        data = replay_records(order_id, self.repository.load_order(order_id), records)
+        return Order.from_dict(data) if data is not None else False
+
+
+    def _loaded_order(self, order_id):
+        # the order as held in self.orders (its month loaded if need be), or None
+        if order_id not in self.orders:
+            self.ensure_months([order_month(order_id)])
+        return self.orders.get(order_id)
 
 
     def get_all_orders(self):
-        return list(self.orders.values())
-    
+        return list(self.iter_orders())
+
+
+    def query(self):
+        return OrderQuery(self)
+
+
+    def filter_orders(self, status=None, paid=None, date=None, from_date=None, to_date=None, month=None, customer=None):
+        return self.query().filter(status, paid, date, from_date, to_date, month, customer).to_dict()
+
 
-    def filter_orders(self, status=None, paid=None, date=None):
-        return filter_orders_by_criteria(self.orders, status=status, paid=paid, date=date)
+    def page_orders(self, after=None, before=None, page_size=None, status=None, paid=None, date=None, from_date=None, to_date=None, month=None, customer=None):
+        # one keyset page (OrderPage) of filter_orders' matches in timestamp order; pass a page's
+        # next_cursor as after or its prev_cursor as before to move between pages
+        query = self.query().filter(status, paid, date, from_date, to_date, month, customer)
+        return query.page(page_size or self.page_size, after=after, before=before)
 
 
+    @synchronized
     def remove_order(self, order_id):
-        if order_id not in self.orders:
+        if not self._loaded_order(order_id):
             return False
-        
+
         order = self.orders.pop(order_id)
+        self.index.remove(order)
+        self._remove_rollup(order)
+        # the data alone would let the next id reuse this number, so pin the high-water mark
+        self.repository.save_sequences(self.sequences)
         if self.menu_manager:
             for item in order.items:
-                self.menu_manager.decrement_order_count(item['item_id'], item['qty'])
+                self.menu_manager.decrement_order_count(item.item_id, item.qty)
             self.menu_manager.save_menu()
 
-        self.save_orders()
+        self._persist({"op": "remove", "order_id": order_id})
         return True
-
-
@@ -0,0 +1,182 @@
+import calendar
+from collections import Counter
+from datetime import date, timedelta
+
+BUCKET_DAYS = {"day": 1, "week": 7}
+
+
+def _new_day():
+    return {
+        "orders": 0, "revenue_paise": 0,
+        "completed_orders": 0, "completed_revenue_paise": 0,
+        "paid_orders": 0,
+        "hours": {}, "completed_hours": {},
+        "items": {}
+    }
+
+
+def _new_item(name):
+    return {"name": name, "qty": 0, "revenue_paise": 0, "completed_qty": 0, "completed_revenue_paise": 0, "paid_qty": 0}
+
+
+def days_of_month(month: str) -> list:
+    # anything that is not a real "YYYY-MM" matches no days, like filter_by_month
+    try:
+        year, mon = int(month[:4]), int(month[5:7])
+        last_day = calendar.monthrange(year, mon)[1]
+    except ValueError:
+        return []
+    if month != f"{year:04d}-{mon:02d}":
+        return []
+    return [f"{month}-{day:02d}" for day in range(1, last_day + 1)]
+
+
+def days_between(from_date: str, to_date: str) -> list:
+    start, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+    return [str(start + timedelta(days=offset)) for offset in range((end - start).days + 1)]
+
+
+class DailyRollups:
+    """
+    Materialized per-day totals, kept in step with the orders by OrderManager.
+
+    days = {"YYYY-MM-DD": {
+        "orders", "revenue_paise", "completed_orders", "completed_revenue_paise", "paid_orders",
+        "hours": {hour: orders}, "completed_hours": {hour: orders},
+        "items": {item_id: {"name", "qty", "revenue_paise", "completed_qty", "completed_revenue_paise", "paid_qty"}}
+    }}
+    Hours are string keys so the structure round-trips through json unchanged.
+    """
+
+    def __init__(self, days=None):
+        # rows from before money was kept in paise are dropped; their months are rebuilt from the orders
+        self.days = { key: row for key, row in (days or {}).items() if "revenue_paise" in row }
+
+
+    def add(self, order, sign=1):
+        key = str(order.date)
+        day = self.days.setdefault(key, _new_day())
+        completed = order.status == "completed"
+        hour = str(order.hour)
+
+        day["orders"] += sign
+        day["revenue_paise"] += sign * order.total_amount
+        day["hours"][hour] = day["hours"].get(hour, 0) + sign
+        if completed:
+            day["completed_orders"] += sign
+            day["completed_revenue_paise"] += sign * order.total_amount
+            day["completed_hours"][hour] = day["completed_hours"].get(hour, 0) + sign
+        if order.paid:
+            day["paid_orders"] += sign
+
+        for item in order.items:
+            row = day["items"].setdefault(item.item_id, _new_item(item.name))
+            qty = sign * item.qty
+            revenue = qty * item.price
+            row["qty"] += qty
+            row["revenue_paise"] += revenue
+            if completed:
+                row["completed_qty"] += qty
+                row["completed_revenue_paise"] += revenue
+            if order.paid:
+                row["paid_qty"] += qty
+
+        self._prune(key)
+
+
+    def remove(self, order):
+        self.add(order, sign=-1)
+
+
+    def _prune(self, key):
+        # removals must not leave empty rows behind
+        day = self.days[key]
+        if day["orders"] <= 0:
+            del self.days[key]
+            return
+
+        for hours in (day["hours"], day["completed_hours"]):
+            for hour in [hour for hour, count in hours.items() if count <= 0]:
+                del hours[hour]
+        for item_id in [item_id for item_id, row in day["items"].items() if row["qty"] <= 0]:
+            del day["items"][item_id]
+
+
+    def month_days(self, month: str) -> dict:
+        return {key: self.days[key] for key in days_of_month(month) if key in self.days}
+
+
+    def rebuild_month(self, month: str, orders):
+        for key in days_of_month(month):
+            self.days.pop(key, None)
+        for order in orders:
+            self.add(order)
+
+
+    def aggregate(self, day_keys, status=None):
+        """
+        Same shape as analytics.aggregator.aggregate_orders, summed from the rollup rows of day_keys.
+        Only status=None (every order) and status="completed" are rolled up.
+        """
+        if status not in (None, "completed"):
+            raise ValueError(f"Rollups are not kept for status '{status}'")
+
+        prefix = "completed_" if status == "completed" else ""
+        hours_key = "completed_hours" if status == "completed" else "hours"
+        order_count = 0
+        revenue = 0
+        item_qty = {}
+        item_revenue = {}
+        item_names = {}
+        hourly = Counter()
+
+        for key in day_keys:
+            day = self.days.get(key)
+            if day is None:
+                continue
+
+            order_count += day[prefix + "orders"]
+            revenue += day[prefix + "revenue_paise"]
+            for hour, count in day[hours_key].items():
+                hourly[int(hour)] += count
+
+            for item_id, row in day["items"].items():
+                qty = row[prefix + "qty"]
+                if qty <= 0:
+                    continue
+                item_qty[item_id] = item_qty.get(item_id, 0) + qty
+                item_revenue[item_id] = item_revenue.get(item_id, 0) + row[prefix + "revenue_paise"]
+                item_names.setdefault(item_id, row["name"])
+
+        return {
+            "order_count": order_count,
+            "revenue": revenue,
+            "item_qty": item_qty,
+            "item_revenue": item_revenue,
+            "item_names": item_names,
+            "hourly": hourly,
+        }
+
+
+    def window(self, from_date: str, to_date: str, bucket="day", status=None) -> list:
+        """
+        Order count and revenue per bucket from from_date through to_date, in one walk over the day rows.
+        bucket is "day" or "week" (7-day windows starting at from_date); empty buckets are included.
+        """
+        if bucket not in BUCKET_DAYS:
+            raise ValueError(f"Unknown bucket '{bucket}'")
+        if status not in (None, "completed"):
+            raise ValueError(f"Rollups are not kept for status '{status}'")
+
+        prefix = "completed_" if status == "completed" else ""
+        buckets = []
+        for offset, key in enumerate(days_between(from_date, to_date)):
+            if offset % BUCKET_DAYS[bucket] == 0:
+                buckets.append({"start": key, "order_count": 0, "revenue": 0})
+
+            day = self.days.get(key)
+            if day is not None:
+                buckets[-1]["order_count"] += day[prefix + "orders"]
+                buckets[-1]["revenue"] += day[prefix + "revenue_paise"]
+
+        return buckets
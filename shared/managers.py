@@ -1,5 +1,106 @@
-from menu.manager import MenuManager
-from orders.order_manager import OrderManager
+import atexit
+from shared import settings
 
-menu_manager = MenuManager("data/menu.json")
-order_manager = OrderManager("data/orders.json", menu_manager=menu_manager)
+
+class LazyManager:
+    """
+    Stands in for a manager and builds it on first use.
+
+    `from shared.managers import order_manager` is cheap: the manager (and the data files
+    it parses) is only constructed when an attribute is first read or set. After that
+    every access goes straight to the built instance.
+    """
+    __slots__ = ("_factory", "_instance")
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+
+
+    def get(self):
+        if self._instance is None:
+            object.__setattr__(self, "_instance", self._factory())
+        return self._instance
+
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+    def __setattr__(self, name, value):
+        setattr(self.get(), name, value)
+
+
+_write_behind = None  # storage.write_behind.WriteBehind, unless DURABILITY is "immediate"
+
+
+def _register_for_flush(manager):
+    global _write_behind
+    if settings.DURABILITY == "immediate":
+        return manager
+
+    if _write_behind is None:
+        from storage.write_behind import WriteBehind
+
+        _write_behind = WriteBehind(settings.DURABILITY, settings.FLUSH_INTERVAL, settings.FLUSH_BATCH_SIZE)
+        atexit.register(_write_behind.stop)  # clean exit, exit() and Ctrl+C all write what is buffered
+    _write_behind.register(manager)
+    return manager
+
+
+def flush_managers():
+    # write every change the loaded managers still buffer (no-op with immediate durability)
+    if _write_behind is not None:
+        _write_behind.flush()
+
+
+def _build_menu_manager():
+    from menu.manager import MenuManager
+    from storage import create_menu_repository
+
+    return _register_for_flush(MenuManager(
+        settings.MENU_FILE,
+        repository=create_menu_repository(settings.STORAGE_BACKEND, settings.MENU_FILE, settings.SQLITE_FILE),
+        durability=settings.DURABILITY
+    ))
+
+
+def _load_progress(file_path, done, total):
+    if total >= settings.LOAD_PROGRESS_MIN_BYTES:
+        from utils.display import print_load_progress
+
+        print_load_progress(file_path, done, total)
+
+
+def _build_order_manager():
+    from orders.order_manager import OrderManager
+    from storage import create_order_repository
+
+    return _register_for_flush(OrderManager(
+        settings.ORDERS_FILE,
+        menu_manager=menu_manager.get(),
+        repository=create_order_repository(
+            settings.STORAGE_BACKEND, settings.ORDERS_FILE, settings.SQLITE_FILE,
+            orders_dir=settings.ORDERS_DIR, checkpoint_every=settings.JOURNAL_CHECKPOINT_EVERY,
+            progress=_load_progress
+        ),
+        max_loaded_orders=settings.MAX_LOADED_ORDERS,
+        page_size=settings.ORDER_PAGE_SIZE,
+        durability=settings.DURABILITY
+    ))
+
+
+def _build_auth_manager():
+    from auth.auth import AuthManager  # bcrypt, users file
+
+    return AuthManager()
+
+
+menu_manager = LazyManager(_build_menu_manager)
+order_manager = LazyManager(_build_order_manager)
+auth_manager = LazyManager(_build_auth_manager)  # admin side only
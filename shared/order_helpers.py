@@ -2,6 +2,8 @@
 
 from utils.display import print_error, print_success, print_warning,console, Table, box
 from utils.validation import valid_qty
+from utils.money import to_rupees
+from orders.line_item import LineItem
 from datetime import datetime
 from rich.prompt import Prompt
 from time import sleep
@@ -15,20 +17,20 @@ def display_order_confirmation(items):
     table.add_column("Price Each", justify="right", style="yellow")
     table.add_column("Subtotal", justify="right", style="bold yellow")
     
-    total = 0
+    total = 0  # paise
     for item in items:
-        subtotal = item["qty"] * item["price"]
+        subtotal = item.subtotal
         total += subtotal
         table.add_row(
-            item["name"],
-            str(item["qty"]),
-            f"₹{item['price']:.2f}",
-            f"₹{subtotal:.2f}"
+            item.name,
+            str(item.qty),
+            f"₹{to_rupees(item.price):.2f}",
+            f"₹{to_rupees(subtotal):.2f}"
         )
     
     # Add total row
     table.add_section()
-    table.add_row("", "", "TOTAL:", f"₹{total:.2f}", style="bold green")
+    table.add_row("", "", "TOTAL:", f"₹{to_rupees(total):.2f}", style="bold green")
     
     console.print(table)
     return total
@@ -61,14 +63,9 @@ def prompt_order_items(menu_manager, item_name_dict):
         price = menu_manager.menu_items[item_id].price
         qty = valid_qty(f"How many {item_name}")
         if item_id in items:
-            items[item_id]["qty"] += qty
+            items[item_id].qty += qty
         else:
-            items[item_id] = {
-                "item_id": item_id,
-                "name": item_name,
-                "qty": qty,
-                "price": price
-                }
+            items[item_id] = LineItem(item_id, item_name, qty, price)
     
         while True:
             more = Prompt.ask("Would you like to add anything else to your order? (y/n)").lower().strip()
@@ -111,16 +108,23 @@ def place_order_flow(menu_manager, order_manager, item_name_dict, is_admin=False
 
     from orders.order import Order
     order = Order(items, total, "placed", timestamp, False, order_id, customer_name)
-    success = order_manager.add_order(order)
+
+    if is_admin:
+        success = order_manager.add_order(order)
+    else:
+        # customer checkout: order, payment and completion land in a single commit
+        with order_manager.transaction():
+            success = order_manager.add_order(order)
+            if success:
+                order_manager.mark_paid(order_id)
+                order_manager.update_status(order_id, "completed")
 
     if success:
         
         if not is_admin:
-            order_manager.mark_paid(order_id)
             print_success("💰 Payment successful!")
             console.print("🧑‍🍳 Preparing your order...")
             sleep(2)
-            order_manager.update_status(order_id, "completed")
             print_success("✅ Your order is now completed. Enjoy your meal!")
         else:
             print_success(f"📦 Order for '{customer_name}' added.")
@@ -147,14 +151,14 @@ def modify_order(items, menu_manager, item_name_dict):
 
         elif choice == "2":  # Remove item
             item_name = Prompt.ask("Enter item name to remove").strip().lower()
-            items = [i for i in items if i["name"].lower() != item_name]
+            items = [i for i in items if i.name.lower() != item_name]
 
         elif choice == "3":  # Change quantity
             item_name = Prompt.ask("Enter item name to update qty").strip().lower()
             for i in items:
-                if i["name"].lower() == item_name:
+                if i.name.lower() == item_name:
                     new_qty = valid_qty(f"Enter new qty for {item_name}")
-                    i["qty"] = new_qty
+                    i.qty = new_qty
                     break
             else:
                 print_error("Item not found in order.")
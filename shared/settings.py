@@ -0,0 +1,49 @@
+# shared/settings.py
+import os
+
+DATA_DIR = "data"
+MENU_FILE = os.path.join(DATA_DIR, "menu.json")
+ORDERS_FILE = os.path.join(DATA_DIR, "orders.json")     # legacy single-file layout, split into ORDERS_DIR on first start
+ORDERS_DIR = os.path.join(DATA_DIR, "orders")            # one YYYY-MM.json (+ .journal) per month
+SQLITE_FILE = os.path.join(DATA_DIR, "brewops.db")
+
+# "json" (default) or "sqlite"; run `python -m storage.migrate` before switching to sqlite
+STORAGE_BACKEND = os.environ.get("BREWOPS_STORAGE", "json").strip().lower()
+
+# journal records appended before orders.json is compacted (json backend only)
+JOURNAL_CHECKPOINT_EVERY = 500
+
+# `python -m storage.archive_months` compresses months older than the last ARCHIVE_AFTER_MONTHS
+# (the current one included) into orders/archive/; "gzip" is quick, "lzma" smaller
+ARCHIVE_AFTER_MONTHS = 3
+ARCHIVE_COMPRESSION = "gzip"
+
+# when order and menu changes are written (BREWOPS_DURABILITY): "immediate" on every change,
+# "grouped" by a background thread at most every FLUSH_INTERVAL seconds or FLUSH_BATCH_SIZE
+# changes, or "on-exit" only at logout / exit. Buffered changes are lost if the process dies.
+DURABILITY = os.environ.get("BREWOPS_DURABILITY", "immediate").strip().lower()
+FLUSH_INTERVAL = 2.0
+FLUSH_BATCH_SIZE = 50
+
+# what a JSON save forces to disk before returning (BREWOPS_FSYNC): "none" (the OS decides),
+# "file" (fsync the data) or "full" (also fsync the directory, so the rename itself survives
+# a power cut). Saves are atomic in every case: a crash leaves the old file or the new one.
+FSYNC_WRITES = os.environ.get("BREWOPS_FSYNC", "none").strip().lower()
+
+# order files at least this large show a progress line while they stream in
+LOAD_PROGRESS_MIN_BYTES = 32 * 1024 * 1024
+
+# orders from past months kept in memory before least recently used months are evicted
+MAX_LOADED_ORDERS = 50000
+
+# analytics results (summaries, dashboard insights) kept for reuse until orders or menu change
+ANALYTICS_CACHE_SIZE = 128
+
+# rows per page in the admin order listing
+ORDER_PAGE_SIZE = 25
+
+# BREWOPS_EXPLAIN=1 prints the query plan (estimated vs actual rows) under the admin order filter results
+SHOW_QUERY_PLANS = os.environ.get("BREWOPS_EXPLAIN", "").strip() == "1"
+
+# BREWOPS_CACHE_STATS=1 prints the analytics cache counters (hits, misses, stale entries) under summaries and the dashboard
+SHOW_CACHE_STATS = os.environ.get("BREWOPS_CACHE_STATS", "").strip() == "1"
@@ -0,0 +1,26 @@
+# storage/__init__.py
+
+from .base import OrderRepository, MenuRepository, apply_record
+from .json_store import JsonOrderRepository, PartitionedJsonOrderRepository, JsonMenuRepository
+from .sqlite_store import SqliteOrderRepository, SqliteMenuRepository
+
+
+def create_order_repository(backend="json", file_path="data/orders.json", db_path="data/brewops.db", orders_dir=None, **options):
+    if backend == "sqlite":
+        return SqliteOrderRepository(db_path)
+    if backend == "json" and orders_dir:
+        return PartitionedJsonOrderRepository(orders_dir, legacy_file=file_path, **options)
+    if backend == "json":
+        return JsonOrderRepository(file_path, **options)
+    raise ValueError(f"Unknown storage backend '{backend}'")
+
+
+def create_menu_repository(backend="json", file_path="data/menu.json", db_path="data/brewops.db"):
+    if backend == "sqlite":
+        return SqliteMenuRepository(db_path)
+    if backend == "json":
+        return JsonMenuRepository(file_path)
+    raise ValueError(f"Unknown storage backend '{backend}'")
+
+
+__all__ = ["OrderRepository", "MenuRepository", "apply_record", "JsonOrderRepository", "PartitionedJsonOrderRepository", "JsonMenuRepository", "SqliteOrderRepository", "SqliteMenuRepository", "create_order_repository", "create_menu_repository"]
@@ -0,0 +1,109 @@
+# storage/archive.py
+#
+# Compressed, immutable archive of one closed month of orders: orders/archive/YYYY-MM.json.gz (or .xz).
+# The compressed stream starts with a one-line JSON header with the month's aggregates, followed by
+# the {order_id: order_dict} object. Readers of totals decompress no further than the header.
+
+import gzip
+import json
+import lzma
+from contextlib import contextmanager
+from utils.display import print_error
+from utils.json_io import atomic_write, iter_json_object
+
+ARCHIVE_FORMAT = "brewops-orders-archive"
+ARCHIVE_VERSION = 2
+
+# compression: (file extension, compress, payload reader over an open file)
+COMPRESSIONS = {
+    "gzip": (".json.gz", gzip.compress, lambda file: gzip.GzipFile(fileobj=file, mode="rb")),
+    "lzma": (".json.xz", lzma.compress, lambda file: lzma.LZMAFile(file, "rb")),
+}
+
+ARCHIVE_EXTENSIONS = tuple(extension for extension, _, _ in COMPRESSIONS.values())
+
+# what a damaged archive raises while it is decompressed and parsed
+ARCHIVE_ERRORS = (OSError, EOFError, ValueError, lzma.LZMAError)
+
+TOTAL_FIELDS = ("orders", "revenue_paise", "completed_orders", "completed_revenue_paise", "paid_orders")
+
+
+def archive_extension(compression):
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {', '.join(COMPRESSIONS)}")
+    return COMPRESSIONS[compression][0]
+
+
+def month_totals(days):
+    # month-level sums of the daily rollup rows
+    return { field: sum(row[field] for row in days.values()) for field in TOTAL_FIELDS }
+
+
+def write_archive(file_path, month, orders, days, compression="gzip"):
+    """
+    Write orders ({order_id: order_dict}) of month as an archive; days are the month's
+    rollup rows (see orders.rollups.DailyRollups), kept in the header with their totals.
+    The header is compressed with the orders, so a small month does not grow when archived.
+    """
+    archive_extension(compression)
+    header = {
+        "format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION,
+        "month": month, "compression": compression,
+        "totals": month_totals(days), "days": days,
+    }
+    # no indent, and ensure_ascii, so the header is exactly one line
+    payload = json.dumps(header, separators=(",", ":")).encode("ascii") + b"\n"
+    payload += json.dumps(orders, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    atomic_write(file_path, COMPRESSIONS[compression][1](payload))
+
+
+def archive_compression(file_path):
+    # the compression of an archive, from its extension: the header is only readable once decompressed
+    for compression, (extension, _, _) in COMPRESSIONS.items():
+        if file_path.endswith(extension):
+            return compression
+    raise ValueError("not an order archive")
+
+
+def _read_header(stream, compression):
+    header = json.loads(stream.readline())
+    if not isinstance(header, dict) or header.get("format") != ARCHIVE_FORMAT:
+        raise ValueError("not an order archive")
+    if header.get("version") != ARCHIVE_VERSION or header.get("compression") != compression:
+        raise ValueError("unsupported archive version or compression")
+    return header
+
+
+@contextmanager
+def _open_stream(file_path):
+    # the decompressed archive, header line first
+    compression = archive_compression(file_path)
+    with open(file_path, "rb") as file, COMPRESSIONS[compression][2](file) as stream:
+        yield stream, compression
+
+
+def read_archive_header(file_path):
+    # the header alone: month totals and daily rows, decompressing only the first line
+    with _open_stream(file_path) as (stream, compression):
+        return _read_header(stream, compression)
+
+
+@contextmanager
+def open_archive_payload(file_path, mode="rb"):
+    # the decompressed {order_id: order_dict} bytes after the header, for iter_json_object's opener
+    with _open_stream(file_path) as (stream, compression):
+        _read_header(stream, compression)
+        yield stream
+
+
+def count_archive_orders(file_path):
+    # decompresses and parses the whole payload; raises if any of it is unreadable
+    return sum(1 for _ in iter_json_object(file_path, opener=open_archive_payload))
+
+
+def iter_archive_orders(file_path):
+    # (order_id, order_dict) pairs streamed out of the archive
+    try:
+        yield from iter_json_object(file_path, opener=open_archive_payload)
+    except ARCHIVE_ERRORS as e:
+        print_error(f"Order archive '{file_path}' is unreadable: {e}")
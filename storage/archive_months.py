@@ -0,0 +1,77 @@
+# storage/archive_months.py
+#
+# Compress closed months of orders into orders/archive/ (see storage.archive):
+#     python -m storage.archive_months [--orders-dir data/orders] [--keep 3] [--compression gzip|lzma]
+# Run it while the app is stopped. Archived months stay readable; their totals come from the archive header.
+
+import argparse
+import os
+from datetime import date
+from shared import settings
+from orders.order import Order
+from orders.rollups import DailyRollups
+from storage.archive import COMPRESSIONS, count_archive_orders
+from storage.json_store import PartitionedJsonOrderRepository
+from utils.display import print_success, print_warning
+
+
+def first_kept_month(keep_months, today=None):
+    # "YYYY-MM" of the oldest month that stays live: the current month and the keep_months - 1 before it
+    today = today or date.today()
+    index = today.year * 12 + today.month - 1 - (keep_months - 1)
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def archive_closed_months(orders_dir=settings.ORDERS_DIR, keep_months=settings.ARCHIVE_AFTER_MONTHS, compression=settings.ARCHIVE_COMPRESSION, today=None):
+    # [(month, orders, bytes before, bytes after)] for every month archived; months already
+    # archived and not edited since are skipped, edited ones are folded into a new archive
+    repository = PartitionedJsonOrderRepository(orders_dir)
+    cutoff = first_kept_month(max(keep_months, 1), today)
+    archives = repository.list_archives()
+    archived = []
+
+    for month in repository.list_live_months():
+        if month >= cutoff:
+            continue
+
+        paths = [os.path.join(orders_dir, f"{month}{ext}") for ext in (".json", ".journal")] + [archives.get(month)]
+        before = sum(os.path.getsize(path) for path in paths if path and os.path.exists(path))
+        if month in archives and not os.path.exists(paths[0]):
+            # the journal is replayed over the old archive, which therefore has to read back whole
+            try:
+                count_archive_orders(archives[month])
+            except Exception as e:
+                print_warning(f"Skipped {month}: its archive '{archives[month]}' is unreadable ({e}).")
+                continue
+
+        orders = repository.load_month(month)
+        if not orders:
+            print_warning(f"{month} has no orders left, nothing to archive.")
+            continue
+
+        rollups = DailyRollups()
+        for data in orders.values():
+            rollups.add(Order.from_dict(data))
+        archive_path = repository.archive_month(month, orders, rollups.month_days(month), compression)
+        archived.append((month, len(orders), before, os.path.getsize(archive_path)))
+
+    repository.close()
+    return archived
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive closed months of BrewOps orders.")
+    parser.add_argument("--orders-dir", default=settings.ORDERS_DIR)
+    parser.add_argument("--keep", type=int, default=settings.ARCHIVE_AFTER_MONTHS, help="recent months (current included) left uncompressed")
+    parser.add_argument("--compression", choices=sorted(COMPRESSIONS), default=settings.ARCHIVE_COMPRESSION)
+    args = parser.parse_args(argv)
+
+    archived = archive_closed_months(args.orders_dir, args.keep, args.compression)
+    if not archived:
+        print_success("Nothing archived.")
+    for month, order_count, before, after in archived:
+        print_success(f"Archived {order_count} orders of {month}: {before / 1024:,.1f} KB -> {after / 1024:,.1f} KB ({args.compression}).")
+
+
+if __name__ == "__main__":
+    main()
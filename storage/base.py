@@ -0,0 +1,134 @@
+# storage/base.py
+
+
+def order_month(order_id: str) -> str:
+    # "ORD-YYYY-MM-NNNN" -> "YYYY-MM"; ids are minted from the order timestamp
+    return order_id[4:11]
+
+
+def apply_record(orders: dict, record: dict):
+    # replay one commit record onto {order_id: order_dict}
+    op = record.get("op")
+    order_id = record.get("order_id")
+
+    if op == "batch":
+        for sub_record in record.get("records", []):
+            apply_record(orders, sub_record)
+    elif op == "add":
+        orders[order_id] = record["order"]
+    elif op == "status" and order_id in orders:
+        orders[order_id]["status"] = record["status"]
+    elif op == "paid" and order_id in orders:
+        orders[order_id]["paid"] = True
+    elif op == "remove":
+        orders.pop(order_id, None)
+
+
+def replay_records(order_id: str, order, records):
+    # order_dict (None if absent) after records for that one order_id; None when it ends up removed
+    orders = {} if order is None else {order_id: order}
+    for record in records:
+        apply_record(orders, record)
+    return orders.get(order_id)
+
+
+def records_by_order(records) -> dict:
+    # {order_id: [records]} with batches flattened, each list in commit order
+    by_order = {}
+    for record in records:
+        for sub_record in (record["records"] if record.get("op") == "batch" else [record]):
+            by_order.setdefault(sub_record["order_id"], []).append(sub_record)
+    return by_order
+
+
+class OrderRepository:
+    """
+    Storage backend behind OrderManager.
+
+    Changes arrive as commit records, the same shape the json journal uses:
+        {"op": "add", "order_id": ..., "order": {...}}
+        {"op": "status", "order_id": ..., "status": ...}
+        {"op": "paid", "order_id": ...}
+        {"op": "remove", "order_id": ...}
+    """
+
+    supports_query = False  # True when query_ids() can evaluate filters natively
+    partitioned = False     # True when orders can be loaded one month at a time
+
+    def load(self) -> dict:
+        """Return every stored order as {order_id: order_dict}."""
+        raise NotImplementedError
+
+    def list_months(self) -> list:
+        """Months ("YYYY-MM") that hold at least one stored order (partitioned backends)."""
+        raise NotImplementedError
+
+    def load_month(self, month: str) -> dict:
+        """Return the orders of one month as {order_id: order_dict} (partitioned backends)."""
+        raise NotImplementedError
+
+    def iter_load(self):
+        """Yield (order_id, order_dict) pairs for what load() returns, one order at a time."""
+        return iter(self.load().items())
+
+    def iter_load_month(self, month: str):
+        """Yield (order_id, order_dict) pairs for what load_month() returns, one order at a time."""
+        return iter(self.load_month(month).items())
+
+    def load_order(self, order_id: str):
+        """Return one stored order_dict, or None. Backends with a keyed lookup override this to skip the scan."""
+        orders = self.iter_load_month(order_month(order_id)) if self.partitioned else self.iter_load()
+        return next((order for stored_id, order in orders if stored_id == order_id), None)
+
+    def apply(self, records: list):
+        """Persist one unit of work atomically."""
+        raise NotImplementedError
+
+    def needs_checkpoint(self) -> bool:
+        return False
+
+    def checkpoint(self, orders: dict):
+        """Compact storage; orders is the manager's {order_id: Order} state."""
+
+    def query_ids(self, where: str, params: list) -> list:
+        raise NotImplementedError
+
+    def explain_query(self, where: str, params: list) -> list:
+        """Lines describing how query_ids would run (backends with supports_query only)."""
+        return []
+
+    def load_sequences(self) -> dict:
+        """Persisted per-month order number high-water marks, {"YYYY-MM": int}."""
+        return {}
+
+    def save_sequences(self, sequences: dict):
+        pass
+
+    def load_rollups(self) -> dict:
+        """Persisted daily rollups, {"YYYY-MM-DD": day_row} (see orders.rollups)."""
+        return {}
+
+    def save_rollups(self, month: str, days: dict):
+        """Replace the stored rollup rows of one month with days."""
+
+    def close(self):
+        pass
+
+
+class MenuRepository:
+    """Storage backend behind MenuManager."""
+
+    def load(self) -> dict:
+        """Return {"categories": [...], "items": {item_id: item_dict}}."""
+        raise NotImplementedError
+
+    def save(self, menu_dict: dict, changed_ids=None, removed_ids=None):
+        """
+        Persist the menu. changed_ids / removed_ids name the items touched since
+        the last save so row-based backends can write only those; None means
+        everything may have changed.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
@@ -0,0 +1,318 @@
+# storage/json_store.py
+
+import os
+import re
+from storage.base import OrderRepository, MenuRepository, order_month, records_by_order, replay_records
+from storage.archive import ARCHIVE_ERRORS, ARCHIVE_EXTENSIONS, archive_extension, iter_archive_orders, read_archive_header, write_archive
+from storage.offset_index import OffsetIndex
+from utils.json_io import backup_path, load_menu_data, save_menu_data, iter_order_data, save_order_data, load_order_journal, append_order_journal, clear_order_journal, load_sequence_data, save_sequence_data, load_rollup_data, save_rollup_data
+from utils.display import print_warning
+
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+
+def _load_rollup_directory(directory):
+    # {"YYYY-MM-DD": day_row} from every YYYY-MM.json in directory
+    rollups = {}
+    if os.path.isdir(directory):
+        for file_name in sorted(os.listdir(directory)):
+            if MONTH_PATTERN.match(os.path.splitext(file_name)[0]):
+                rollups.update(load_rollup_data(os.path.join(directory, file_name)))
+    return rollups
+
+
+def _save_rollup_month(directory, month, days):
+    # only the month's own file is rewritten, whatever the size of the history
+    os.makedirs(directory, exist_ok=True)
+    save_rollup_data(os.path.join(directory, f"{month}.json"), days)
+
+
+class JsonOrderRepository(OrderRepository):
+    # orders.json snapshot + append-only orders.journal with the records committed since
+    def __init__(self, file_path="data/orders.json", journal=True, checkpoint_every=500, progress=None, archive_path=None):
+        self.file_path = file_path
+        self.archive_path = archive_path  # compressed snapshot of an archived month, used while no file_path exists
+        self.progress = progress  # progress(file_path, bytes_read, total_bytes) while the snapshot streams in
+        self.journal = journal
+        self.journal_path = os.path.splitext(file_path)[0] + ".journal"
+        self.sequence_path = os.path.splitext(file_path)[0] + ".sequences.json"
+        self.rollup_directory = os.path.splitext(file_path)[0] + ".rollups"  # one YYYY-MM.json of daily rows per month
+        self.checkpoint_every = checkpoint_every
+        self.journal_length = 0
+        self.offsets = OffsetIndex(file_path)  # order_id -> bytes of the snapshot, for load_order
+
+
+    def load(self):
+        return dict(self.iter_load())
+
+
+    def iter_load(self):
+        # the snapshot is streamed one order at a time; the journal tail (small, it is
+        # checkpointed every checkpoint_every records) is grouped by order and replayed
+        # onto each order as it passes, then the orders it added are yielded last
+        records = load_order_journal(self.journal_path) if self.journal else []
+        self.journal_length = len(records)
+        journal = records_by_order(records)
+
+        for order_id, order in self._iter_snapshot():
+            if order_id in journal:
+                order = replay_records(order_id, order, journal.pop(order_id))
+            if order is not None:
+                yield order_id, order
+
+        for order_id, order_records in journal.items():
+            order = replay_records(order_id, None, order_records)
+            if order is not None:
+                yield order_id, order
+
+
+    def _reads_archive(self):
+        # an archived month that has not been edited (and checkpointed) since
+        return self.archive_path is not None and not os.path.exists(self.file_path)
+
+
+    def _iter_snapshot(self):
+        if self._reads_archive():
+            return iter_archive_orders(self.archive_path)
+        return iter_order_data(self.file_path, self.progress)
+
+
+    def load_order(self, order_id):
+        # decode only this order's entry of the snapshot, then replay its journal records
+        if self._reads_archive():  # compressed, so there are no offsets to seek to: stream the month
+            return super().load_order(order_id)
+        try:
+            order = self.offsets.get(order_id)
+        except (ValueError, UnicodeDecodeError):  # snapshot unreadable or not indexable: stream it instead
+            return super().load_order(order_id)
+
+        records = records_by_order(load_order_journal(self.journal_path)).get(order_id, ()) if self.journal else ()
+        return replay_records(order_id, order, records)
+
+
+    def apply(self, records):
+        if not records or not self.journal:
+            return
+
+        # a multi-record commit is written as one line so a torn write drops all of it
+        record = records[0] if len(records) == 1 else {"op": "batch", "records": records}
+        append_order_journal(self.journal_path, [record])
+        self.journal_length += 1
+
+
+    def needs_checkpoint(self):
+        # without a journal every commit has to rewrite the snapshot
+        return not self.journal or self.journal_length >= self.checkpoint_every
+
+
+    def checkpoint(self, orders):
+        # snapshot first, then drop the journal; replaying records over a newer snapshot is harmless
+        save_order_data(self.file_path, { order_id : order.to_dict() for order_id, order in orders.items() })
+        if self.journal:
+            clear_order_journal(self.journal_path)
+        self.journal_length = 0
+
+
+    def load_sequences(self):
+        return load_sequence_data(self.sequence_path)
+
+
+    def save_sequences(self, sequences):
+        save_sequence_data(self.sequence_path, sequences)
+
+
+    def load_rollups(self):
+        return _load_rollup_directory(self.rollup_directory)
+
+
+    def save_rollups(self, month, days):
+        _save_rollup_month(self.rollup_directory, month, days)
+
+
+    def compact(self):
+        # checkpoint from disk alone, for partitions that are not held in memory
+        orders = self.load()
+        save_order_data(self.file_path, orders)
+        if self.journal:
+            clear_order_journal(self.journal_path)
+        self.journal_length = 0
+
+
+    def close(self):
+        self.offsets.close()
+
+
+class PartitionedJsonOrderRepository(OrderRepository):
+    # one snapshot + journal pair per month: orders/YYYY-MM.json, orders/YYYY-MM.journal
+    partitioned = True
+
+    def __init__(self, directory="data/orders", legacy_file=None, checkpoint_every=500, progress=None):
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.progress = progress
+        self.partitions = {}  # {month: JsonOrderRepository}
+        self.sequence_path = os.path.join(directory, "sequences.json")
+        self.rollup_directory = os.path.join(directory, "rollups")  # one YYYY-MM.json of daily rows per month
+        self.archive_directory = os.path.join(directory, "archive")  # closed months, see storage.archive
+        os.makedirs(directory, exist_ok=True)
+
+        if legacy_file and os.path.exists(legacy_file) and not self.list_months():
+            self._split_legacy_file(legacy_file)
+
+
+    def _partition(self, month):
+        if month not in self.partitions:
+            file_path = os.path.join(self.directory, f"{month}.json")
+            self.partitions[month] = JsonOrderRepository(
+                file_path, checkpoint_every=self.checkpoint_every, progress=self.progress,
+                archive_path=self.list_archives().get(month)
+            )
+        return self.partitions[month]
+
+
+    def _split_legacy_file(self, legacy_file):
+        # one-time upgrade from a single orders.json (+ journal) to monthly files
+        legacy = JsonOrderRepository(legacy_file)
+        by_month = {}
+        for order_id, order in legacy.load().items():
+            by_month.setdefault(order_month(order_id), {})[order_id] = order
+
+        for month, orders in by_month.items():
+            save_order_data(self._partition(month).file_path, orders)
+
+        for path in (legacy.file_path, legacy.journal_path):
+            if os.path.exists(path):
+                os.replace(path, path + ".migrated")
+
+
+    def list_months(self):
+        return sorted(set(self.list_live_months()) | set(self.list_archives()))
+
+
+    def list_live_months(self):
+        # months with a snapshot or journal file, i.e. not archived or edited since being archived
+        months = set()
+        for file_name in os.listdir(self.directory):
+            month, ext = os.path.splitext(file_name)
+            if ext in (".json", ".journal") and MONTH_PATTERN.match(month):
+                months.add(month)
+        return sorted(months)
+
+
+    def list_archives(self):
+        # {month: archive path}
+        archives = {}
+        if os.path.isdir(self.archive_directory):
+            for file_name in sorted(os.listdir(self.archive_directory)):
+                month, dot, ext = file_name.partition(".")
+                if MONTH_PATTERN.match(month) and dot + ext in ARCHIVE_EXTENSIONS:
+                    archives[month] = os.path.join(self.archive_directory, file_name)
+        return archives
+
+
+    def archive_month(self, month, orders, days, compression="gzip"):
+        """
+        Replace the live files of month with one compressed archive holding orders (the whole
+        month, {order_id: order_dict}) and days, its rollup rows. The archive is read through
+        from then on; an edit to the month starts a live journal beside it again.
+        """
+        os.makedirs(self.archive_directory, exist_ok=True)
+        previous = self.list_archives().get(month)
+        archive_path = os.path.join(self.archive_directory, month + archive_extension(compression))
+        write_archive(archive_path, month, orders, days, compression)
+
+        partition = self.partitions.pop(month, None)
+        if partition is not None:
+            partition.close()
+        file_path = os.path.join(self.directory, f"{month}.json")
+        replaced = [file_path, backup_path(file_path), file_path + ".idx", os.path.join(self.directory, f"{month}.journal"),
+                    os.path.join(self.rollup_directory, f"{month}.json")]
+        if previous and previous != archive_path:  # re-archived with the other compression
+            replaced.append(previous)
+        for path in replaced:
+            if os.path.exists(path):
+                os.remove(path)
+        return archive_path
+
+
+    def load(self):
+        orders = {}
+        for month in self.list_months():
+            orders.update(self.load_month(month))
+        return orders
+
+
+    def load_month(self, month):
+        return self._partition(month).load()
+
+
+    def iter_load_month(self, month):
+        return self._partition(month).iter_load()
+
+
+    def load_order(self, order_id):
+        month = order_month(order_id)
+        return self._partition(month).load_order(order_id) if MONTH_PATTERN.match(month) else None
+
+
+    def apply(self, records):
+        # route each record to its month; a unit of work normally touches a single order
+        by_month = {}
+        for record in records:
+            for sub_record in (record["records"] if record.get("op") == "batch" else [record]):
+                by_month.setdefault(order_month(sub_record["order_id"]), []).append(sub_record)
+
+        for month, month_records in by_month.items():
+            self._partition(month).apply(month_records)
+
+
+    def needs_checkpoint(self):
+        return any(partition.needs_checkpoint() for partition in self.partitions.values())
+
+
+    def load_sequences(self):
+        return load_sequence_data(self.sequence_path)
+
+
+    def save_sequences(self, sequences):
+        save_sequence_data(self.sequence_path, sequences)
+
+
+    def load_rollups(self):
+        # archive headers first; a month edited after archiving has a newer rollup file
+        rollups = {}
+        for month, archive_path in self.list_archives().items():
+            try:
+                rollups.update(read_archive_header(archive_path)["days"])
+            except ARCHIVE_ERRORS + (KeyError,):
+                print_warning(f"Order archive '{archive_path}' has an unreadable header; its daily totals are missing.")
+        rollups.update(_load_rollup_directory(self.rollup_directory))
+        return rollups
+
+
+    def save_rollups(self, month, days):
+        _save_rollup_month(self.rollup_directory, month, days)
+
+
+    def checkpoint(self, orders):
+        for partition in self.partitions.values():
+            if partition.needs_checkpoint():
+                partition.compact()
+
+
+    def close(self):
+        for partition in self.partitions.values():
+            partition.close()
+
+
+class JsonMenuRepository(MenuRepository):
+    def __init__(self, file_path="data/menu.json"):
+        self.file_path = file_path
+
+
+    def load(self):
+        return load_menu_data(self.file_path)
+
+
+    def save(self, menu_dict, changed_ids=None, removed_ids=None):
+        save_menu_data(self.file_path, menu_dict)
@@ -0,0 +1,48 @@
+# storage/migrate.py
+#
+# Move the json data files into the sqlite database:
+#     python -m storage.migrate [--orders-dir data/orders] [--menu data/menu.json] [--db data/brewops.db]
+# then start the app with BREWOPS_STORAGE=sqlite.
+
+import argparse
+from shared import settings
+from storage.json_store import PartitionedJsonOrderRepository, JsonMenuRepository
+from storage.sqlite_store import SqliteOrderRepository, SqliteMenuRepository
+from utils.display import print_success, print_warning
+
+
+def migrate_json_to_sqlite(orders_dir=settings.ORDERS_DIR, menu_file=settings.MENU_FILE, db_path=settings.SQLITE_FILE, legacy_file=settings.ORDERS_FILE):
+    # journal tails are replayed by load(), so un-checkpointed orders migrate too
+    orders = PartitionedJsonOrderRepository(orders_dir, legacy_file=legacy_file).load()
+    menu = JsonMenuRepository(menu_file).load()
+
+    order_repository = SqliteOrderRepository(db_path)
+    menu_repository = SqliteMenuRepository(db_path)
+    try:
+        order_repository.import_orders(orders)
+        if menu:
+            menu_repository.save(menu)
+        else:
+            print_warning(f"No menu found at '{menu_file}', skipped.")
+    finally:
+        order_repository.close()
+        menu_repository.close()
+
+    return len(orders), len(menu.get("items", {}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate BrewOps json data into sqlite.")
+    parser.add_argument("--orders-dir", default=settings.ORDERS_DIR)
+    parser.add_argument("--legacy-orders", default=settings.ORDERS_FILE, help="single-file orders.json split into --orders-dir if that is empty")
+    parser.add_argument("--menu", default=settings.MENU_FILE)
+    parser.add_argument("--db", default=settings.SQLITE_FILE)
+    args = parser.parse_args(argv)
+
+    order_count, item_count = migrate_json_to_sqlite(args.orders_dir, args.menu, args.db, args.legacy_orders)
+    print_success(f"Migrated {order_count} orders and {item_count} menu items into '{args.db}'.")
+    print_success("Set BREWOPS_STORAGE=sqlite to use it.")
+
+
+if __name__ == "__main__":
+    main()
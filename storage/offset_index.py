@@ -0,0 +1,135 @@
+# storage/offset_index.py
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from utils.json_io import atomic_write, iter_json_spans
+
+# <file>.idx layout: a header stamping the data file it describes, then an open-addressing
+# hash table of fixed-size slots (linear probing, at most half full, an all-zero key is empty)
+HEADER = struct.Struct("<8sQqQQQ")  # magic, data size, data mtime_ns, data inode, slot count, entry count
+KEY_BYTES = 32
+SLOT = struct.Struct(f"<{KEY_BYTES}sQI")  # key (utf-8, zero padded), byte offset, byte length
+MAGIC = b"BWIDX\x00\x00\x01"
+
+
+def _slot_count(entries):
+    slots = 8
+    while slots < 2 * entries:
+        slots *= 2
+    return slots
+
+
+def _describes(table, stamp):
+    # a complete table built from the data file with this stamp
+    if len(table) < HEADER.size:
+        return False
+    magic, size, mtime_ns, inode, slots, _ = HEADER.unpack_from(table)
+    return (magic, size, mtime_ns, inode) == (MAGIC, *stamp) and len(table) == HEADER.size + slots * SLOT.size
+
+
+def _home(key, slots):
+    return zlib.crc32(key) & (slots - 1)
+
+
+class OffsetIndex:
+    """
+    Maps each key of a JSON object file (order_id in an orders snapshot) to the byte
+    offset and length of its value, so get() can decode one entry without parsing the
+    rest of the file.
+
+    The table lives in <file>.idx and is read through mmap. Its header records the data
+    file's size, mtime and inode; when any of them changes (a checkpoint rewrote the
+    snapshot) the table is rebuilt on the next get(), with one streaming pass over the file.
+    """
+
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.path = data_path + ".idx"
+        self._table = None   # mmap of the index file, or the built bytes when it could not be written
+        self._stamp = None   # (size, mtime_ns, inode) of the data file the table describes
+
+
+    def get(self, key):
+        # the decoded value stored under key, None when the file or the key is missing
+        try:
+            file = open(self.data_path, "rb")
+        except FileNotFoundError:
+            return None
+
+        with file:
+            # stamp the open file itself, so a snapshot replaced meanwhile cannot be read with a stale table
+            stat = os.fstat(file.fileno())
+            span = self._find(key, (stat.st_size, stat.st_mtime_ns, stat.st_ino))
+            if span is None:
+                return None
+            file.seek(span[0])
+            return json.loads(file.read(span[1]).decode("utf-8"))
+
+
+    def _find(self, key, stamp):
+        if self._stamp != stamp:
+            self._open(stamp)
+
+        key = key.encode("utf-8")
+        if len(key) > KEY_BYTES:
+            return None
+        slots = HEADER.unpack_from(self._table)[4]
+        slot = _home(key, slots)
+        while True:
+            stored, offset, length = SLOT.unpack_from(self._table, HEADER.size + slot * SLOT.size)
+            if stored.rstrip(b"\0") == key:
+                return offset, length
+            if not stored.strip(b"\0"):
+                return None
+            slot = (slot + 1) & (slots - 1)
+
+
+    def _open(self, stamp):
+        # map the index file if it describes this version of the data file, else rebuild it
+        self.close()
+        try:
+            with open(self.path, "rb") as file:
+                table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # missing, or empty
+            table = None
+
+        if table is not None:
+            if _describes(table, stamp):
+                self._table, self._stamp = table, stamp
+                return
+            table.close()
+
+        table = self._build(stamp)
+        try:
+            atomic_write(self.path, table)
+            with open(self.path, "rb") as file:
+                self._table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:  # read-only data directory: use the table from memory this run
+            self._table = table
+        self._stamp = stamp
+
+
+    def _build(self, stamp):
+        spans = list(iter_json_spans(self.data_path))
+        slots = _slot_count(len(spans))
+        table = bytearray(HEADER.size + slots * SLOT.size)
+        HEADER.pack_into(table, 0, MAGIC, *stamp, slots, len(spans))
+
+        for key, offset, length in spans:
+            key = key.encode("utf-8")
+            if len(key) > KEY_BYTES:
+                raise ValueError(f"Key '{key.decode()}' is too long for the offset index")
+            slot = _home(key, slots)
+            while SLOT.unpack_from(table, HEADER.size + slot * SLOT.size)[0].strip(b"\0"):
+                slot = (slot + 1) & (slots - 1)
+            SLOT.pack_into(table, HEADER.size + slot * SLOT.size, key, offset, length)
+        return bytes(table)
+
+
+    def close(self):
+        if isinstance(self._table, mmap.mmap):
+            self._table.close()
+        self._table = self._stamp = None
@@ -0,0 +1,286 @@
+# storage/sqlite_store.py
+
+import json
+import os
+import sqlite3
+from storage.base import OrderRepository, MenuRepository
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_id     TEXT PRIMARY KEY,
+    timestamp    TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    paid         INTEGER NOT NULL DEFAULT 0,
+    total_amount REAL NOT NULL DEFAULT 0,
+    name         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_orders_timestamp ON orders (timestamp);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status);
+CREATE INDEX IF NOT EXISTS idx_orders_paid ON orders (paid);
+CREATE INDEX IF NOT EXISTS idx_orders_name ON orders (name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS order_items (
+    order_id TEXT NOT NULL REFERENCES orders (order_id) ON DELETE CASCADE,
+    line_no  INTEGER NOT NULL,
+    item_id  TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    qty      INTEGER NOT NULL,
+    price    REAL NOT NULL,
+    PRIMARY KEY (order_id, line_no)
+);
+CREATE INDEX IF NOT EXISTS idx_order_items_item_id ON order_items (item_id);
+
+CREATE TABLE IF NOT EXISTS order_sequences (
+    month       TEXT PRIMARY KEY,
+    last_number INTEGER NOT NULL
+);
+
+-- one row per day; data holds the day totals and its (day, item_id) rows, see orders.rollups
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day  TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS menu_categories (
+    position INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS menu_items (
+    item_id     TEXT PRIMARY KEY,
+    category    TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    price       REAL NOT NULL,
+    available   INTEGER NOT NULL DEFAULT 1,
+    is_special  INTEGER NOT NULL DEFAULT 0,
+    order_count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def connect(db_path):
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # shared with the write-behind flusher thread; the managers' locks keep writes serialized
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+#---------- Orders ----------#
+
+class SqliteOrderRepository(OrderRepository):
+    supports_query = True
+    partitioned = True  # months load lazily through the timestamp index
+
+    def __init__(self, db_path="data/brewops.db"):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+
+
+    def load(self):
+        return self._load_where("1 = 1", [])
+
+
+    def list_months(self):
+        rows = self.conn.execute("SELECT DISTINCT substr(timestamp, 1, 7) FROM orders ORDER BY 1")
+        return [month for (month,) in rows]
+
+
+    def load_month(self, month):
+        return self._load_where("timestamp >= ? AND timestamp < ?", [month, month + "~"])
+
+
+    def load_order(self, order_id):
+        return self._load_where("order_id = ?", [order_id]).get(order_id)
+
+
+    def _load_where(self, where, params):
+        orders = {}
+        rows = self.conn.execute(
+            f"SELECT order_id, timestamp, status, paid, total_amount, name FROM orders WHERE {where} ORDER BY timestamp, order_id",
+            params
+        )
+        for order_id, timestamp, status, paid, total_amount, name in rows:
+            orders[order_id] = {
+                "order_id": order_id,
+                "items": [],
+                "status": status,
+                "total_amount": total_amount,
+                "timestamp": timestamp,
+                "name": name,
+                "paid": bool(paid)
+            }
+
+        rows = self.conn.execute(
+            f"SELECT order_id, item_id, name, qty, price FROM order_items WHERE order_id IN "
+            f"(SELECT order_id FROM orders WHERE {where}) ORDER BY order_id, line_no",
+            params
+        )
+        for order_id, item_id, name, qty, price in rows:
+            if order_id in orders:
+                orders[order_id]["items"].append({"item_id": item_id, "name": name, "qty": qty, "price": price})
+
+        return orders
+
+
+    def apply(self, records):
+        with self.conn:  # one sqlite transaction per unit of work
+            for record in records:
+                self._apply_record(record)
+
+
+    def _apply_record(self, record):
+        op = record.get("op")
+        order_id = record.get("order_id")
+
+        if op == "batch":
+            for sub_record in record.get("records", []):
+                self._apply_record(sub_record)
+        elif op == "add":
+            self._insert_orders([record["order"]])
+        elif op == "status":
+            self.conn.execute("UPDATE orders SET status = ? WHERE order_id = ?", (record["status"], order_id))
+        elif op == "paid":
+            self.conn.execute("UPDATE orders SET paid = 1 WHERE order_id = ?", (order_id,))
+        elif op == "remove":
+            self.conn.execute("DELETE FROM orders WHERE order_id = ?", (order_id,))
+
+
+    def _insert_orders(self, order_dicts):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO orders (order_id, timestamp, status, paid, total_amount, name) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (order["order_id"], order["timestamp"], order["status"], int(order["paid"]), order["total_amount"], order.get("name"))
+                for order in order_dicts
+            ]
+        )
+        self.conn.executemany(
+            "DELETE FROM order_items WHERE order_id = ?", [(order["order_id"],) for order in order_dicts]
+        )
+        self.conn.executemany(
+            "INSERT INTO order_items (order_id, line_no, item_id, name, qty, price) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (order["order_id"], line_no, item["item_id"], item["name"], item["qty"], item["price"])
+                for order in order_dicts
+                for line_no, item in enumerate(order["items"])
+            ]
+        )
+
+
+    def import_orders(self, orders: dict):
+        # bulk load used by the json -> sqlite migration
+        with self.conn:
+            self._insert_orders(list(orders.values()))
+
+
+    def checkpoint(self, orders):
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+    def query_ids(self, where, params):
+        rows = self.conn.execute(f"SELECT order_id FROM orders WHERE {where} ORDER BY timestamp, order_id", params)
+        return [order_id for (order_id,) in rows]
+
+
+    def explain_query(self, where, params):
+        # sqlite's own plan for query_ids, one line per step
+        rows = self.conn.execute(f"EXPLAIN QUERY PLAN SELECT order_id FROM orders WHERE {where} ORDER BY timestamp, order_id", params)
+        return [detail for (_, _, _, detail) in rows]
+
+
+    def load_sequences(self):
+        return dict(self.conn.execute("SELECT month, last_number FROM order_sequences"))
+
+
+    def save_sequences(self, sequences):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO order_sequences (month, last_number) VALUES (?, ?)",
+                list(sequences.items())
+            )
+
+
+    def load_rollups(self):
+        return { day: json.loads(data) for day, data in self.conn.execute("SELECT day, data FROM daily_rollups") }
+
+
+    def save_rollups(self, month, days):
+        with self.conn:
+            self.conn.execute("DELETE FROM daily_rollups WHERE day >= ? AND day < ?", (month, month + "~"))
+            self.conn.executemany(
+                "INSERT INTO daily_rollups (day, data) VALUES (?, ?)",
+                [(day, json.dumps(row)) for day, row in days.items()]
+            )
+
+
+    def close(self):
+        self.conn.close()
+
+
+#---------- Menu ----------#
+
+class SqliteMenuRepository(MenuRepository):
+    def __init__(self, db_path="data/brewops.db"):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+
+
+    def load(self):
+        categories = [name for (name,) in self.conn.execute("SELECT name FROM menu_categories ORDER BY position")]
+        items = {}
+        rows = self.conn.execute(
+            "SELECT item_id, category, name, price, available, is_special, order_count FROM menu_items ORDER BY rowid"
+        )
+        for item_id, category, name, price, available, is_special, order_count in rows:
+            items[item_id] = {
+                "category": category,
+                "name": name,
+                "price": price,
+                "available": bool(available),
+                "is_special": bool(is_special),
+                "order_count": order_count
+            }
+
+        if not categories and not items:
+            return {}
+        return {"categories": categories, "items": items}
+
+
+    def save(self, menu_dict, changed_ids=None, removed_ids=None):
+        items = menu_dict.get("items", {})
+
+        with self.conn:
+            self.conn.execute("DELETE FROM menu_categories")
+            self.conn.executemany(
+                "INSERT INTO menu_categories (position, name) VALUES (?, ?)",
+                list(enumerate(menu_dict.get("categories", [])))
+            )
+
+            if changed_ids is None:
+                self.conn.execute("DELETE FROM menu_items")
+                changed_ids = items.keys()
+
+            for item_id in removed_ids or ():
+                self.conn.execute("DELETE FROM menu_items WHERE item_id = ?", (item_id,))
+
+            rows = []
+            for item_id in changed_ids:
+                item = items.get(item_id)
+                if item:
+                    rows.append((item_id, item["category"], item["name"], item["price"], int(item["available"]), int(item["is_special"]), item["order_count"]))
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO menu_items (item_id, category, name, price, available, is_special, order_count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,96 @@
+# storage/write_behind.py
+
+import threading
+from functools import wraps
+
+# when manager changes reach the repository
+DURABILITY_MODES = (
+    "immediate",  # every change is written before the call returns
+    "grouped",    # changes are buffered and a background thread writes them in batches
+    "on-exit",    # changes are buffered until flush(): logout, exit or an explicit call
+)
+
+
+def check_durability(durability):
+    if durability not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability '{durability}', expected one of {', '.join(DURABILITY_MODES)}")
+    return durability
+
+
+def synchronized(method):
+    # run the method holding self._lock, so a flush never sees a half-applied change
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class WriteBehind:
+    """
+    Flushes registered managers (anything with flush()) off the calling thread.
+
+    Managers call notify() for every buffered change. In "grouped" mode a daemon thread
+    flushes as soon as batch_size changes are waiting, and otherwise every interval
+    seconds while any are. flush() writes everything now and stop() ends the thread
+    after a last flush; with "on-exit" no thread runs and only those two write.
+    """
+
+    def __init__(self, durability="grouped", interval=2.0, batch_size=50):
+        self.durability = check_durability(durability)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.managers = []
+        self.last_error = None   # the most recent failure of a background flush
+        self._waiting = 0        # changes buffered since the last flush
+        self._wake = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+
+    def register(self, manager):
+        self.managers.append(manager)
+        manager.flusher = self
+        if self.durability == "grouped" and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="brewops-write-behind", daemon=True)
+            self._thread.start()
+
+
+    def notify(self):
+        with self._wake:
+            self._waiting += 1
+            if self._waiting >= self.batch_size:
+                self._wake.notify()
+
+
+    def _run(self):
+        while True:
+            with self._wake:
+                self._wake.wait_for(lambda: self._stopped or self._waiting >= self.batch_size, timeout=self.interval)
+                if self._stopped:
+                    return
+                if not self._waiting:
+                    continue
+                self._waiting = 0
+
+            try:
+                self.flush()
+            except Exception as error:  # keep the thread alive: the changes stay buffered for the next flush
+                self.last_error = error
+
+
+    def flush(self):
+        with self._wake:
+            self._waiting = 0
+        for manager in self.managers:
+            manager.flush()
+
+
+    def stop(self):
+        with self._wake:
+            self._stopped = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
@@ -0,0 +1,43 @@
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+from utils.json_io import save_order_data
+
+ITEMS = [("I001", "Espresso", 120.0), ("I002", "Latte", 180.0), ("I003", "Croissant", 95.5), ("I004", "Iced Tea", 110.0)]
+STATUSES = ["placed", "in progress", "completed", "completed", "cancelled"]
+
+
+def make_orders(months, per_month):
+    """
+    {order_id: order_dict} with per_month orders in each "YYYY-MM" of months, spread over the
+    month's days and hours and cycling through statuses, paid flags, customers and items.
+    """
+    orders = {}
+    for month in months:
+        for number in range(1, per_month + 1):
+            order_id = f"ORD-{month}-{number:04d}"
+            lines = [
+                {"item_id": item_id, "name": name, "qty": 1 + (number + offset) % 3, "price": price}
+                for offset, (item_id, name, price) in enumerate(ITEMS[: 1 + number % len(ITEMS)])
+            ]
+            orders[order_id] = {
+                "order_id": order_id,
+                "items": lines,
+                "status": STATUSES[number % len(STATUSES)],
+                "total_amount": round(sum(line["qty"] * line["price"] for line in lines), 2),
+                "timestamp": f"{month}-{1 + (number * 7) % 28:02d}T{8 + number % 12:02d}:{number % 60:02d}:00",
+                "name": ["Asha", "Ravi", "Meera", None][number % 4],
+                "paid": number % 3 != 0,
+            }
+    return orders
+
+
+def write_partitions(directory, orders):
+    # orders as the monthly snapshots of a PartitionedJsonOrderRepository in directory
+    by_month = {}
+    for order_id, order in orders.items():
+        by_month.setdefault(order_id[4:11], {})[order_id] = order
+    os.makedirs(directory, exist_ok=True)
+    with redirect_stdout(StringIO()):
+        for month, month_orders in by_month.items():
+            save_order_data(os.path.join(directory, f"{month}.json"), month_orders)
@@ -0,0 +1,95 @@
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from contextlib import redirect_stdout
+from io import StringIO
+from orders.order import Order
+from orders.order_manager import OrderManager
+from storage.json_store import PartitionedJsonOrderRepository
+from tests.sample_orders import make_orders, write_partitions
+
+MONTHS = ["2025-05", "2025-06", "2025-07"]
+
+
+class OrderAggregationTest(unittest.TestCase):
+    # summaries for statuses that are not rolled up are aggregated from the matching orders
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.orders = make_orders(MONTHS, 25)
+        write_partitions(self.directory, self.orders)
+        with redirect_stdout(StringIO()):
+            self.manager = OrderManager(repository=PartitionedJsonOrderRepository(self.directory), max_loaded_orders=30)
+
+
+    def plain_totals(self, status, month=None):
+        orders = [Order.from_dict(data) for data in self.orders.values()]
+        orders = [order for order in orders if order.status == status and (month is None or order.month == month)]
+        item_qty = Counter()
+        for order in orders:
+            for item in order.items:
+                item_qty[item.item_id] += item.qty
+        return len(orders), sum(order.total_amount for order in orders), dict(item_qty), Counter(order.hour for order in orders)
+
+
+    def test_status_without_rollups(self):
+        for month in (None, "2025-06"):
+            with self.subTest(month=month), redirect_stdout(StringIO()):
+                aggregate = self.manager.summarize(month=month, status="cancelled")
+                self.assertEqual(
+                    (aggregate["order_count"], aggregate["revenue"], dict(aggregate["item_qty"]), aggregate["hourly"]),
+                    self.plain_totals("cancelled", month)
+                )
+
+
+    def test_rolled_up_status_agrees_with_orders(self):
+        with redirect_stdout(StringIO()):
+            from_rollups = self.manager.summarize(month="2025-07", status="completed")
+            from_orders = self.manager.aggregate(month="2025-07", status="completed")
+        for field in ("order_count", "revenue", "item_qty", "item_revenue", "item_names", "hourly"):
+            self.assertEqual(from_rollups[field], from_orders[field], field)
+
+
+
+    def test_hour_buckets_add_up_to_day_buckets(self):
+        for status in (None, "completed"):
+            with self.subTest(status=status), redirect_stdout(StringIO()):
+                hours = self.manager.aggregate_window("2025-05-25", "2025-06-10", bucket="hour", status=status)
+                days = self.manager.aggregate_window("2025-05-25", "2025-06-10", bucket="day", status=status)
+            self.assertEqual(len(hours), 24 * len(days))
+            for number, day in enumerate(days):
+                day_hours = hours[24 * number: 24 * (number + 1)]
+                self.assertEqual(day_hours[0]["start"], f"{day['start']} 00:00")
+                self.assertEqual(sum(bucket["order_count"] for bucket in day_hours), day["order_count"])
+                self.assertEqual(sum(bucket["revenue"] for bucket in day_hours), day["revenue"])
+            self.assertTrue(any(bucket["order_count"] for bucket in hours))
+
+
+    def test_day_and_week_windows_match_per_day_filters(self):
+        for status in (None, "completed"):
+            with self.subTest(status=status), redirect_stdout(StringIO()):
+                days = self.manager.aggregate_window("2025-05-25", "2025-06-16", bucket="day", status=status)
+                weeks = self.manager.aggregate_window("2025-05-25", "2025-06-16", bucket="week", status=status)
+                for day in days:
+                    matches = list(self.manager.filter_orders(date=day["start"], status=status).values())
+                    self.assertEqual((day["order_count"], day["revenue"]), (len(matches), sum(order.total_amount for order in matches)))
+
+            self.assertEqual(len(days), 23)
+            self.assertEqual([week["start"] for week in weeks], ["2025-05-25", "2025-06-01", "2025-06-08", "2025-06-15"])  # the last one is 2 days
+            for number, week in enumerate(weeks):
+                self.assertEqual(week["order_count"], sum(day["order_count"] for day in days[7 * number: 7 * (number + 1)]))
+                self.assertEqual(week["revenue"], sum(day["revenue"] for day in days[7 * number: 7 * (number + 1)]))
+            self.assertTrue(any(day["order_count"] == 0 for day in days))  # empty days are kept
+
+
+    def test_window_rejects_unknown_buckets(self):
+        with self.assertRaises(ValueError):
+            self.manager.aggregate_window("2025-06-01", "2025-06-07", bucket="month")
+        with self.assertRaises(ValueError):
+            self.manager.aggregate_window("2025-06-01", "2025-06-07", status="cancelled")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from io import StringIO
+from orders.order_manager import OrderManager
+from storage.archive import month_totals, read_archive_header
+from storage.archive_months import archive_closed_months
+from storage.json_store import PartitionedJsonOrderRepository
+from tests.sample_orders import make_orders, write_partitions
+
+MONTHS = ["2025-05", "2025-06", "2025-07"]
+TODAY = date(2025, 7, 20)  # keeps only July live with keep_months=1
+
+
+class MonthArchiveTest(unittest.TestCase):
+    # archived months read back as they were written, and a small month shrinks when archived
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.orders = make_orders(MONTHS, 12)
+
+
+    def use_directory(self, name):
+        self.directory = os.path.join(self.root, name)
+        write_partitions(self.directory, self.orders)
+
+
+    def repository(self):
+        return PartitionedJsonOrderRepository(self.directory)
+
+
+    def archive(self, compression):
+        with redirect_stdout(StringIO()):
+            manager = OrderManager(repository=self.repository())  # builds and stores the rollups
+            rollups = manager.rollups.days
+            manager.repository.close()
+            sizes = { month: os.path.getsize(os.path.join(self.directory, f"{month}.json")) for month in MONTHS }
+            archived = archive_closed_months(self.directory, keep_months=1, compression=compression, today=TODAY)
+        return rollups, sizes, archived
+
+
+    def test_round_trip(self):
+        for compression in ("gzip", "lzma"):
+            with self.subTest(compression=compression):
+                self.use_directory(compression)
+                rollups, sizes, archived = self.archive(compression)
+                self.assertEqual([month for month, *_ in archived], ["2025-05", "2025-06"])
+                self.assertEqual(sorted(self.repository().list_archives()), ["2025-05", "2025-06"])
+
+                with redirect_stdout(StringIO()):
+                    repository = self.repository()
+                    self.assertEqual(repository.load_rollups(), rollups)
+                    self.assertEqual(repository.load(), self.orders)
+                    manager = OrderManager(repository=self.repository())
+                    june = sorted(manager.filter_orders(month="2025-06"))
+                self.assertEqual(june, sorted(order_id for order_id in self.orders if order_id.startswith("ORD-2025-06")))
+
+                for month, _, _, after in archived:
+                    path = self.repository().list_archives()[month]
+                    header = read_archive_header(path)
+                    self.assertEqual(header["month"], month)
+                    days = { day: row for day, row in rollups.items() if day.startswith(month) }
+                    self.assertEqual(header["totals"], month_totals(days))
+                    self.assertLess(after, sizes[month])
+                    with open(path, "rb") as file:
+                        self.assertNotEqual(file.read(1), b"{")  # the header is compressed with the orders
+
+
+    def test_edit_after_archiving_shadows_the_archive(self):
+        self.use_directory("gzip")
+        self.archive("gzip")
+        with redirect_stdout(StringIO()):
+            manager = OrderManager(repository=self.repository())
+            manager.mark_paid("ORD-2025-06-0003")
+            manager.checkpoint()
+            reloaded = self.repository().load()
+        self.assertTrue(reloaded["ORD-2025-06-0003"]["paid"])
+        self.assertEqual(reloaded.keys(), self.orders.keys())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from analytics.cache import VersionedCache
+
+
+class VersionedCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = VersionedCache(maxsize=2)
+        self.version = 1
+        self.calls = []
+        self.square = self.cache.memoize(lambda: self.version)(self.compute)
+
+
+    def compute(self, value):
+        self.calls.append(value)
+        return value * value
+
+
+    def test_reuse_until_the_version_moves(self):
+        self.assertEqual([self.square(3), self.square(3)], [9, 9])
+        self.version = 2
+        self.assertEqual(self.square(3), 9)
+        self.assertEqual(self.calls, [3, 3])
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 2, "invalidations": 1, "size": 1, "maxsize": 2})
+
+
+    def test_least_recently_used_entry_goes_first(self):
+        self.square(1)
+        self.square(2)
+        self.square(1)  # 2 is now the least recently used
+        self.square(3)
+        self.square(1)
+        self.square(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+
+    def test_describe_reports_the_counters(self):
+        self.square(4)
+        self.square(4)
+        self.assertEqual(self.cache.describe(), "Analytics cache: 1 hits, 1 misses (0 stale) | 1 of 2 entries")
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
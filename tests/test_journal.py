@@ -0,0 +1,91 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from storage.json_store import JsonOrderRepository
+from utils.json_io import append_order_journal, load_order_journal
+
+SAMPLE_ORDERS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "orders", "2025-07.json")
+
+
+class JournalReplayTest(unittest.TestCase):
+    # the snapshot plus the journal records committed after it must load back as the live state
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file_path = os.path.join(self.directory, "orders.json")
+
+        with open(SAMPLE_ORDERS, "r", encoding="utf-8") as file:
+            orders = json.load(file)
+        self.orders = { order_id: orders[order_id] for order_id in sorted(orders)[:3] }
+
+
+    def repository(self):
+        return JsonOrderRepository(self.file_path, checkpoint_every=1000)
+
+
+    def add_record(self, order_id):
+        return {"op": "add", "order_id": order_id, "order": self.orders[order_id]}
+
+
+    def load(self):
+        with redirect_stdout(StringIO()):
+            return self.repository().load()
+
+
+    def test_records_replay_in_commit_order(self):
+        first, second, third = self.orders
+        repository = self.repository()
+        repository.apply([self.add_record(first)])
+        repository.apply([self.add_record(second), self.add_record(third)])  # one batch line
+        repository.apply([{"op": "status", "order_id": first, "status": "completed"}])
+        repository.apply([{"op": "paid", "order_id": second}])
+        repository.apply([{"op": "remove", "order_id": third}])
+
+        orders = self.load()
+        self.assertEqual(sorted(orders), [first, second])
+        self.assertEqual(orders[first]["status"], "completed")
+        self.assertTrue(orders[second]["paid"])
+        self.assertEqual(repository.journal_length, 5)
+
+
+    def test_checkpoint_folds_journal_into_snapshot(self):
+        first, second, _ = self.orders
+        repository = self.repository()
+        repository.apply([self.add_record(first)])
+        with redirect_stdout(StringIO()):
+            repository.compact()
+        repository.apply([self.add_record(second)])
+
+        self.assertEqual(sorted(self.load()), [first, second])
+        self.assertEqual(len(load_order_journal(repository.journal_path)), 1)
+
+
+    def test_append_after_torn_tail_keeps_new_records(self):
+        first, second, _ = self.orders
+        repository = self.repository()
+        repository.apply([self.add_record(first)])
+        with open(repository.journal_path, "a", encoding="utf-8") as file:
+            file.write('{"op": "add", "order_id": "ORD-2025-07-99')  # crash mid-append
+
+        repository.apply([self.add_record(second)])
+        repository.apply([{"op": "paid", "order_id": second}])
+
+        orders = self.load()
+        self.assertEqual(sorted(orders), [first, second])
+        self.assertTrue(orders[second]["paid"])
+
+
+    def test_append_to_empty_journal_adds_no_blank_line(self):
+        journal_path = os.path.join(self.directory, "orders.journal")
+        append_order_journal(journal_path, [{"op": "paid", "order_id": "ORD-2025-07-0001"}])
+        with open(journal_path, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), '{"op": "paid", "order_id": "ORD-2025-07-0001"}\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
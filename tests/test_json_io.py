@@ -0,0 +1,132 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from orders.order_manager import OrderManager
+from storage.json_store import JsonOrderRepository
+from utils.json_io import atomic_write, backup_path, iter_order_data, save_order_data
+
+SAMPLE_ORDERS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "orders", "2025-07.json")
+
+
+class TruncatedSnapshotTest(unittest.TestCase):
+    # a crash mid-write can cut the snapshot anywhere; loading must fall back to the .bak generation
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file_path = os.path.join(self.directory, "orders.json")
+
+        with open(SAMPLE_ORDERS, "r", encoding="utf-8") as file:
+            orders = json.load(file)
+        ids = sorted(orders)
+        self.previous = { order_id: orders[order_id] for order_id in ids[:10] }
+        self.current = { order_id: dict(orders[order_id]) for order_id in ids[1:14] }
+        self.current[ids[2]]["status"] = "cancelled"
+
+        with redirect_stdout(StringIO()):
+            save_order_data(self.file_path, self.previous)
+            save_order_data(self.file_path, self.current)  # self.previous becomes the .bak
+        with open(self.file_path, "rb") as file:
+            self.text = file.read()
+
+
+    def truncation_points(self):
+        points = set(range(0, len(self.text) - 1, 37))
+        start = 0
+        while (start := self.text.find(b'": ', start) + 1) > 0:
+            points.update((start + 1, start + 2))  # right after "key": and after "key":<space>
+        return sorted(points)
+
+
+    def truncate(self, size):
+        with open(self.file_path, "wb") as file:
+            file.write(self.text[:size])
+
+
+    def test_stream_falls_back_to_backup(self):
+        self.assertTrue(os.path.exists(backup_path(self.file_path)))
+        for size in self.truncation_points():
+            self.truncate(size)
+            with self.subTest(size=size), redirect_stdout(StringIO()):
+                self.assertEqual(dict(iter_order_data(self.file_path)), self.previous)
+
+
+    def test_repository_and_manager_load_backup(self):
+        for size in self.truncation_points():
+            self.truncate(size)
+            with self.subTest(size=size), redirect_stdout(StringIO()):
+                self.assertEqual(JsonOrderRepository(self.file_path).load(), self.previous)
+                order_id = next(iter(self.previous))
+                self.assertEqual(JsonOrderRepository(self.file_path).load_order(order_id), self.previous[order_id])
+                manager = OrderManager(self.file_path, repository=JsonOrderRepository(self.file_path))
+                self.assertEqual(sorted(manager.orders), sorted(self.previous))
+
+
+    def test_intact_snapshot_is_read_whole(self):
+        with redirect_stdout(StringIO()):
+            self.assertEqual(dict(iter_order_data(self.file_path)), self.current)
+
+
+
+    def test_snapshot_is_parsed_once(self):
+        calls = []
+        with redirect_stdout(StringIO()):
+            dict(iter_order_data(self.file_path, progress=lambda *call: calls.append(call)))
+        self.assertEqual(calls, [(self.file_path, len(self.text), len(self.text))])  # one chunk, read once
+
+
+
+class AtomicWriteTest(unittest.TestCase):
+    # a save replaces the file whole or not at all, keeping the previous generation when asked
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file_path = os.path.join(self.directory, "menu.json")
+
+
+    def read(self, path):
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+
+
+    def test_replaces_and_keeps_the_previous_generation(self):
+        atomic_write(self.file_path, "first")
+        self.assertFalse(os.path.exists(backup_path(self.file_path)))
+        atomic_write(self.file_path, "second", backup=True)
+        atomic_write(self.file_path, b"third", backup=True)
+
+        self.assertEqual(self.read(self.file_path), "third")
+        self.assertEqual(self.read(backup_path(self.file_path)), "second")
+        self.assertEqual(sorted(os.listdir(self.directory)), ["menu.json", "menu.json.bak"])  # no temp files left
+
+
+    def test_file_modes(self):
+        umask = os.umask(0o022)
+        os.umask(umask)
+        atomic_write(self.file_path, "new")
+        self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o666 & ~umask)
+
+        os.chmod(self.file_path, 0o600)
+        atomic_write(self.file_path, "kept private")
+        self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o600)
+
+
+    def test_failed_write_leaves_the_file_alone(self):
+        atomic_write(self.file_path, "intact")
+        with self.assertRaises(TypeError):
+            atomic_write(self.file_path, 42)  # neither str nor bytes: fails mid-write
+        self.assertEqual(self.read(self.file_path), "intact")
+        self.assertEqual(os.listdir(self.directory), ["menu.json"])
+
+        with redirect_stdout(StringIO()):
+            save_order_data(self.file_path, {"ORD-2025-07-0001": {"timestamp": object()}})  # reported, not raised
+        self.assertEqual(self.read(self.file_path), "intact")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+from shared.managers import LazyManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+
+class LazyManagerTest(unittest.TestCase):
+    # the stand-in builds its manager once, on the first attribute read or write
+
+    def setUp(self):
+        self.built = 0
+
+
+    def factory(self):
+        self.built += 1
+        return Counter()
+
+
+    def test_built_on_first_use_only(self):
+        manager = LazyManager(self.factory)
+        self.assertFalse(manager.loaded)
+        self.assertEqual(self.built, 0)
+
+        manager.value = 3
+        self.assertTrue(manager.loaded)
+        self.assertEqual((manager.value, manager.get().value), (3, 3))
+        self.assertIs(manager.get(), manager.get())
+        self.assertEqual(self.built, 1)
+
+
+    def test_importing_the_menus_builds_nothing(self):
+        # a fresh interpreter, so modules imported by other tests do not count
+        script = (
+            "import sys, main_menu\n"
+            "from shared import managers\n"
+            "heavy = ('orders.order_manager', 'menu.manager', 'auth.auth', 'bcrypt', 'storage.sqlite_store', 'cli.admin_cli')\n"
+            "print([name for name in heavy if name in sys.modules], managers.order_manager.loaded, managers.menu_manager.loaded)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[] False False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from orders.line_item import LineItem
+from orders.order import Order
+from orders.rollups import DailyRollups
+from utils.money import to_paise, to_rupees
+
+
+class PaiseTest(unittest.TestCase):
+    # money is integer paise inside the app and rupee floats only at the edges
+
+    def test_conversion(self):
+        self.assertEqual(to_paise(120), 12000)
+        self.assertEqual(to_paise(95.5), 9550)
+        self.assertEqual(to_paise(0.1 + 0.2), 30)     # float residue is rounded away
+        self.assertEqual(to_paise(19.99), 1999)       # 19.99 * 100 is 1998.9999999999998
+        self.assertEqual(to_paise("45.25"), 4525)
+        self.assertIsInstance(to_paise(12.5), int)
+        self.assertEqual(to_rupees(1999), 19.99)
+
+
+    def test_totals_add_up_exactly(self):
+        lines = [LineItem("I001", "Espresso", 3, to_paise(0.1)) for _ in range(10)]
+        order = Order(lines, status="completed", timestamp="2025-07-01T09:00:00", paid=True, order_id="ORD-2025-07-0001")
+        self.assertEqual(order.calculate_total(), 300)
+        self.assertEqual(order.to_dict()["total_amount"], 3.0)
+
+        rollups = DailyRollups()
+        for number in range(1, 11):
+            data = { **order.to_dict(), "order_id": f"ORD-2025-07-{number:04d}", "total_amount": 0.1 }
+            rollups.add(Order.from_dict(data))
+        self.assertEqual(rollups.days["2025-07-01"]["revenue_paise"], 100)  # ten 0.1 rupee orders, no drift
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from orders.order_manager import OrderManager
+from storage.json_store import PartitionedJsonOrderRepository
+from storage.offset_index import OffsetIndex
+from tests.sample_orders import make_orders, write_partitions
+from utils.json_io import save_order_data
+
+
+class OffsetIndexTest(unittest.TestCase):
+    # single entries decode through the .idx table exactly as a full load would give them
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file_path = os.path.join(self.directory, "2025-07.json")
+        self.orders = make_orders(["2025-07"], 40)
+        self.orders["ORD-2025-07-0005"]["name"] = "Zoë ☕"  # multi-byte characters before later offsets
+        with redirect_stdout(StringIO()):
+            save_order_data(self.file_path, self.orders)
+
+
+    def test_every_entry_decodes(self):
+        index = OffsetIndex(self.file_path)
+        for order_id, order in self.orders.items():
+            self.assertEqual(index.get(order_id), order)
+        self.assertIsNone(index.get("ORD-2025-07-0999"))
+        self.assertIsNone(index.get("ORD-" + "9" * 40))  # longer than a slot key
+        self.assertIsNone(OffsetIndex(os.path.join(self.directory, "2025-01.json")).get("ORD-2025-01-0001"))
+
+
+    def test_table_is_reused_until_the_snapshot_changes(self):
+        OffsetIndex(self.file_path).get("ORD-2025-07-0001")
+        index_path = self.file_path + ".idx"
+        os.utime(index_path, ns=(0, 0))
+        self.assertEqual(OffsetIndex(self.file_path).get("ORD-2025-07-0002"), self.orders["ORD-2025-07-0002"])
+        self.assertEqual(os.stat(index_path).st_mtime_ns, 0)  # mapped, not rebuilt
+
+        changed = { **self.orders, "ORD-2025-07-0041": { **self.orders["ORD-2025-07-0001"], "order_id": "ORD-2025-07-0041" } }
+        changed["ORD-2025-07-0002"] = { **self.orders["ORD-2025-07-0002"], "status": "cancelled" }
+        with redirect_stdout(StringIO()):
+            save_order_data(self.file_path, changed)
+        index = OffsetIndex(self.file_path)
+        self.assertEqual(index.get("ORD-2025-07-0002")["status"], "cancelled")
+        self.assertEqual(index.get("ORD-2025-07-0041"), changed["ORD-2025-07-0041"])
+        self.assertNotEqual(os.stat(index_path).st_mtime_ns, 0)
+
+
+    def test_manager_lookup_leaves_the_month_unloaded(self):
+        orders_dir = os.path.join(self.directory, "orders")
+        write_partitions(orders_dir, make_orders(["2025-05", "2025-06"], 10))
+        with redirect_stdout(StringIO()):
+            manager = OrderManager(repository=PartitionedJsonOrderRepository(orders_dir))
+            manager.ensure_months(["2025-06"])
+            manager.mark_paid("ORD-2025-06-0003")  # a journal record not yet checkpointed into the snapshot
+            manager.max_loaded_orders = 0
+            manager._evict()
+
+        loaded = set(manager.loaded_months)
+        with open(os.path.join(orders_dir, "2025-06.journal"), "r", encoding="utf-8") as file:
+            self.assertEqual(json.loads(file.readline())["op"], "paid")
+        self.assertTrue(manager.get_order("ORD-2025-06-0003").paid)
+        self.assertEqual(manager.get_order("ORD-2025-05-0004").order_id, "ORD-2025-05-0004")
+        self.assertFalse(manager.get_order("ORD-2025-05-0099"))
+        self.assertEqual(set(manager.loaded_months), loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime
+from menu.item import MenuItem
+from orders.line_item import LineItem
+from orders.order import Order
+from utils.filtering import filter_by_date, filter_by_date_range, filter_by_month
+from tests.sample_orders import make_orders
+
+
+class OrderTimestampTest(unittest.TestCase):
+    # the timestamp is parsed once into epoch, day and hour, and serializes back unchanged
+
+    def test_parsed_fields(self):
+        order = Order([], timestamp="2025-07-14T21:05:30.250000")
+        moment = datetime(2025, 7, 14, 21, 5, 30, 250000)
+        self.assertEqual(order.day, moment.toordinal())
+        self.assertEqual(order.hour, 21)
+        self.assertEqual(order.epoch, (moment - datetime(1970, 1, 1)).total_seconds())
+        self.assertEqual((order.date.isoformat(), order.month), ("2025-07-14", "2025-07"))
+
+
+    def test_round_trip(self):
+        for timestamp in ("2025-07-14T21:05:30.250000", "2025-07-01T00:00:00", "1999-12-31T23:59:59"):
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(Order([], timestamp=timestamp).timestamp, timestamp)
+        self.assertEqual(Order([], timestamp=datetime(2025, 7, 1, 8, 30)).timestamp, "2025-07-01T08:30:00")
+
+
+    def test_date_filters_compare_days(self):
+        orders = { order_id: Order.from_dict(data) for order_id, data in make_orders(["2025-06", "2025-07"], 20).items() }
+        by_day = lambda first, last: sorted(order_id for order_id, order in orders.items() if first <= order.timestamp[:10] <= last)
+
+        self.assertEqual(sorted(filter_by_date(orders, "2025-07-08")), by_day("2025-07-08", "2025-07-08"))
+        self.assertEqual(sorted(filter_by_date_range(orders, "2025-06-22", "2025-07-08")), by_day("2025-06-22", "2025-07-08"))
+        self.assertEqual(sorted(filter_by_month(orders, "2025-06")), by_day("2025-06-01", "2025-06-30"))
+
+
+
+class CompactOrderTest(unittest.TestCase):
+    # orders, lines and menu items carry no per-instance __dict__ and share repeated strings
+
+    def test_slotted(self):
+        order = Order.from_dict(make_orders(["2025-07"], 1)["ORD-2025-07-0001"])
+        menu_item = MenuItem("Drinks", "Latte", 18000, item_id="I002")
+        for instance in (order, order.items[0], menu_item):
+            with self.subTest(type=type(instance).__name__):
+                self.assertFalse(hasattr(instance, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    instance.note = "extra"
+
+
+    def test_lines_share_ids_and_names(self):
+        data = make_orders(["2025-07"], 1)["ORD-2025-07-0001"]
+        copy = lambda text: text[:1] + text[1:]  # an equal string that is a different object, as json.loads gives
+        lines = [{ **line, "item_id": copy(line["item_id"]), "name": copy(line["name"]) } for line in data["items"]]
+        first, second = Order.from_dict(data), Order.from_dict({ **data, "items": lines })
+        self.assertIsNot(lines[0]["name"], data["items"][0]["name"])
+        self.assertIsInstance(first.items[0], LineItem)
+        self.assertIs(first.items[0].item_id, second.items[0].item_id)
+        self.assertIs(first.items[0].name, second.items[0].name)
+
+
+    def test_dict_round_trip(self):
+        for data in make_orders(["2025-07"], 8).values():
+            with self.subTest(order_id=data["order_id"]):
+                self.assertEqual(Order.from_dict(data).to_dict(), data)
+        menu_data = {"category": "Drinks", "name": "Latte", "price": 180.0, "available": True, "is_special": False, "order_count": 4}
+        self.assertEqual(MenuItem.from_dict("I002", menu_data).to_dict(), menu_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
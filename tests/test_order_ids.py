@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from menu.manager import MenuManager
+from orders.order import Order
+from orders.order_manager import OrderManager
+from storage.json_store import PartitionedJsonOrderRepository
+from tests.sample_orders import make_orders, write_partitions
+
+MENU_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu.json")
+
+
+class OrderIdSequenceTest(unittest.TestCase):
+    # ids come from a per-month counter that survives restarts and never hands a number out twice
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.orders_dir = os.path.join(self.directory, "orders")
+        self.menu_path = os.path.join(self.directory, "menu.json")
+        shutil.copy(MENU_FILE, self.menu_path)
+        self.orders = make_orders(["2025-06", "2025-07"], 12)
+        write_partitions(self.orders_dir, self.orders)
+
+
+    def build(self):
+        with redirect_stdout(StringIO()):
+            return OrderManager(menu_manager=MenuManager(self.menu_path), repository=PartitionedJsonOrderRepository(self.orders_dir))
+
+
+    def add(self, manager, timestamp):
+        order_id = manager.generate_order_id(timestamp)
+        with redirect_stdout(StringIO()):
+            manager.add_order(Order.from_dict({ **self.orders["ORD-2025-07-0001"], "order_id": order_id, "timestamp": timestamp }))
+        return order_id
+
+
+    def test_next_id_follows_the_month(self):
+        manager = self.build()
+        self.assertEqual(manager.generate_order_id("2025-07-30T09:00:00"), "ORD-2025-07-0013")
+        self.assertEqual(manager.generate_order_id("2025-07-30T09:05:00"), "ORD-2025-07-0014")  # reserved even if never added
+        self.assertEqual(manager.generate_order_id("2025-06-30T09:00:00"), "ORD-2025-06-0013")
+        self.assertEqual(manager.generate_order_id("2025-08-01T09:00:00"), "ORD-2025-08-0001")
+
+
+    def test_removed_last_number_is_not_reused(self):
+        manager = self.build()
+        order_id = self.add(manager, "2025-07-30T09:00:00")
+        with redirect_stdout(StringIO()):
+            manager.remove_order(order_id)
+        self.assertEqual(self.build().generate_order_id("2025-07-30T10:00:00"), "ORD-2025-07-0014")
+
+
+    def test_malformed_sequences_are_rebuilt_from_orders(self):
+        manager = self.build()
+        self.add(manager, "2025-07-30T09:00:00")
+        with redirect_stdout(StringIO()):
+            manager.checkpoint()
+        with open(manager.repository.sequence_path, "w", encoding="utf-8") as file:
+            file.write('{"2025-07": "many"}')
+
+        manager = self.build()
+        self.assertEqual(manager.generate_order_id("2025-07-30T10:00:00"), "ORD-2025-07-0014")
+        self.assertEqual(manager.generate_order_id("2025-06-30T10:00:00"), "ORD-2025-06-0013")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from orders.order import Order
+from orders.order_index import OrderIndex
+from orders.order_manager import OrderManager
+from storage.json_store import PartitionedJsonOrderRepository
+from tests.sample_orders import make_orders, write_partitions
+
+MONTHS = ["2025-05", "2025-06", "2025-07"]
+
+
+def buckets(index):
+    # the value -> ids indexes as plain dicts, for comparing two indexes
+    return {
+        "month": dict(index.by_month), "status": dict(index.by_status),
+        "paid": { paid: ids for paid, ids in index.by_paid.items() if ids }, "customer": dict(index.by_customer),
+    }
+
+
+class SecondaryIndexTest(unittest.TestCase):
+    # the manager's indexes stay equal to indexes built from scratch over the loaded orders
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        write_partitions(self.directory, make_orders(MONTHS, 20))
+        with redirect_stdout(StringIO()):
+            self.manager = OrderManager(repository=PartitionedJsonOrderRepository(self.directory), max_loaded_orders=20)
+
+
+    def assert_in_step(self):
+        rebuilt = OrderIndex()
+        rebuilt.add_many(self.manager.orders.values())
+        self.assertEqual(buckets(self.manager.index), buckets(rebuilt))
+        self.assertEqual(self.manager.index.timeline, rebuilt.timeline)
+
+
+    def test_mutations_keep_indexes_in_step(self):
+        with redirect_stdout(StringIO()):
+            self.manager.ensure_months(["2025-06"])
+            self.manager.update_status("ORD-2025-06-0001", "cancelled")
+            self.manager.mark_paid("ORD-2025-06-0003")
+            self.manager.remove_order("ORD-2025-06-0002")
+        self.assert_in_step()
+        self.assertIn("ORD-2025-06-0001", self.manager.index.by_status["cancelled"])
+        self.assertIn("ORD-2025-06-0003", self.manager.index.by_paid[True])
+        self.assertNotIn("ORD-2025-06-0003", self.manager.index.by_paid[False])
+        self.assertNotIn("ORD-2025-06-0002", self.manager.index.by_month["2025-06"])
+
+
+    def test_eviction_drops_the_month(self):
+        with redirect_stdout(StringIO()):
+            self.manager.ensure_months(["2025-05"])
+            self.manager.ensure_months(["2025-06"])  # the cap holds one past month, so May goes
+        self.assertNotIn("2025-05", self.manager.index.by_month)
+        self.assertIn("2025-06", self.manager.index.by_month)
+        self.assert_in_step()
+
+
+    def test_empty_buckets_are_dropped(self):
+        with redirect_stdout(StringIO()):
+            self.manager.ensure_months(["2025-06"])
+            for order_id in [order_id for order_id in self.manager.index.by_status.get("cancelled", ()) if order_id.startswith("ORD-2025-06")]:
+                self.manager.update_status(order_id, "completed")
+        self.assertFalse(any(order_id.startswith("ORD-2025-06") for order_id in self.manager.index.by_status.get("cancelled", ())))
+        self.assert_in_step()
+
+
+
+class TimelineTest(unittest.TestCase):
+    # the sorted (epoch, order_id) timeline answers date criteria with two binary searches
+
+    def setUp(self):
+        self.orders = [Order.from_dict(data) for data in make_orders(MONTHS, 20).values()]
+        edges = [("ORD-2025-06-0101", "2025-06-10T00:00:00"), ("ORD-2025-06-0102", "2025-06-10T23:59:59"), ("ORD-2025-06-0103", "2025-06-11T00:00:00")]
+        for order_id, timestamp in edges:
+            self.orders.append(Order([], status="placed", timestamp=timestamp, order_id=order_id))
+        self.index = OrderIndex()
+        self.index.add_many(self.orders)
+
+
+    def expected(self, first, last):
+        picked = [order for order in self.orders if first <= order.date.isoformat() <= last]
+        return [order.order_id for order in sorted(picked, key=lambda order: (order.epoch, order.order_id))]
+
+
+    def within(self, **criteria):
+        bounds = self.index.date_bounds(**criteria)
+        self.assertEqual(self.index.count_within(bounds), len(self.index.ordered_ids(bounds)))
+        return self.index.ordered_ids(bounds)
+
+
+    def test_date_criteria(self):
+        self.assertEqual(self.within(date="2025-06-10"), self.expected("2025-06-10", "2025-06-10"))
+        self.assertEqual(self.within(from_date="2025-05-20", to_date="2025-06-10"), self.expected("2025-05-20", "2025-06-10"))
+        self.assertEqual(self.within(month="2025-06"), self.expected("2025-06-01", "2025-06-30"))
+        self.assertEqual(self.within(month="2025-13"), [])
+        self.assertEqual(self.within(from_date="2025-06-12", to_date="2025-06-01"), [])
+        self.assertIsNone(self.index.date_bounds())
+
+
+    def test_splicing_and_removing_months(self):
+        index = OrderIndex()
+        by_month = lambda month: [order for order in self.orders if order.month == month]
+        for month in ("2025-06", "2025-07", "2025-05"):  # appended, then spliced in front
+            index.add_many(by_month(month))
+        self.assertEqual(index.timeline, sorted(index.timeline))
+        self.assertEqual(index.timeline, self.index.timeline)
+
+        index.remove_month("2025-06", by_month("2025-06"))
+        self.assertEqual(index.ordered_ids(), [order_id for order_id in self.index.ordered_ids() if not order_id.startswith("ORD-2025-06")])
+        self.assertNotIn("2025-06", index.by_month)
+
+        late = Order([], status="placed", timestamp="2025-05-31T23:00:00", order_id="ORD-2025-05-0999")
+        index.add(late)  # out of order: insorted, not appended
+        self.assertEqual(index.timeline, sorted(index.timeline))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from menu.item import MenuItem
+from menu.manager import MenuManager
+from orders.order import Order
+from orders.order_index import OrderIndex
+from orders.order_manager import OrderManager
+from storage.json_store import PartitionedJsonOrderRepository
+from tests.sample_orders import make_orders, write_partitions
+from utils.filtering import filter_menu_items, filter_orders_by_criteria, order_predicate
+from utils.filtering.planner import plan_order_query
+
+MONTHS = ["2025-03", "2025-04", "2025-05", "2025-06", "2025-07"]
+MENU_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu.json")
+
+
+class MonthByMonthQueryTest(unittest.TestCase):
+    # a filter over months that are not loaded walks them one at a time under the memory cap
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.orders = make_orders(MONTHS, 30)
+        write_partitions(self.directory, self.orders)
+        with redirect_stdout(StringIO()):
+            self.manager = OrderManager(repository=PartitionedJsonOrderRepository(self.directory), max_loaded_orders=40)
+
+
+    def expected(self, **criteria):
+        matches = order_predicate(**criteria)
+        return sorted(order_id for order_id, data in self.orders.items() if matches(Order.from_dict(data)))
+
+
+    def assert_within_cap(self):
+        loaded = [month for month in self.manager.loaded_months if month in MONTHS]
+        self.assertLessEqual(len(loaded), 2)  # the cap holds one past month plus the one being read
+
+
+    def test_filter_without_dates_does_not_pin_history(self):
+        with redirect_stdout(StringIO()):
+            found = sorted(self.manager.filter_orders(status="completed"))
+        self.assertEqual(found, self.expected(status="completed"))
+        self.assert_within_cap()
+
+
+    def test_count_and_sorted_listing(self):
+        query = self.manager.query().filter(paid=False)
+        with redirect_stdout(StringIO()):
+            self.assertEqual(query.count(), len(self.expected(paid=False)))
+            by_total = [order.order_id for order in query.order_by("total", descending=True).limit(5)]
+            newest = [order.order_id for order in query.order_by("date", descending=True).limit(3)]
+
+        unpaid = [Order.from_dict(self.orders[order_id]) for order_id in self.expected(paid=False)]
+        self.assertEqual(by_total, [order.order_id for order in sorted(unpaid, key=lambda order: -order.total_amount)][:5])
+        self.assertEqual(newest, [order.order_id for order in sorted(unpaid, key=lambda order: (order.epoch, order.order_id), reverse=True)][:3])
+        self.assert_within_cap()
+
+
+    def test_range_over_unloaded_months(self):
+        with redirect_stdout(StringIO()):
+            found = sorted(self.manager.query().between("2025-04-10", "2025-06-05").status("completed").ids())
+        self.assertEqual(found, self.expected(from_date="2025-04-10", to_date="2025-06-05", status="completed"))
+
+
+
+class ComposableQueryTest(unittest.TestCase):
+    # chained criteria, extra predicates, ordering and limits over the manager's orders
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.orders = make_orders(MONTHS, 30)
+        write_partitions(self.directory, self.orders)
+        with redirect_stdout(StringIO()):
+            self.manager = OrderManager(repository=PartitionedJsonOrderRepository(self.directory))
+            self.manager.ensure_months(None)
+        self.all_orders = { order_id: Order.from_dict(data) for order_id, data in self.orders.items() }
+
+
+    def test_chaining_leaves_the_base_query_alone(self):
+        completed = self.manager.query().status("completed")
+        unpaid = completed.paid(False)
+        self.assertEqual(sorted(completed.ids()), sorted(filter_orders_by_criteria(self.all_orders, status="completed")))
+        self.assertEqual(sorted(unpaid.ids()), sorted(filter_orders_by_criteria(self.all_orders, status="completed", paid=False)))
+
+
+    def test_criteria_match_the_plain_scan(self):
+        big = lambda order: order.total_amount > 50000
+        for criteria in ({"month": "2025-04", "customer": "meera"}, {"from_date": "2025-05-15", "to_date": "2025-06-15", "paid": True}, {"date": "2025-07-08"}):
+            with self.subTest(criteria=criteria):
+                query = self.manager.query().filter(**criteria)
+                expected = filter_orders_by_criteria(self.all_orders, **criteria)
+                self.assertEqual(sorted(query.to_dict()), sorted(expected))
+                self.assertEqual(sorted(query.where(big).ids()), sorted(order_id for order_id, order in expected.items() if big(order)))
+                self.assertEqual(query.count(), len(expected))
+
+
+    def test_limit_stops_the_scan(self):
+        checked = []
+        query = self.manager.query().where(lambda order: checked.append(order.order_id) or True)
+        first = query.limit(3).ids()
+        self.assertEqual(len(first), 3)
+        self.assertEqual(checked, first)  # date order walks the timeline and stops after three rows
+
+        top = self.manager.query().status("completed").order_by("total", descending=True).limit(4)
+        completed = filter_orders_by_criteria(self.all_orders, status="completed").values()
+        self.assertEqual([order.total_amount for order in top], sorted((order.total_amount for order in completed), reverse=True)[:4])
+        self.assertEqual(self.manager.query().order_by("id").first().order_id, min(self.orders))
+        with self.assertRaises(ValueError):
+            self.manager.query().order_by("name")
+
+
+    def test_menu_filter_checks_every_criterion(self):
+        menu_items = {
+            "I001": MenuItem("Drinks", "Espresso", 12000, available=True, is_special=True, item_id="I001"),
+            "I002": MenuItem("Drinks", "Latte", 18000, available=False, item_id="I002"),
+            "I003": MenuItem("Bakery", "Croissant", 9550, available=True, item_id="I003"),
+        }
+        self.assertEqual(list(filter_menu_items(menu_items, category="Drinks", available=True)), ["I001"])
+        self.assertEqual(list(filter_menu_items(menu_items, available=True)), ["I001", "I003"])
+        self.assertEqual(list(filter_menu_items(menu_items, is_special=False)), ["I002", "I003"])
+
+
+
+class QueryPlannerTest(unittest.TestCase):
+    # the cheapest index drives the scan; date criteria are costed without building their ids
+
+    def setUp(self):
+        self.orders = { order_id: Order.from_dict(data) for order_id, data in make_orders(MONTHS, 30).items() }
+        self.index = OrderIndex()
+        self.index.add_many(self.orders.values())
+
+
+    def plan(self, **criteria):
+        return plan_order_query(self.index, criteria, order_predicate)
+
+
+    def matching(self, **criteria):
+        matches = order_predicate(**criteria)
+        return sorted((order for order in self.orders.values() if matches(order)), key=lambda order: (order.epoch, order.order_id))
+
+
+    def test_date_criteria_are_costed_from_the_timeline(self):
+        for criteria in ({"date": "2025-04-08"}, {"from_date": "2025-04-10", "to_date": "2025-06-05"}, {"month": "2025-05"}):
+            with self.subTest(criteria=criteria):
+                plan = self.plan(status="completed", **criteria)
+                rows = dict(plan.alternatives)
+                rows[plan.driver[len("index "):]] = len(plan.order_ids)
+                date_label = next(label for label in rows if label.startswith(("date", "month")))
+                self.assertEqual(rows[date_label], len(self.matching(**criteria)))
+
+
+    def test_smaller_bucket_drives_without_building_date_ids(self):
+        plan = self.plan(status="cancelled", from_date="2025-04-01", to_date="2025-06-30")
+        self.assertEqual(plan.driver, "index status = 'cancelled'")
+        self.assertIs(plan.order_ids, self.index.by_status["cancelled"])  # the bucket itself, not a copy
+        self.assertFalse(plan.date_driven)
+        found = [order_id for order_id in plan.order_ids if plan.matches(self.orders[order_id])]
+        self.assertEqual(sorted(found), sorted(order.order_id for order in self.matching(status="cancelled", from_date="2025-04-01", to_date="2025-06-30")))
+
+
+    def test_inverted_range_costs_nothing(self):
+        plan = self.plan(status="completed", from_date="2025-06-05", to_date="2025-04-10")
+        self.assertEqual(plan.estimate, 0)
+        self.assertEqual(self.index.count_within(plan.time_bounds), 0)
+        self.assertEqual(list(plan.order_ids), [])
+
+
+    def test_date_driver_reads_the_timeline_slice(self):
+        plan = self.plan(status="completed", date="2025-04-08")
+        self.assertTrue(plan.date_driven)
+        self.assertEqual(plan.order_ids, [order.order_id for order in self.matching(date="2025-04-08")])
+
+
+
+class KeysetPagingTest(unittest.TestCase):
+    # next/prev cursors walk a listing page by page, forwards and back, month by month under the cap
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        write_partitions(self.directory, make_orders(MONTHS, 30))
+        menu_path = os.path.join(self.directory, "menu.json")
+        shutil.copy(MENU_FILE, menu_path)
+        with redirect_stdout(StringIO()):
+            menu_manager = MenuManager(menu_path)
+            self.manager = OrderManager(menu_manager=menu_manager, repository=PartitionedJsonOrderRepository(self.directory), max_loaded_orders=40)
+
+
+    def walk(self, query, size):
+        # ids page by page to the end, then the pages met on the way back to the first
+        pages = [query.page(size)]
+        while pages[-1].has_next:
+            pages.append(query.page(size, after=pages[-1].next_cursor))
+        forward = [[order.order_id for order in page] for page in pages]
+
+        backward = []
+        page = pages[-1]
+        while page.has_prev:
+            page = query.page(size, before=page.prev_cursor)
+            backward.append([order.order_id for order in page])
+        return forward, backward
+
+
+    def test_pages_forward_and_back(self):
+        queries = {
+            "date": self.manager.query(),
+            "newest first": self.manager.query().order_by("date", descending=True),
+            "total": self.manager.query().filter(paid=False).order_by("total"),
+            "range and status": self.manager.query().between("2025-04-10", "2025-06-05").status("completed"),
+        }
+        for name, query in queries.items():
+            for size in (1, 7, 200):
+                with self.subTest(query=name, size=size), redirect_stdout(StringIO()):
+                    expected = [order.order_id for order in sorted(query, key=query.cursor_key, reverse=query.descending)]
+                    forward, backward = self.walk(query, size)
+                    self.assertEqual([order_id for page in forward for order_id in page], expected)
+                    self.assertTrue(all(0 < len(page) <= size for page in forward))
+                    self.assertEqual(backward, forward[:-1][::-1])
+
+
+    def test_cursor_ignores_rows_added_before_it(self):
+        query = self.manager.query().filter(month="2025-05")
+        with redirect_stdout(StringIO()):
+            first = query.page(10)
+            second = [order.order_id for order in query.page(10, after=first.next_cursor)]
+            early = Order.from_dict({ **make_orders(["2025-05"], 1)["ORD-2025-05-0001"], "order_id": "ORD-2025-05-0099", "timestamp": "2025-05-01T00:00:00" })
+            self.manager.add_order(early)
+            self.assertEqual([order.order_id for order in query.page(10, after=first.next_cursor)], second)
+            self.assertEqual(query.page(10).orders[0].order_id, "ORD-2025-05-0099")
+
+
+    def test_page_orders_with_date_range(self):
+        with redirect_stdout(StringIO()):
+            page = self.manager.page_orders(page_size=5, from_date="2025-05-20", to_date="2025-06-10")
+            following = self.manager.page_orders(page_size=5, after=page.next_cursor, from_date="2025-05-20", to_date="2025-06-10")
+        ids = [order.order_id for order in page] + [order.order_id for order in following]
+        expected = [order.order_id for order in sorted(
+            (Order.from_dict(data) for data in make_orders(MONTHS, 30).values()),
+            key=lambda order: (order.epoch, order.order_id)
+        ) if "2025-05-20" <= order.date.isoformat() <= "2025-06-10"]
+        self.assertEqual(ids, expected[:10])
+        self.assertFalse(page.has_prev)
+        self.assertTrue(following.has_prev)
+
+
+if __name__ == "__main__":
+    unittest.main()
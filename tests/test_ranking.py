@@ -0,0 +1,43 @@
+import unittest
+from analytics.ranking import TopK, top_k
+
+
+class TopKTest(unittest.TestCase):
+
+    def test_top_and_bottom_with_ties_broken_by_key(self):
+        counts = [("mocha", 3), ("tea", 7), ("latte", 7), ("bun", 1), ("chai", 3)]
+        for pairs in (counts, counts[::-1]):
+            ranking = TopK(top_k=3, bottom_k=2).update(pairs)
+            self.assertEqual(ranking.top(), [("latte", 7), ("tea", 7), ("chai", 3)])
+            self.assertEqual(ranking.bottom(), [("bun", 1), ("chai", 3)])
+
+
+    def test_merge_sums_shared_keys(self):
+        merged = TopK(top_k=3).update([("tea", 6)]).merge(TopK(top_k=3).update([("tea", 5), ("coffee", 4)]))
+        self.assertEqual(merged.top(), [("tea", 11), ("coffee", 4)])
+
+
+    def test_merge_of_complete_partials_matches_full_counts(self):
+        days = [
+            {"tea": 4, "coffee": 2, "bun": 1},
+            {"coffee": 5, "bun": 1, "cake": 2},
+            {"tea": 1, "cake": 3},
+        ]
+        merged = TopK(top_k=4, bottom_k=2)
+        totals = {}
+        for day in days:
+            merged.merge(TopK(top_k=4, bottom_k=2).update(day.items()))
+            for key, value in day.items():
+                totals[key] = totals.get(key, 0) + value
+
+        full = TopK(top_k=4, bottom_k=2).update(totals.items())
+        self.assertEqual(merged.top(), full.top())
+        self.assertEqual(merged.bottom(), full.bottom())
+
+
+    def test_top_k_helper(self):
+        self.assertEqual(top_k({"a": 1, "b": 5, "c": 5}.items(), 2), [("b", 5), ("c", 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
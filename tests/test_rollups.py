@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from menu.manager import MenuManager
+from orders.order import Order
+from orders.order_manager import OrderManager
+from orders.rollups import DailyRollups
+from storage.json_store import JsonOrderRepository, PartitionedJsonOrderRepository
+from tests.sample_orders import make_orders, write_partitions
+from utils.json_io import save_order_data
+
+MONTHS = ["2025-06", "2025-07"]
+MENU_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu.json")
+
+
+class RollupMaintenanceTest(unittest.TestCase):
+    # rollups updated in place by every mutation must equal rollups rebuilt from the orders
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.orders = make_orders(MONTHS, 20)
+        self.menu_path = os.path.join(self.directory, "menu.json")
+        shutil.copy(MENU_FILE, self.menu_path)
+
+
+    def build(self, repository):
+        with redirect_stdout(StringIO()):
+            return OrderManager(menu_manager=MenuManager(self.menu_path), repository=repository)
+
+
+    def rebuilt(self, manager):
+        rollups = DailyRollups()
+        for order in manager.iter_orders():
+            rollups.add(order)
+        return rollups.days
+
+
+    def mutate(self, manager):
+        new_order = Order.from_dict({ **self.orders["ORD-2025-07-0003"], "order_id": "ORD-2025-07-0099", "status": "placed", "paid": False })
+        with redirect_stdout(StringIO()):
+            manager.add_order(new_order)
+            manager.update_status("ORD-2025-07-0099", "completed")
+            manager.mark_paid("ORD-2025-07-0099")
+            manager.update_status("ORD-2025-06-0001", "completed")
+            manager.mark_paid("ORD-2025-06-0003")
+            manager.remove_order("ORD-2025-06-0004")
+            manager.remove_order("ORD-2025-07-0005")
+
+
+    def check_layout(self, make_repository):
+        manager = self.build(make_repository())
+        self.mutate(manager)
+        self.assertEqual(manager.rollups.days, self.rebuilt(manager))
+
+        with redirect_stdout(StringIO()):
+            stored = make_repository().load_rollups()
+        self.assertEqual(stored, manager.rollups.days)
+
+
+    def test_partitioned_layout(self):
+        orders_dir = os.path.join(self.directory, "orders")
+        write_partitions(orders_dir, self.orders)
+        self.check_layout(lambda: PartitionedJsonOrderRepository(orders_dir))
+
+
+    def test_single_file_layout(self):
+        file_path = os.path.join(self.directory, "orders.json")
+        with redirect_stdout(StringIO()):
+            save_order_data(file_path, self.orders)
+        self.check_layout(lambda: JsonOrderRepository(file_path))
+
+
+    def test_single_file_layout_rewrites_only_the_month(self):
+        file_path = os.path.join(self.directory, "orders.json")
+        with redirect_stdout(StringIO()):
+            save_order_data(file_path, self.orders)
+        manager = self.build(JsonOrderRepository(file_path))
+        june = os.path.join(manager.repository.rollup_directory, "2025-06.json")
+        os.utime(june, ns=(0, 0))
+
+        with redirect_stdout(StringIO()):
+            manager.mark_paid("ORD-2025-07-0003")
+        self.assertEqual(os.stat(june).st_mtime_ns, 0)
+        self.assertTrue(os.path.exists(os.path.join(manager.repository.rollup_directory, "2025-07.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
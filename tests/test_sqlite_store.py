@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from menu.manager import MenuManager
+from orders.order_manager import OrderManager
+from storage.json_store import JsonMenuRepository, PartitionedJsonOrderRepository
+from storage.migrate import migrate_json_to_sqlite
+from storage.sqlite_store import SqliteMenuRepository, SqliteOrderRepository
+from tests.sample_orders import make_orders, write_partitions
+
+MONTHS = ["2025-06", "2025-07"]
+MENU_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu.json")
+
+CRITERIA = [
+    {},
+    {"status": "completed"},
+    {"paid": False},
+    {"date": "2025-07-08"},
+    {"from_date": "2025-06-20", "to_date": "2025-07-10", "status": "placed"},
+    {"month": "2025-06", "customer": "asha"},
+]
+
+
+class SqliteMigrationTest(unittest.TestCase):
+    # data migrated from the json files reads back, filters and mutates the same through sqlite
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.orders_dir = os.path.join(self.directory, "orders")
+        self.menu_path = os.path.join(self.directory, "menu.json")
+        self.db_path = os.path.join(self.directory, "brewops.db")
+        write_partitions(self.orders_dir, make_orders(MONTHS, 25))
+        shutil.copy(MENU_FILE, self.menu_path)
+
+        with redirect_stdout(StringIO()):
+            self.counts = migrate_json_to_sqlite(self.orders_dir, self.menu_path, self.db_path, legacy_file=os.path.join(self.directory, "orders.json"))
+
+
+    def managers(self, repository, menu_repository):
+        with redirect_stdout(StringIO()):
+            menu_manager = MenuManager(repository=menu_repository)
+            return OrderManager(menu_manager=menu_manager, repository=repository)
+
+
+    def json_manager(self):
+        return self.managers(PartitionedJsonOrderRepository(self.orders_dir), JsonMenuRepository(self.menu_path))
+
+
+    def sqlite_manager(self):
+        manager = self.managers(SqliteOrderRepository(self.db_path), SqliteMenuRepository(self.db_path))
+        self.addCleanup(manager.repository.close)
+        self.addCleanup(manager.menu_manager.repository.close)
+        return manager
+
+
+    def test_orders_and_menu_read_back(self):
+        with redirect_stdout(StringIO()):
+            orders = PartitionedJsonOrderRepository(self.orders_dir).load()
+            menu = JsonMenuRepository(self.menu_path).load()
+        self.assertEqual(self.counts, (len(orders), len(menu["items"])))
+
+        repository, menu_repository = SqliteOrderRepository(self.db_path), SqliteMenuRepository(self.db_path)
+        self.addCleanup(repository.close)
+        self.addCleanup(menu_repository.close)
+        self.assertEqual(repository.load(), orders)
+        self.assertEqual(repository.list_months(), MONTHS)
+        self.assertEqual(menu_repository.load(), menu)
+
+
+    def test_filters_match_json(self):
+        json_manager, sqlite_manager = self.json_manager(), self.sqlite_manager()
+        for criteria in CRITERIA:
+            with self.subTest(criteria=criteria), redirect_stdout(StringIO()):
+                self.assertEqual(sorted(sqlite_manager.filter_orders(**criteria)), sorted(json_manager.filter_orders(**criteria)))
+
+
+    def test_changes_persist(self):
+        manager = self.sqlite_manager()
+        with redirect_stdout(StringIO()):
+            manager.update_status("ORD-2025-07-0001", "completed")
+            manager.mark_paid("ORD-2025-07-0003")
+            manager.remove_order("ORD-2025-06-0002")
+        manager.repository.close()
+
+        repository = SqliteOrderRepository(self.db_path)
+        self.addCleanup(repository.close)
+        orders = repository.load()
+        self.assertEqual(orders["ORD-2025-07-0001"]["status"], "completed")
+        self.assertTrue(orders["ORD-2025-07-0003"]["paid"])
+        self.assertNotIn("ORD-2025-06-0002", orders)
+        self.assertEqual(len(orders), 2 * 25 - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+from menu.manager import MenuManager
+from orders.order import Order
+from orders.order_manager import OrderManager
+from storage.json_store import JsonOrderRepository
+from tests.sample_orders import make_orders
+from utils.json_io import load_order_journal, save_order_data
+
+MENU_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu.json")
+
+
+class CheckoutTransactionTest(unittest.TestCase):
+    # a customer checkout (add, pay, complete) is one journal line and one menu write, or nothing
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file_path = os.path.join(self.directory, "orders.json")
+        self.menu_path = os.path.join(self.directory, "menu.json")
+        shutil.copy(MENU_FILE, self.menu_path)
+        self.orders = make_orders(["2025-07"], 5)
+        with redirect_stdout(StringIO()):
+            save_order_data(self.file_path, self.orders)
+            self.manager = OrderManager(menu_manager=MenuManager(self.menu_path), repository=JsonOrderRepository(self.file_path))
+        self.journal_path = self.manager.repository.journal_path
+
+
+    def order(self, order_id="ORD-2025-07-0099"):
+        items = [{"item_id": item_id, "name": item.name, "qty": 2, "price": item.price} for item_id, item in list(self.manager.menu_manager.menu_items.items())[:2]]
+        return Order.from_dict({
+            "order_id": order_id, "items": items, "status": "placed", "paid": False, "name": None,
+            "total_amount": sum(item["qty"] * item["price"] for item in items), "timestamp": "2025-07-30T10:00:00",
+        })
+
+
+    def order_counts(self):
+        return { item_id: item.order_count for item_id, item in self.manager.menu_manager.menu_items.items() }
+
+
+    def checkout(self, order):
+        with self.manager.transaction():
+            self.manager.add_order(order)
+            self.manager.mark_paid(order.order_id)
+            self.manager.update_status(order.order_id, "completed")
+
+
+    def test_checkout_is_one_commit(self):
+        order = self.order()
+        counts = self.order_counts()
+        menu_manager = self.manager.menu_manager
+        with mock.patch.object(menu_manager.repository, "save", wraps=menu_manager.repository.save) as save, redirect_stdout(StringIO()):
+            self.checkout(order)
+
+        self.assertEqual(save.call_count, 1)
+        records = load_order_journal(self.journal_path)
+        self.assertEqual([record["op"] for record in records], ["batch"])
+        self.assertEqual([record["op"] for record in records[0]["records"]], ["add", "paid", "status"])
+
+        with redirect_stdout(StringIO()):
+            reloaded = OrderManager(menu_manager=MenuManager(self.menu_path), repository=JsonOrderRepository(self.file_path))
+        stored = reloaded.get_order(order.order_id)
+        self.assertEqual((stored.status, stored.paid), ("completed", True))
+        for item in order.items:
+            self.assertEqual(reloaded.menu_manager.menu_items[item.item_id].order_count, counts[item.item_id] + item.qty)
+
+
+    def test_failed_checkout_leaves_nothing(self):
+        order = self.order()
+        counts = self.order_counts()
+        with redirect_stdout(StringIO()), self.assertRaises(RuntimeError), self.manager.transaction():
+            self.manager.add_order(order)
+            self.manager.mark_paid("ORD-2025-07-0003")
+            raise RuntimeError("payment declined")
+
+        self.assertFalse(self.manager.get_order(order.order_id))
+        self.assertFalse(self.manager.get_order("ORD-2025-07-0003").paid)
+        self.assertEqual(self.order_counts(), counts)
+        self.assertEqual(load_order_journal(self.journal_path), [])
+
+
+    def test_nested_transaction_joins_the_outer_one(self):
+        with redirect_stdout(StringIO()):
+            with self.manager.transaction():
+                self.checkout(self.order())
+                self.manager.mark_paid("ORD-2025-07-0003")
+        records = load_order_journal(self.journal_path)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(len(records[0]["records"]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+from menu.manager import MenuManager
+from orders.order import Order
+from orders.order_manager import OrderManager
+from storage.json_store import PartitionedJsonOrderRepository
+from storage.write_behind import WriteBehind
+from tests.sample_orders import make_orders, write_partitions
+
+MONTHS = ["2025-06", "2025-07"]
+MENU_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu.json")
+
+
+class WriteBehindTest(unittest.TestCase):
+    # buffered changes reach disk only on flush, and a failed transaction leaves nothing of itself behind
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.orders_dir = os.path.join(self.directory, "orders")
+        self.menu_path = os.path.join(self.directory, "menu.json")
+        self.orders = make_orders(MONTHS, 10)
+        write_partitions(self.orders_dir, self.orders)
+        shutil.copy(MENU_FILE, self.menu_path)
+
+
+    def build(self, durability, **flusher_options):
+        with redirect_stdout(StringIO()):
+            menu_manager = MenuManager(self.menu_path, durability=durability)
+            manager = OrderManager(menu_manager=menu_manager, repository=PartitionedJsonOrderRepository(self.orders_dir), durability=durability)
+        flusher = WriteBehind(durability, **flusher_options)
+        flusher.register(manager)
+        flusher.register(menu_manager)
+        self.addCleanup(flusher.stop)
+        return manager, flusher
+
+
+    def stored(self):
+        with redirect_stdout(StringIO()):
+            return PartitionedJsonOrderRepository(self.orders_dir).load()
+
+
+    def new_order(self, order_id):
+        return Order.from_dict({ **self.orders["ORD-2025-07-0002"], "order_id": order_id, "status": "placed", "paid": False })
+
+
+    def test_changes_wait_for_flush(self):
+        manager, flusher = self.build("on-exit")
+        with redirect_stdout(StringIO()):
+            manager.add_order(self.new_order("ORD-2025-07-0099"))
+            manager.mark_paid("ORD-2025-07-0006")
+        stored = self.stored()
+        self.assertNotIn("ORD-2025-07-0099", stored)
+        self.assertFalse(stored["ORD-2025-07-0006"]["paid"])
+        self.assertTrue(manager.menu_manager._dirty)
+
+        flusher.flush()
+        stored = self.stored()
+        self.assertIn("ORD-2025-07-0099", stored)
+        self.assertTrue(stored["ORD-2025-07-0006"]["paid"])
+        self.assertEqual(manager._unflushed, [])
+        self.assertFalse(manager.menu_manager._dirty)
+
+
+    def check_rollback(self, durability):
+        manager, flusher = self.build(durability, interval=60)
+        menu_items = manager.menu_manager.menu_items
+        with redirect_stdout(StringIO()):
+            manager.update_status("ORD-2025-07-0001", "completed")
+            counts = { item_id: item.order_count for item_id, item in menu_items.items() }
+            with self.assertRaises(RuntimeError), manager.transaction():
+                manager.add_order(self.new_order("ORD-2025-07-0099"))
+                manager.remove_order("ORD-2025-07-0003")
+                raise RuntimeError("abandoned")
+
+        self.assertNotIn("ORD-2025-07-0099", manager.orders)
+        self.assertIsNotNone(manager.get_order("ORD-2025-07-0003"))
+        self.assertEqual(manager.get_order("ORD-2025-07-0001").status, "completed")
+        self.assertEqual({ item_id: item.order_count for item_id, item in menu_items.items() }, counts)
+
+        flusher.flush()
+        stored = self.stored()
+        self.assertEqual(stored["ORD-2025-07-0001"]["status"], "completed")
+        self.assertNotIn("ORD-2025-07-0099", stored)
+        self.assertIn("ORD-2025-07-0003", stored)
+
+
+    def test_grouped_rollback_keeps_earlier_buffered_changes(self):
+        self.check_rollback("grouped")
+
+
+    def test_on_exit_rollback_keeps_earlier_buffered_changes(self):
+        self.check_rollback("on-exit")
+
+
+    def test_failed_flush_keeps_records_buffered(self):
+        manager, flusher = self.build("on-exit")
+        with redirect_stdout(StringIO()):
+            manager.mark_paid("ORD-2025-07-0006")
+        with mock.patch.object(manager.repository, "apply", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                flusher.flush()
+        self.assertEqual(len(manager._unflushed), 1)
+
+        flusher.flush()
+        self.assertTrue(self.stored()["ORD-2025-07-0006"]["paid"])
+
+
+    def test_grouped_flushes_in_the_background(self):
+        manager, flusher = self.build("grouped", interval=0.05)
+        with redirect_stdout(StringIO()):
+            manager.mark_paid("ORD-2025-07-0006")
+        deadline = time.monotonic() + 5
+        while not self.stored()["ORD-2025-07-0006"]["paid"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertTrue(self.stored()["ORD-2025-07-0006"]["paid"])
+        self.assertIsNone(flusher.last_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
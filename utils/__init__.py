@@ -1,8 +1,29 @@
 # utils/__init__.py
 
-from .json_io import load_menu_data, save_menu_data,load_order_data, save_order_data
-from .display import display_menu_items,display_summary_panel, print_error,print_header,print_section_title,print_success,print_warning, get_category_emoji, display_order_summary, display_view_menu,display_multiple_orders_table, print_order_menu, admin_menu, analytics_menu, show_item_category_main_menu,menu_views_summary_menu, manage_categories_menu, manage_items_menu, display_multiple_summary, display_menu_summary, customer_menu
-from .filtering import filter_menu_items, filter_orders_by_criteria, get_id_to_name_map, get_name_to_id_map, filter_by_month
-from .validation import validate_boolean, validate_category, validate_item_id, validate_name, validate_price, get_valid_item_id, valid_qty, validate_date, validate_order_status
+# names are re-exported lazily (PEP 562): importing one utils submodule does not pull in
+# the others (display, for one, loads rich)
+from importlib import import_module
 
-__all__ = ["load_menu_data", "save_menu_data", "display_menu_items" ,"display_summary_panel", "print_error", "print_header", "print_section_title","print_success", "print_warning", "filter_menu_items", "validate_boolean", "validate_category", "validate_item_id", "validate_name", "validate_price", "get_valid_item_id", "load_order_data", "save_order_data", "filter_orders_by_criteria", "get_category_emoji", "get_id_to_name_map", "get_name_to_id_map", "valid_qty", "display_order_summary", "display_view_menu", "display_multiple_orders_table", "print_order_menu","admin_menu", "analytics_menu","show_item_category_main_menu", "menu_views_summary_menu", "manage_categories_menu", "manage_items_menu", "display_multiple_summary", "display_menu_summary", "filter_by_month", "customer_menu", "validate_date", "validate_order_status"]
+_EXPORTS = {
+    "json_io": ["load_menu_data", "save_menu_data", "load_order_data", "save_order_data"],
+    "display": ["display_menu_items", "display_summary_panel", "print_error", "print_header", "print_section_title", "print_success", "print_warning", "get_category_emoji", "display_order_summary", "display_view_menu", "display_multiple_orders_table", "print_order_menu", "admin_menu", "analytics_menu", "show_item_category_main_menu", "menu_views_summary_menu", "manage_categories_menu", "manage_items_menu", "display_multiple_summary", "display_menu_summary", "customer_menu"],
+    "filtering": ["filter_menu_items", "filter_orders_by_criteria", "get_id_to_name_map", "get_name_to_id_map", "filter_by_month", "build_order_filter_sql"],
+    "money": ["to_paise", "to_rupees"],
+    "validation": ["validate_boolean", "validate_category", "validate_item_id", "validate_name", "validate_price", "get_valid_item_id", "valid_qty", "validate_date", "validate_order_status"],
+}
+_MODULE_OF = { name: module for module, names in _EXPORTS.items() for name in names }
+
+__all__ = ["load_menu_data", "save_menu_data", "display_menu_items" ,"display_summary_panel", "print_error", "print_header", "print_section_title","print_success", "print_warning", "filter_menu_items", "validate_boolean", "validate_category", "validate_item_id", "validate_name", "validate_price", "get_valid_item_id", "load_order_data", "save_order_data", "filter_orders_by_criteria", "get_category_emoji", "get_id_to_name_map", "get_name_to_id_map", "valid_qty", "display_order_summary", "display_view_menu", "display_multiple_orders_table", "print_order_menu","admin_menu", "analytics_menu","show_item_category_main_menu", "menu_views_summary_menu", "manage_categories_menu", "manage_items_menu", "display_multiple_summary", "display_menu_summary", "filter_by_month", "customer_menu", "validate_date", "validate_order_status", "build_order_filter_sql", "to_paise", "to_rupees"]
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
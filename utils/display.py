@@ -11,6 +11,7 @@ from rich.rule import Rule
 
 console = Console()
 from datetime import date, datetime
+from utils.money import to_rupees
 
 
 
@@ -38,7 +39,7 @@ def display_menu_items(items: list, title="📋 Menu Items"):
             item.item_id,
             item.name,
             item.category,
-            f"{item.price:.2f}",
+            f"{to_rupees(item.price):.2f}",
             "✅" if item.available else "❌",
             "🌟" if item.is_special else "—"
         )
@@ -73,6 +74,15 @@ def print_error(message):
     console.print(f"\n❌ [red]{message}[/red]\n")
 
 
+def print_load_progress(file_path, done, total):
+    # rewritten in place chunk by chunk; the last call ends the line
+    percent = 100 * done // total if total else 100
+    console.print(
+        f"📦 Loading {file_path}: {percent:3d}% ({done / 1048576:,.0f} / {total / 1048576:,.0f} MB)",
+        end="\n" if done >= total else "\r", highlight=False
+    )
+
+
 def display_summary_panel(lines: list[str], title="📋 Summary", color="cyan"):
     group = Group(*[Text.from_markup(line) for line in lines])
     console.print(Panel.fit(group, title=title, border_style=color, padding=(1, 2)))
@@ -108,18 +118,18 @@ def display_order_summary(order):
     table.add_column("Total", justify="right")
 
     for item in order.items:
-        name = item["name"]
-        qty = item["qty"]
-        price = item["price"]
-        item_total = qty * price
+        name = item.name
+        qty = item.qty
+        price = to_rupees(item.price)
+        item_total = to_rupees(item.subtotal)
         table.add_row(name, str(qty), f"₹{price:.2f}", f"₹{item_total:.2f}")
 
     # 📦 Footer info
     footer_lines = [
-        f"\n[cyan]Total Amount:[/cyan] [bold green]₹{order.total_amount:.2f}[/bold green]",
+        f"\n[cyan]Total Amount:[/cyan] [bold green]₹{to_rupees(order.total_amount):.2f}[/bold green]",
         f"[cyan]Status:[/cyan] [yellow]{order.status.capitalize()}[/yellow]",
         f"[cyan]Paid:[/cyan] {'✅ Yes' if order.paid else '❌ No'}",
-        f"[cyan]Date:[/cyan] {order.timestamp.split('T')[0]}"
+        f"[cyan]Date:[/cyan] {order.date}"
     ]
     footer = Group(*[Text.from_markup(line) for line in footer_lines])
 
@@ -148,7 +158,7 @@ def display_view_menu(menu_manager):  # Menu for customers
         for item in items_in_category:
             star = " ⭐" if item.is_special else ""
             name = f"{item.name}{star}"
-            items_str += f"• {name:<26} ₹{item.price:>6}\n"
+            items_str += f"• {name:<26} ₹{to_rupees(item.price):>6}\n"
 
         panels.append(
             Panel.fit(
@@ -169,13 +179,13 @@ def display_view_menu(menu_manager):  # Menu for customers
         console.print(Columns(panel_row, equal=True, expand=True))
 
 
-def display_multiple_orders_table(orders):
+def display_multiple_orders_table(orders, caption=None):
     if not orders:
         print_warning("No orders to display.")
         return
     
     
-    table = Table(title=f"[bold white]📋 Orders Overview [/bold white]", show_header=True, header_style="bold magenta", box=box.SIMPLE_HEAVY)
+    table = Table(title=f"[bold white]📋 Orders Overview [/bold white]", caption=caption, show_header=True, header_style="bold magenta", box=box.SIMPLE_HEAVY)
 
     # table = Table(title="📋 Orders Overview")
 
@@ -188,14 +198,14 @@ def display_multiple_orders_table(orders):
 
     for order in orders:
         paid_status = "✅ Yes" if order.paid else "❌ No"
-        date_only = order.timestamp.split("T")[0] if "T" in order.timestamp else order.timestamp
+        date_only = str(order.date)
 
         table.add_row(
             order.order_id,
             order.name or "-",
             order.status.capitalize(),
             paid_status,
-            f"₹{order.total_amount:.2f}",
+            f"₹{to_rupees(order.total_amount):.2f}",
             date_only
         )
 
@@ -340,8 +350,8 @@ def display_multiple_summary(summary: dict):
     order_lines = [
         # f"[cyan]Date:[/cyan] {target_date}",
         f" 🧾 [green]Total Orders:[/green] {summary["total_orders"]}",
-        f" 💰 [green]Total Revenue:[/green] ₹{summary["total_revenue"]:.2f}",
-        f" 📊 [green]Avg Order Value:[/green] ₹{summary["avg_order_value"]:.2f}"
+        f" 💰 [green]Total Revenue:[/green] ₹{to_rupees(summary["total_revenue"]):.2f}",
+        f" 📊 [green]Avg Order Value:[/green] ₹{to_rupees(summary["avg_order_value"]):.2f}"
     ]
     
     # TOP ORDERED ITEMS
@@ -379,11 +389,11 @@ def display_multiple_summary(summary: dict):
     if cat_revenue:
         if isinstance(cat_revenue, list):
             best_category_by_revenue_lines = [
-                f"💰 {name} — ₹[bold yellow]{count:.2f}[/bold yellow] revenue" for name, count in cat_revenue
+                f"💰 {name} — ₹[bold yellow]{to_rupees(count):.2f}[/bold yellow] revenue" for name, count in cat_revenue
             ]
         else:
             name, count = cat_revenue
-            best_category_by_revenue_lines = [f"💰 {name} — ₹[bold yellow]{count:.2f}[/bold yellow] revenue"]
+            best_category_by_revenue_lines = [f"💰 {name} — ₹[bold yellow]{to_rupees(count):.2f}[/bold yellow] revenue"]
     else:
         print_warning("No best category for revenue to show.")
         
@@ -423,8 +433,8 @@ def get_today_panel(today_summary):
         today_panel = Panel.fit(
         f"""📅 [bold magenta]Today: {date.today()}[/bold magenta]
 ├─ Total Orders Today: [bold green]{today_summary['total_orders']}[/bold green]
-├─ Total Revenue Today: [bold green]₹{today_summary['total_revenue']:.2f}[/bold green]
-├─ Avg. Order Value: [bold green]₹{today_summary['avg_order_value']:.2f}[/bold green]
+├─ Total Revenue Today: [bold green]₹{to_rupees(today_summary['total_revenue']):.2f}[/bold green]
+├─ Avg. Order Value: [bold green]₹{to_rupees(today_summary['avg_order_value']):.2f}[/bold green]
 ├─ Top Item Today: {today_summary['top_item']}
 └─ Peak Hour Today: [bold yellow]{today_summary['peak_hour']}[/bold yellow]
         """,
@@ -439,8 +449,8 @@ def get_monthly_panel(month_summary):
         month_panel = Panel.fit(
         f"""🗓️  [bold magenta]This Month: {date.today():%B %Y}[/bold magenta]
 ├─ Orders This Month: [bold green]{month_summary['total_orders']}[/bold green]
-├─ Revenue This Month: [bold green]₹{month_summary['total_revenue']:.2f}[/bold green]
-├─ Avg. Daily Revenue: [bold green]₹{month_summary['avg_order_value']:.2f}[/bold green]
+├─ Revenue This Month: [bold green]₹{to_rupees(month_summary['total_revenue']):.2f}[/bold green]
+├─ Avg. Daily Revenue: [bold green]₹{to_rupees(month_summary['avg_order_value']):.2f}[/bold green]
 ├─ Best Selling Item: {month_summary['top_item']}
 ├─ Low Performing Item 1: {month_summary['least_item']}
 └─ Low Performing Items 2: {month_summary['second_least_item']}
@@ -474,8 +484,8 @@ def get_category_panel(menu_summary):
     # Calculate total orders for percentage
     total_orders = sum(qty for cat, qty in menu_summary["category_wise_orders"])
     
-    # Sort by quantity (highest first)
-    sorted_categories = sorted(menu_summary["category_wise_orders"], key=lambda x: x[1], reverse=True)
+    # already ranked by quantity (highest first) in get_menu_insights
+    sorted_categories = menu_summary["category_wise_orders"]
     
     for category, quantity in sorted_categories:
         percentage = (quantity / total_orders * 100) if total_orders > 0 else 0
@@ -528,7 +538,7 @@ def get_weekly_sales_panel(weekly_data):
             day_data["date"],
             day_data["weekday"],
             str(day_data["per_day_orders"]),
-            f"₹{day_data['per_day_revenue']:.2f}"
+            f"₹{to_rupees(day_data['per_day_revenue']):.2f}"
         )
     
     # Add separator and summary rows
@@ -537,13 +547,13 @@ def get_weekly_sales_panel(weekly_data):
         "[bold]TOTAL[/bold]", 
         "[bold]7 Days[/bold]", 
         f"[bold]{sum(day['per_day_orders'] for day in weekly_data['weekly_summary'])}[/bold]",
-        f"[bold green]₹{weekly_data['total_revenue']:.2f}[/bold green]"
+        f"[bold green]₹{to_rupees(weekly_data['total_revenue']):.2f}[/bold green]"
     )
     weekly_table.add_row(
         "[bold]DAILY AVG[/bold]", 
         "[bold]Per Day[/bold]", 
         f"[bold]{sum(day['per_day_orders'] for day in weekly_data['weekly_summary']) / 7:.1f}[/bold]",
-        f"[bold green]₹{weekly_data['daily_avg']:.2f}[/bold green]"
+        f"[bold green]₹{to_rupees(weekly_data['daily_avg']):.2f}[/bold green]"
     )
 
     # Create panel
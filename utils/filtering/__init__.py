@@ -0,0 +1,518 @@
+import calendar
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from itertools import islice
+from utils.filtering.planner import QueryPlan, plan_order_query
+
+def filter_by_category(menu_items: dict, category: str) -> dict:
+    return { item_id : item for item_id, item in menu_items.items() if item.category == category }
+
+
+def filter_by_available(menu_items: dict, available: bool) -> dict:
+    return { item_id : item for item_id, item in menu_items.items() if item.available == available }
+
+
+def filter_by_special(menu_items: dict, is_special: bool) -> dict:
+    return { item_id : item for item_id, item in menu_items.items() if item.is_special == is_special }
+
+
+def filter_menu_items(menu_items: dict, category=None, available=None, is_special=None):
+    # one pass, every criterion checked per item; no intermediate dict per filter
+    return {
+        item_id: item for item_id, item in menu_items.items()
+        if (not category or item.category == category)
+        and (available is None or item.available == available)
+        and (is_special is None or item.is_special == is_special)
+    }
+
+#---------- Filters for Order ----------#
+
+def filter_orders_by_criteria(orders: dict, status=None, paid=None, date=None, from_date=None, to_date=None, month=None, customer=None) -> dict:
+    # plain scan of an orders dict; OrderManager routes through its indexes via OrderQuery instead
+    matches = order_predicate(status, paid, date, from_date, to_date, month, customer)
+    return { order_id: order for order_id, order in orders.items() if matches(order) }
+
+
+def order_predicate(status=None, paid=None, date=None, from_date=None, to_date=None, month=None, customer=None):
+    # the criteria folded into one check per order (exact date, then range, then month)
+    checks = []
+
+    if status:
+        checks.append(lambda order: order.status == status)
+
+    if paid is not None:  # use explicit check to allow False
+        checks.append(lambda order: order.paid == paid)
+
+    if customer:  # customer names match case-insensitively
+        customer = customer.lower()
+        checks.append(lambda order: bool(order.name) and order.name.lower() == customer)
+
+    if date:
+        target_day = datetime.strptime(date, "%Y-%m-%d").date().toordinal()
+        checks.append(lambda order: order.day == target_day)
+
+    elif from_date and to_date:  # Only apply date range if exact date is not specified
+        start_day = datetime.strptime(from_date, "%Y-%m-%d").date().toordinal()
+        end_day = datetime.strptime(to_date, "%Y-%m-%d").date().toordinal()
+        checks.append(lambda order: start_day <= order.day <= end_day)
+
+    elif month:  # Only apply month filter if no date filters are applied
+        checks.append(lambda order: order.month == month)
+
+    return lambda order: all(check(order) for check in checks)
+
+
+def filter_by_status(orders: dict, status: str) -> dict:
+    return {
+        order_id: order for order_id, order in orders.items()
+        if order.status == status
+    }
+
+
+def filter_by_paid(orders: dict, paid: bool) -> dict:
+    return {
+        order_id: order for order_id, order in orders.items()
+        if order.paid == paid
+    }
+
+
+def filter_by_date(orders: dict, date: str) -> dict:
+    target_day = datetime.strptime(date, "%Y-%m-%d").date().toordinal()
+    
+    return {
+        order_id: order for order_id, order in orders.items()
+        if order.day == target_day
+    }
+
+
+def filter_by_month(orders: dict, month: str) -> dict:
+    return {
+        order_id: order for order_id, order in orders.items()
+        if month == order.month
+    }
+    
+
+def filter_by_date_range(orders, from_date, to_date):
+    # Convert string dates to ordinal days, comparable with Order.day
+    start_day = datetime.strptime(from_date, "%Y-%m-%d").date().toordinal()
+    end_day = datetime.strptime(to_date, "%Y-%m-%d").date().toordinal()
+    
+    return {
+        key: order for key, order in orders.items() 
+        if start_day <= order.day <= end_day
+    }
+
+
+
+def to_iso_date(value: str) -> str:
+    # "2025-7-3" is accepted by the date prompts; indexes are keyed by "2025-07-03"
+    return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+
+
+def months_for_criteria(date=None, from_date=None, to_date=None, month=None):
+    # "YYYY-MM" months a date filter can match (same precedence as above); None = every month
+    if date:
+        return [to_iso_date(date)[:7]]
+
+    if from_date and to_date:
+        from_date, to_date = to_iso_date(from_date), to_iso_date(to_date)
+        year, mon = int(from_date[:4]), int(from_date[5:7])
+        months = []
+        while f"{year:04d}-{mon:02d}" <= to_date[:7]:
+            months.append(f"{year:04d}-{mon:02d}")
+            year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+        return months
+
+    if month:
+        return [month]
+
+    return None
+
+
+def narrow_to_month(criteria: dict, month: str) -> dict:
+    # criteria (dates ISO) restricted to the orders of one of the months they cover
+    if criteria.get("date"):
+        return criteria
+
+    if criteria.get("from_date") and criteria.get("to_date"):
+        first = f"{month}-01"
+        last = f"{month}-{calendar.monthrange(int(month[:4]), int(month[5:7]))[1]:02d}"
+        return { **criteria, "from_date": max(criteria["from_date"], first), "to_date": min(criteria["to_date"], last) }
+
+    return { **criteria, "month": month }
+
+
+def _epoch_month(epoch) -> str:
+    return (datetime(1970, 1, 1) + timedelta(seconds=epoch)).strftime("%Y-%m")
+
+
+#---------- Lazy order queries ----------#
+
+ORDER_SORT_KEYS = {
+    "date": lambda order: order.epoch,
+    "total": lambda order: order.total_amount,
+    "id": lambda order: order.order_id,
+}
+
+
+class OrderQuery:
+    """
+    Lazy, chainable view over an OrderManager's orders:
+
+        order_manager.query().status("completed").paid(True).between(a, b).order_by("total").limit(10)
+
+    Each call returns a new query and nothing runs until it is iterated. The criteria are
+    handed to the backend when it can run them, otherwise the planner (utils.filtering.planner)
+    drives the scan from the most selective index and checks the rest per order, together
+    with predicates added by where(). limit() stops as soon as it can (a bounded heap when
+    combined with order_by). order_by("date") reads the index's time-ordered timeline and
+    never sorts. Orders stream out one at a time; explain() shows the plan.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.criteria = {}     # status, paid, date, from_date, to_date, month, customer
+        self.predicates = []   # extra per-order checks
+        self.sort_key = None
+        self.descending = False
+        self.max_rows = None
+
+
+    def _refine(self, **changes):
+        query = OrderQuery(self.manager)
+        query.criteria = dict(self.criteria)
+        query.predicates = list(self.predicates)
+        query.sort_key, query.descending, query.max_rows = self.sort_key, self.descending, self.max_rows
+        for name, value in changes.items():
+            setattr(query, name, value)
+        return query
+
+
+    def filter(self, status=None, paid=None, date=None, from_date=None, to_date=None, month=None, customer=None):
+        # several criteria at once, None meaning "not filtered" (the filter_orders signature)
+        given = dict(status=status, paid=paid, date=date, from_date=from_date, to_date=to_date, month=month, customer=customer)
+        return self._refine(criteria={ **self.criteria, **{ key: value for key, value in given.items() if value is not None } })
+
+
+    def status(self, status):
+        return self.filter(status=status)
+
+
+    def paid(self, paid=True):
+        return self.filter(paid=paid)
+
+
+    def on(self, date):
+        return self.filter(date=date)
+
+
+    def between(self, from_date, to_date):
+        return self.filter(from_date=from_date, to_date=to_date)
+
+
+    def month(self, month):
+        return self.filter(month=month)
+
+
+    def customer(self, name):
+        return self.filter(customer=name)
+
+
+    def where(self, predicate):
+        return self._refine(predicates=self.predicates + [predicate])
+
+
+    def order_by(self, key, descending=False):
+        if key not in ORDER_SORT_KEYS:
+            raise ValueError(f"Cannot order by '{key}', expected one of {', '.join(ORDER_SORT_KEYS)}")
+        return self._refine(sort_key=key, descending=descending)
+
+
+    def limit(self, count):
+        return self._refine(max_rows=count)
+
+
+    def _iso_criteria(self):
+        return { key: to_iso_date(value) if key in ("date", "from_date", "to_date") else value for key, value in self.criteria.items() }
+
+
+    def plan(self) -> QueryPlan:
+        criteria = self._iso_criteria()
+        manager = self.manager
+        manager.ensure_months(months_for_criteria(criteria.get("date"), criteria.get("from_date"), criteria.get("to_date"), criteria.get("month")))
+
+        plan = plan_order_query(manager.index, criteria, order_predicate)
+        if manager.repository.supports_query:
+            # the database filters everything itself; the index plan only supplies the estimate
+            where, params = build_order_filter_sql(**criteria)
+            return QueryPlan(
+                f"{type(manager.repository).__name__} WHERE {where}", manager.repository.query_ids(where, params),
+                plan.estimate, [], plan.total, backend_plan=manager.repository.explain_query(where, params),
+                time_bounds=plan.time_bounds
+            )
+        return plan
+
+
+    def _month_parts(self):
+        """
+        [(month, query narrowed to that month)], oldest first, when the months the criteria cover
+        are not all in memory (a filter without dates covers the whole history). Each part loads
+        its own month as it is reached, so the manager's cap on loaded orders keeps applying.
+        None when the query runs against the loaded orders at once.
+        """
+        manager = self.manager
+        if not manager.repository.partitioned:
+            return None
+
+        criteria = self._iso_criteria()
+        months = months_for_criteria(criteria.get("date"), criteria.get("from_date"), criteria.get("to_date"), criteria.get("month"))
+        months = sorted(manager.known_months if months is None else set(months) & manager.known_months)
+        if all(month in manager.loaded_months for month in months):
+            return None
+        return [(month, self._refine(criteria=narrow_to_month(criteria, month))) for month in months]
+
+
+    def _all_rows(self, by_date=False):
+        # what _rows yields for the whole query, month by month when _month_parts says so
+        parts = self._month_parts()
+        if parts is None:
+            return self._rows(self.plan(), by_date)
+        if by_date and self.descending:
+            parts.reverse()
+        return (order for _, part in parts for order in part._rows(part.plan(), by_date))
+
+
+    def _rows(self, plan, by_date=False):
+        # every matching order before limit; by_date yields them in timestamp order
+        orders = self.manager.orders
+        order_ids = plan.order_ids
+        if by_date and not isinstance(order_ids, list):
+            # lists (timeline slices, SQL results) already are; otherwise walk the index timeline
+            timeline = self.manager.index.ordered_ids(plan.time_bounds)
+            order_ids = timeline if order_ids is None else [order_id for order_id in timeline if order_id in order_ids]
+        elif order_ids is None:
+            order_ids = sorted(orders)
+        elif not isinstance(order_ids, list):
+            order_ids = sorted(order_ids)
+        if by_date and self.descending:
+            order_ids = reversed(order_ids)
+
+        return self._matching(plan, (orders[order_id] for order_id in order_ids if order_id in orders))
+
+
+    def _matching(self, plan, rows):
+        if plan.residual or self.predicates:
+            rows = (
+                order for order in rows
+                if plan.matches(order) and all(predicate(order) for predicate in self.predicates)
+            )
+        return rows
+
+
+    def cursor_key(self, order) -> tuple:
+        # the keyset position of order under this query's ordering; unique, so pages never overlap
+        if self.sort_key in (None, "date"):
+            return (order.epoch, order.order_id)
+        return (ORDER_SORT_KEYS[self.sort_key](order), order.epoch, order.order_id)
+
+
+    def page(self, size, after=None, before=None) -> "OrderPage":
+        """
+        One page of at most size matching orders in the query's order (timestamp when order_by
+        was not called). after / before take a previous page's next_cursor / prev_cursor, so a
+        page only ever reads from its cursor onwards and rows added or removed elsewhere do not
+        shift it. limit() does not apply to pages.
+        """
+        backwards = before is not None
+        cursor = before if backwards else after
+        cursor = None if cursor is None else tuple(cursor)
+        reverse = self.descending != backwards  # walking toward smaller keys
+
+        if self.sort_key in (None, "date"):
+            picked = list(islice(self._walk_timelines(cursor, reverse), size + 1))
+        else:
+            # no index on the key: a bounded heap over the matches past the cursor
+            rows = self._all_rows()
+            if cursor is not None:
+                beyond = (lambda key: key < cursor) if reverse else (lambda key: key > cursor)
+                rows = (order for order in rows if beyond(self.cursor_key(order)))
+            pick = heapq.nlargest if reverse else heapq.nsmallest
+            picked = pick(size + 1, rows, key=self.cursor_key)
+
+        more = len(picked) > size
+        picked = picked[:size]
+        if backwards:
+            picked.reverse()
+            return OrderPage(self, picked, has_prev=more, has_next=True)
+        return OrderPage(self, picked, has_prev=after is not None, has_next=more)
+
+
+    def _walk_timelines(self, cursor, reverse):
+        # _walk_timeline over the whole query; month by month (see _month_parts) it starts at the
+        # cursor's month and only loads further months while the page still needs rows
+        parts = self._month_parts()
+        if parts is None:
+            return self._walk_timeline(self.plan(), cursor, reverse)
+
+        if reverse:
+            parts.reverse()
+        if cursor is not None:
+            cursor_month = _epoch_month(cursor[0])
+            parts = [(month, part) for month, part in parts if (month <= cursor_month if reverse else month >= cursor_month)]
+        return (order for _, part in parts for order in part._walk_timeline(part.plan(), cursor, reverse))
+
+
+    def _walk_timeline(self, plan, cursor, reverse):
+        # matching orders strictly past cursor, read off the index timeline in (epoch, order_id) order;
+        # both ends are binary searches (cursor and the plan's date range), so a page costs O(log n + page)
+        orders = self.manager.orders
+        timeline = self.manager.index.timeline
+        ids = plan.order_ids
+        candidates = None if ids is None or plan.date_driven else ids if isinstance(ids, (set, frozenset)) else set(ids)
+
+        lo, hi = 0, len(timeline)
+        if plan.time_bounds is not None:
+            lo, hi = bisect_left(timeline, (plan.time_bounds[0],)), bisect_left(timeline, (plan.time_bounds[1],))
+
+        if reverse:
+            start = hi if cursor is None else min(hi, bisect_left(timeline, cursor))
+            positions = range(start - 1, lo - 1, -1)
+        else:
+            start = lo if cursor is None else max(lo, bisect_right(timeline, cursor))
+            positions = range(start, hi)
+
+        order_ids = (timeline[position][1] for position in positions)
+        rows = (
+            orders[order_id] for order_id in order_ids
+            if (candidates is None or order_id in candidates) and order_id in orders
+        )
+        return self._matching(plan, rows)
+
+
+    def __iter__(self):
+        by_date = self.sort_key == "date"
+        rows = self._all_rows(by_date)
+
+        if self.sort_key and not by_date:
+            key = ORDER_SORT_KEYS[self.sort_key]
+            if self.max_rows is not None:
+                pick = heapq.nlargest if self.descending else heapq.nsmallest
+                rows = pick(self.max_rows, rows, key=key)
+            else:
+                rows = sorted(rows, key=key, reverse=self.descending)
+
+        elif self.max_rows is not None:
+            rows = islice(rows, self.max_rows)
+
+        yield from rows
+
+
+    def ids(self):
+        return [order.order_id for order in self]
+
+
+    def first(self):
+        return next(iter(self.limit(1)), None)
+
+
+    def count(self):
+        matched = sum(1 for _ in self._all_rows())
+        return matched if self.max_rows is None else min(matched, self.max_rows)
+
+
+    def explain(self) -> str:
+        # the chosen plan with estimated and (by running it) actual row counts
+        parts = self._month_parts()
+        if parts is None:
+            plan = self.plan()
+            return plan.explain(actual=sum(1 for _ in self._rows(plan)))
+
+        lines = [f"Plan: month by month over {len(parts)} months, not all of them in memory"]
+        for month, part in parts:
+            plan = part.plan()
+            driven = plan.total if plan.order_ids is None else len(plan.order_ids)
+            lines.append(f"  {month}: {plan.driver} -> reads {driven} | actual rows {sum(1 for _ in part._rows(plan))}")
+        return "\n".join(lines)
+
+
+    def to_dict(self):
+        return { order.order_id: order for order in self }
+
+
+class OrderPage:
+    # one page of an OrderQuery, in display order, with the cursors of its neighbours
+    def __init__(self, query, orders, has_prev, has_next):
+        self.orders = orders
+        self.has_prev = has_prev and bool(orders)
+        self.has_next = has_next and bool(orders)
+        self.prev_cursor = query.cursor_key(orders[0]) if self.has_prev else None
+        self.next_cursor = query.cursor_key(orders[-1]) if self.has_next else None
+
+
+    def __iter__(self):
+        return iter(self.orders)
+
+
+    def __len__(self):
+        return len(self.orders)
+
+
+#---------- SQL push-down for Order filters ----------#
+
+def build_order_filter_sql(status=None, paid=None, date=None, from_date=None, to_date=None, month=None, customer=None):
+    # same precedence as filter_orders_by_criteria: exact date, then range, then month.
+    # ISO timestamps sort as strings, so date filters become index-friendly half-open ranges
+    clauses = []
+    params = []
+
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+
+    if paid is not None:
+        clauses.append("paid = ?")
+        params.append(int(paid))
+
+    if customer:
+        clauses.append("name = ? COLLATE NOCASE")
+        params.append(customer)
+
+    start = end = None
+    if date:
+        start = datetime.strptime(date, "%Y-%m-%d").date()
+        end = start + timedelta(days=1)
+
+    elif from_date and to_date:
+        start = datetime.strptime(from_date, "%Y-%m-%d").date()
+        end = datetime.strptime(to_date, "%Y-%m-%d").date() + timedelta(days=1)
+
+    elif month:
+        # every "YYYY-MM-..." timestamp sorts below the prefix followed by '~'
+        start = month
+        end = month + "~"
+
+    if start is not None:
+        clauses.append("timestamp >= ? AND timestamp < ?")
+        params.extend([str(start), str(end)])
+
+    where = " AND ".join(clauses) if clauses else "1 = 1"
+    return where, params
+
+
+#---------- For Customer ----------#
+
+def get_name_to_id_map(menu_items: dict) -> dict:
+    return {
+        item.name.lower(): item.item_id
+        for item in menu_items.values()
+        if item.available
+    }
+
+
+def get_id_to_name_map(menu_items: dict) -> dict:
+    return {
+        item.item_id: item.name
+        for item in menu_items.values()
+        if item.available
+    }
@@ -0,0 +1,106 @@
+"""
+Access path selection for OrderQuery.
+
+Every indexable criterion is costed from the OrderManager's index cardinalities
+(the exact size of the bucket it would read). The cheapest one drives the scan and
+the other criteria are checked per order as residual filters, so one small set is
+walked instead of several large ones being intersected.
+"""
+
+class QueryPlan:
+    def __init__(self, driver, order_ids, estimate, residual, total, alternatives=(), backend_plan=(), time_bounds=None):
+        self.driver = driver              # label of the access path, e.g. "status = 'completed'"
+        self.order_ids = order_ids        # ids read by the driver (None = every loaded order)
+        self.estimate = estimate          # estimated rows after all filters
+        self.residual = residual          # [(label, predicate)] checked per driven order
+        self.total = total                # orders indexed when the plan was made
+        self.alternatives = alternatives  # [(label, rows)] paths that were not chosen
+        self.backend_plan = backend_plan  # detail lines from the storage backend, when it runs the filter
+        self.time_bounds = time_bounds    # [start, end) epoch seconds every match lies in, None without a date criterion
+        self.date_driven = False          # the driver is the date criterion itself
+
+
+    def matches(self, order):
+        return all(predicate(order) for _, predicate in self.residual)
+
+
+    def explain(self, actual=None) -> str:
+        driven = self.total if self.order_ids is None else len(self.order_ids)
+        lines = [f"Plan: {self.driver} -> reads {driven} of {self.total} orders"]
+        lines.extend(f"  {detail}" for detail in self.backend_plan)
+        if self.residual:
+            lines.append("Residual filters: " + "; ".join(label for label, _ in self.residual))
+        if self.alternatives:
+            lines.append("Not chosen: " + ", ".join(f"{label} ({rows})" for label, rows in self.alternatives))
+
+        rows = f"Estimated rows: {self.estimate}"
+        if actual is not None:
+            rows += f" | Actual rows: {actual}"
+        lines.append(rows)
+        return "\n".join(lines)
+
+
+def _access_paths(index, criteria, bounds):
+    # (label, criterion keys covered, rows read, ids) for every criterion an index can answer;
+    # ids is a function, so only the driver that is chosen ever builds its ids
+    paths = []
+
+    if criteria.get("status"):
+        status = criteria["status"]
+        ids = index.by_status.get(status, set())
+        paths.append((f"status = '{status}'", ("status",), len(ids), lambda ids=ids: ids))
+
+    if criteria.get("paid") is not None:
+        paid = bool(criteria["paid"])
+        ids = index.by_paid[paid]
+        paths.append((f"paid = {paid}", ("paid",), len(ids), lambda ids=ids: ids))
+
+    if criteria.get("customer"):
+        customer = criteria["customer"]
+        ids = index.by_customer.get(customer.lower(), set())
+        paths.append((f"customer = '{customer}'", ("customer",), len(ids), lambda ids=ids: ids))
+
+    # only the date criterion that applies (exact date, then range, then month), as bounds on the
+    # index timeline: costed from two binary searches, its ids are a slice already in time order
+    if bounds is not None:
+        if criteria.get("date"):
+            label, keys = f"date = {criteria['date']}", ("date",)
+        elif criteria.get("from_date") and criteria.get("to_date"):
+            label, keys = f"date {criteria['from_date']}..{criteria['to_date']}", ("from_date", "to_date")
+        else:
+            label, keys = f"month = {criteria['month']}", ("month",)
+        paths.append((label, keys, index.count_within(bounds), lambda: index.ordered_ids(bounds)))
+
+    return paths
+
+
+def plan_order_query(index, criteria, predicate_for):
+    """
+    Choose how to evaluate criteria (dates already ISO) against index.
+    predicate_for(**criteria) returns the per-order check for a subset of them.
+    """
+    total = len(index)
+    bounds = index.date_bounds(criteria.get("date"), criteria.get("from_date"), criteria.get("to_date"), criteria.get("month"))
+    paths = _access_paths(index, criteria, bounds)
+
+    # independence assumption: every criterion keeps its own share of the orders
+    estimate = total
+    for _, _, rows, _ in paths:
+        estimate = estimate * rows / total if total else 0
+    estimate = round(estimate)
+
+    if not paths:
+        return QueryPlan("full scan", None, estimate, [], total, time_bounds=bounds)
+
+    paths.sort(key=lambda path: path[2])
+    label, keys, _, fetch = paths[0]
+    ids = fetch()
+
+    residual = [
+        (other_label, predicate_for(**{ key: criteria[key] for key in keys }))
+        for other_label, keys, _, _ in paths[1:]
+    ]
+    alternatives = [(other_label, rows) for other_label, _, rows, _ in paths[1:]]
+    plan = QueryPlan(f"index {label}", ids, estimate, residual, total, alternatives, time_bounds=bounds)
+    plan.date_driven = keys[0] in ("date", "from_date", "month")  # ids are exactly the timeline within time_bounds
+    return plan
@@ -1,32 +1,122 @@
+import codecs
 import json
 import os
+import re
+import shutil
+import tempfile
+from shared.settings import FSYNC_WRITES
 from utils.display import print_error, print_warning
 
 
+#---------- Atomic writes ----------#
+
+FSYNC_LEVELS = ("none", "file", "full")  # full = the file and then its directory entry
+
+_UMASK = os.umask(0)  # read once, while nothing else runs: os.umask can only be read by setting it
+os.umask(_UMASK)
+
+
+def backup_path(file_path):
+    return f"{file_path}.bak"
+
+
+def _fsync_directory(directory):
+    if os.name == "nt":  # directories cannot be opened for fsync on Windows
+        return
+    descriptor = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def atomic_write(file_path, text, backup=False):
+    """
+    Replace file_path with text (str, or bytes for binary files) so that readers (and a crash)
+    only ever see the old or the new content: write a temp file beside it, then os.replace it
+    over the target.
+    backup keeps the replaced generation as <file>.bak. FSYNC_WRITES decides whether
+    the data ("file") and the rename ("full") are forced to disk before returning.
+    """
+    directory = os.path.dirname(file_path)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory or ".", prefix=os.path.basename(file_path) + ".", suffix=".tmp")
+    try:
+        binary = isinstance(text, bytes)
+        with os.fdopen(descriptor, "wb" if binary else "w", encoding=None if binary else "utf-8") as file:
+            file.write(text)
+            if FSYNC_WRITES != "none":
+                file.flush()
+                os.fsync(file.fileno())
+
+        # mkstemp creates it owner-only: keep the target's mode, or give a new file the usual one
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+            if backup:
+                _keep_generation(file_path)
+        else:
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if FSYNC_WRITES == "full":
+        _fsync_directory(directory)
+
+
+def _keep_generation(file_path):
+    # the current file becomes <file>.bak; a hard link costs no copy and the target never goes missing
+    staged = backup_path(file_path) + ".tmp"
+    if os.path.exists(staged):
+        os.remove(staged)
+    try:
+        os.link(file_path, staged)
+    except OSError:  # no hard links on this filesystem
+        shutil.copy2(file_path, staged)
+    os.replace(staged, backup_path(file_path))
+
+
+def load_json_generation(file_path, label):
+    """
+    (data, path read) from file_path, or from its .bak when the file is missing or unreadable;
+    (None, None) when neither holds valid JSON.
+    """
+    for path in (file_path, backup_path(file_path)):
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            print_warning(f"{label} '{path}' is empty or corrupted.")
+            continue
+
+        if path != file_path:
+            print_warning(f"Recovered {label.lower()} from the last good copy '{path}'.")
+        return data, path
+    return None, None
+
+
 #---------- Menu json I/O ----------#
 
 def load_menu_data(file_path):
-    if not os.path.exists(file_path):
-            return {}
-    
     try:
-        with open(file_path, 'r') as file:
-            return json.load(file)
-    except json.JSONDecodeError:
-        print_warning("JSON file is empty or corrupted. Starting fresh.")
-        return {}
-        
+        data, _ = load_json_generation(file_path, "Menu file")
     except Exception as e:
         print_error(f"Unexpected error: {e}")
         return {}
 
+    if data is None and (os.path.exists(file_path) or os.path.exists(backup_path(file_path))):
+        print_warning("JSON file is empty or corrupted. Starting fresh.")
+    return data if data is not None else {}
+
 
 def save_menu_data(file_path, menu_data):
     if not isinstance(menu_data, dict):
         raise ValueError("Data must be a dictionary")
     try:
-        with open(file_path, 'w') as file:
-            json.dump(menu_data, file, indent=4)
+        atomic_write(file_path, json.dumps(menu_data, indent=4), backup=True)
             
     except Exception as e:
         print_error("Error to save data")
@@ -34,32 +124,263 @@ def save_menu_data(file_path, menu_data):
 
 #---------- Order json I/O ----------#
 
+STREAM_CHUNK_BYTES = 1 << 20       # read size for iter_json_object
+MAX_STREAM_ENTRY_CHARS = 16 << 20  # a value larger than this is treated as corruption, not a long order
+SCALAR_END = re.compile(r"[\s,\]}]")
+WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
 def load_order_data(file_path):
-    if not os.path.exists(file_path):
-        return {}
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except json.JSONDecodeError:
-        print_warning(f"Order file '{file_path}' is empty or corrupted. Starting fresh.")
-        return {}
+        data, _ = load_json_generation(file_path, "Order file")
     except Exception as e:
         print_error(f"Error reading '{file_path}': {e}")
         return {}
 
+    if data is None and (os.path.exists(file_path) or os.path.exists(backup_path(file_path))):
+        print_warning(f"Order file '{file_path}' has no readable generation. Starting fresh.")
+    return data if data is not None else {}
+
+
+def iter_json_object(file_path, progress=None, chunk_bytes=STREAM_CHUNK_BYTES, opener=open):
+    """
+    (key, value) pairs of the JSON object in file_path, decoded one entry at a time from
+    chunks of chunk_bytes, so only the current entry and one chunk are held at once.
+    progress(file_path, bytes_read, total_bytes) is called after every chunk. opener(file_path, "rb")
+    supplies the bytes, e.g. through a decompressor.
+    Raises json.JSONDecodeError (or UnicodeDecodeError) where the file stops being a valid object.
+    """
+    for key, value, _, _ in _scan_json_object(file_path, "utf-8", progress, chunk_bytes, opener):
+        yield key, value
+
+
+def iter_json_spans(file_path, chunk_bytes=STREAM_CHUNK_BYTES):
+    """
+    (key, offset, length) of every value in the JSON object in file_path, in bytes, so a
+    single entry can later be read back and decoded on its own.
+    """
+    # decoded as latin-1, one character per byte, so positions are byte offsets; JSON
+    # structure is ASCII and multi-byte UTF-8 only occurs inside strings
+    for key, _, start, end in _scan_json_object(file_path, "latin-1", None, chunk_bytes, open):
+        yield key.encode("latin-1").decode("utf-8"), start, end - start
+
+
+def _scan_json_object(file_path, encoding, progress, chunk_bytes, opener):
+    # (key, value, start, end) per entry, start/end being character offsets of the value in the decoded file
+    total = os.path.getsize(file_path)
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding)()
+
+    with opener(file_path, "rb") as file:
+        buffer, pos, done = "", 0, 0
+        base = 0  # file offset of buffer[0]
+
+        def fill():
+            # drop what is parsed, append the next chunk; False at end of file
+            nonlocal buffer, pos, done, base
+            chunk = file.read(chunk_bytes)
+            done += len(chunk)
+            base += pos
+            buffer = buffer[pos:] + text.decode(chunk, final=not chunk)
+            pos = 0
+            if progress and chunk:
+                progress(file_path, done, total)
+            return bool(chunk)
+
+        def peek():
+            # next non-whitespace character, "" at end of file
+            nonlocal pos
+            while True:
+                pos = WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ""
+
+        def expect(chars, what):
+            nonlocal pos
+            char = peek()
+            if not char or char not in chars:
+                raise json.JSONDecodeError(f"Expecting {what}", buffer, pos)
+            pos += 1
+            return char
+
+        def decode():
+            # one value; a value cut off by the chunk boundary is retried with more text
+            nonlocal pos
+            if not peek():  # the file ends where a value should start (truncated after "key":)
+                raise json.JSONDecodeError("Expecting value", buffer, pos)
+            if buffer[pos] not in '{["':  # a number or literal only ends at a delimiter, which may be in the next chunk
+                while not SCALAR_END.search(buffer, pos) and fill():
+                    pass
+            while True:
+                try:
+                    value, pos = decoder.raw_decode(buffer, pos)
+                    return value
+                except json.JSONDecodeError:
+                    if len(buffer) - pos > MAX_STREAM_ENTRY_CHARS or not fill():
+                        raise
+
+        expect("{", "'{'")
+        if peek() == "}":
+            return
+        while True:
+            if peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", buffer, pos)
+            key = decode()
+            expect(":", "':' delimiter")
+            if not peek():
+                raise json.JSONDecodeError("Expecting value", buffer, pos)
+            start = base + pos  # fill() moves base and pos together, so this stays valid
+            value = decode()
+            yield key, value, start, base + pos
+            if expect(",}", "',' delimiter") == "}":
+                return
+
+
+def iter_order_data(file_path, progress=None):
+    """
+    Stream {order_id: order_dict} from file_path as (order_id, order_dict) pairs, the
+    incremental counterpart of load_order_data for large histories. Like load_order_data
+    it reads exactly one generation, file_path or else its .bak: a generation is parsed in
+    one pass and its entries are only handed out once it has parsed to the end, so a torn
+    file never mixes with the older one.
+    """
+    for path in (file_path, backup_path(file_path)):
+        if not os.path.exists(path):
+            continue
+        try:
+            entries = list(iter_json_object(path, progress))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            print_warning(f"Order file '{path}' is empty or corrupted ({e}).")
+            continue
+
+        if path != file_path:
+            print_warning(f"Loaded '{file_path}' from its previous generation '{path}'; changes after it are lost.")
+        entries.reverse()
+        while entries:  # popped, so each raw dict can be freed once the caller is done with it
+            yield entries.pop()
+        return
+
+    if os.path.exists(file_path) or os.path.exists(backup_path(file_path)):
+        print_warning(f"Order file '{file_path}' has no readable generation. Starting fresh.")
+
 
 def save_order_data(file_path, order_data):
     if not isinstance(order_data, dict):
         raise ValueError("Order data must be a dictionary")
 
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(order_data, file, indent=4, ensure_ascii=False)
+        atomic_write(file_path, json.dumps(order_data, indent=4, ensure_ascii=False), backup=True)
     except Exception as e:
         print_error(f"Failed to save order data to '{file_path}': {e}")
 
 
+#---------- Order journal I/O ----------#
+
+def load_order_journal(file_path):
+    # one JSON record per line; a torn last line (crash mid-append) is skipped
+    records = []
+    if not os.path.exists(file_path):
+        return records
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line_no, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print_warning(f"Skipping corrupted journal entry {line_no} in '{file_path}'.")
+    except Exception as e:
+        print_error(f"Error reading journal '{file_path}': {e}")
+
+    return records
+
+
+def append_order_journal(file_path, records):
+    if not records:
+        return
+
+    text = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    try:
+        with open(file_path, 'a+b') as file:
+            # after a torn last line (crash mid-append) start a fresh one, or the first record
+            # would be glued onto it and skipped with it on the next load
+            if file.seek(0, os.SEEK_END):
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    text = "\n" + text
+            file.write(text.encode("utf-8"))
+            if FSYNC_WRITES != "none":  # one fsync per commit, however many records it groups
+                file.flush()
+                os.fsync(file.fileno())
+    except Exception as e:
+        print_error(f"Failed to append to journal '{file_path}': {e}")
+
+
+def clear_order_journal(file_path):
+    try:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    except Exception as e:
+        print_error(f"Failed to clear journal '{file_path}': {e}")
+
+
+
+#---------- Order sequence json I/O ----------#
+
+def load_sequence_data(file_path):
+    # {"YYYY-MM": last order number}; anything unreadable means "rebuild from the orders"
+    if not os.path.exists(file_path):
+        return {}
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except Exception:
+        print_warning(f"Order sequence file '{file_path}' is corrupted. Rebuilding from orders.")
+        return {}
+
+    if not isinstance(data, dict):
+        print_warning(f"Order sequence file '{file_path}' is corrupted. Rebuilding from orders.")
+        return {}
+    return data
+
+
+def save_sequence_data(file_path, sequences):
+    try:
+        atomic_write(file_path, json.dumps(sequences, indent=4, sort_keys=True))
+    except Exception as e:
+        print_error(f"Failed to save order sequences to '{file_path}': {e}")
+
+
+
+#---------- Rollup json I/O ----------#
+
+def load_rollup_data(file_path):
+    # rollups can always be rebuilt from the orders, so a bad file is just ignored
+    if not os.path.exists(file_path):
+        return {}
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        print_warning(f"Rollup file '{file_path}' is corrupted. It will be rebuilt.")
+        return {}
+
+
+def save_rollup_data(file_path, rollups):
+    try:
+        atomic_write(file_path, json.dumps(rollups, ensure_ascii=False))
+    except Exception as e:
+        print_error(f"Failed to save rollups to '{file_path}': {e}")
+
+
 
 #---------- Users json I/O ----------#
 
@@ -67,24 +388,21 @@ def save_order_data(file_path, order_data):
 def load_users_data(USERS_FILE):
     # ensured for first user too
     USERS_FILE.parent.mkdir(parents=True, exist_ok=True) # if directory or path doesn't exist it will create 
-    if not USERS_FILE.exists():
+    if not USERS_FILE.exists() and not os.path.exists(backup_path(USERS_FILE)):
         USERS_FILE.write_text("{}")
         return {}
 
-    try:
-        with open(USERS_FILE, 'r') as f:
-            return json.load(f)
-        
-    except json.JSONDecodeError:
+    data, _ = load_json_generation(str(USERS_FILE), "User file")
+    if data is None:
         print_warning("User file is empty or invalid. Resetting it.")
         USERS_FILE.write_text("{}")
         return {}
+    return data
     
 
 def save_users_data(users, USERS_FILE):
     try:
-        with open(USERS_FILE, 'w') as f:
-            json.dump(users, f, indent=2)
+        atomic_write(str(USERS_FILE), json.dumps(users, indent=2), backup=True)
     
     except Exception as e:
         print_error(f"Error saving users: {e}")
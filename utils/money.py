@@ -0,0 +1,15 @@
+# utils/money.py
+
+# Money is held as integer paise everywhere inside the app; rupee floats only exist
+# in the json/sqlite files, at the input prompts and on screen.
+
+PAISE_PER_RUPEE = 100
+
+
+def to_paise(rupees) -> int:
+    # accepts the floats (or ints) found in data files; rounding absorbs binary float residue
+    return int(round(float(rupees) * PAISE_PER_RUPEE))
+
+
+def to_rupees(paise: int) -> float:
+    return paise / PAISE_PER_RUPEE
@@ -1,6 +1,7 @@
 from utils.display import console
 from rich.prompt import Prompt
 from utils.display import print_error, datetime
+from utils.money import to_paise
 
 
 def validate_boolean(prompt, allow_blank=True):
@@ -32,6 +33,7 @@ def validate_name(prompt, allow_blank=False):
 
 
 def validate_price(prompt, allow_blank=False):
+    # asks in rupees, returns paise
     while True:
         raw = Prompt.ask(prompt).strip()
 
@@ -41,7 +43,7 @@ def validate_price(prompt, allow_blank=False):
         try:
             value = float(raw)
             if value > 0:
-                return value
+                return to_paise(value)
             print_error("Price must be greater than 0. ")
         except ValueError:
             print_error("Please enter a valid number. ")